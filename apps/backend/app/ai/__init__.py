@@ -0,0 +1,4 @@
+"""
+AI package for FleetAI backend.
+Contains prompt/context utilities, RAG building blocks and LLM helpers.
+"""
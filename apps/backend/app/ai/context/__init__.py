@@ -0,0 +1,29 @@
+"""
+Context utilities for LLM calls.
+Local token estimation and context-window packing, so oversized prompts are
+caught before a provider round-trip.
+"""
+
+from .token_counter import TokenCounter, get_token_counter, context_limit_for
+from .context_packer import (
+    ContextChunk,
+    PackingConfig,
+    PackedContext,
+    ContextBudgetExceeded,
+    pack_context,
+    resolve_messages,
+)
+
+__all__ = [
+    # Token counting
+    "TokenCounter",
+    "get_token_counter",
+    "context_limit_for",
+    # Packing
+    "ContextChunk",
+    "PackingConfig",
+    "PackedContext",
+    "ContextBudgetExceeded",
+    "pack_context",
+    "resolve_messages",
+]
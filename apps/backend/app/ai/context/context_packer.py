@@ -0,0 +1,172 @@
+# backend/app/ai/context/context_packer.py
+from typing import Any
+from pydantic import BaseModel, Field
+
+from app.config import ai_config
+from app.shared.schemas import LLMParams, LLMMessage, MessageRole
+from app.ai.context.token_counter import TokenCounter, get_token_counter
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Output reservation when LLMParams.max_output_tokens is not set
+DEFAULT_OUTPUT_RESERVE = 4096
+
+
+class ContextBudgetExceeded(ValueError):
+    """Raised when the messages and pinned chunks alone do not fit the model context window."""
+
+
+# ---------- Inputs ----------
+class ContextChunk(BaseModel):
+    """A retrieval chunk competing for space in the prompt"""
+    id: str = Field(..., description="Stable chunk id (e.g. contract chunk id or doc_id:order).")
+    content: str = Field(..., description="Chunk text as it will be sent to the model.")
+    score: float = Field(0.0, description="Relevance score. Higher is more valuable.")
+    pinned: bool = Field(False, description="Pinned chunks are always kept (and never trimmed).")
+    meta: dict[str, Any] | None = Field(None, description="Passthrough metadata - page, span, doc_id.")
+
+
+class PackingConfig(BaseModel):
+    """Budget settings for packing retrieval chunks into a request"""
+    context_limit: int | None = Field(None, ge=1, description="Model context window. Defaults to the known limit for the model.")
+    target_budget: int | None = Field(None, ge=1, description="Soft cap on total prompt tokens. Use to avoid paying for context we don't need.")
+    output_reserve: int | None = Field(None, ge=0, description="Tokens kept free for the answer. Defaults to max_output_tokens.")
+    min_trim_tokens: int = Field(64, ge=0, description="Don't keep a trimmed chunk shorter than this.")
+    chunk_overhead_tokens: int = Field(4, ge=0, description="Separator/label tokens added per chunk when rendered.")
+    separator: str = "\n\n---\n\n"
+
+
+# ---------- Result ----------
+class PackedContext(BaseModel):
+    """Chunks that fit the budget, in their original order, plus accounting"""
+    chunks: list[ContextChunk] = Field(default_factory=list)
+    dropped_ids: list[str] = Field(default_factory=list)
+    trimmed_ids: list[str] = Field(default_factory=list)
+    message_tokens: int = 0
+    chunk_tokens: int = 0
+    budget: int = 0
+    context_limit: int = 0
+    exact: bool = Field(False, description="Counts come from the model tokenizer, not the heuristic.")
+    separator: str = Field("\n\n---\n\n", description="PackingConfig.separator the chunk overhead was budgeted for.")
+
+    @property
+    def total_tokens(self) -> int:
+        return self.message_tokens + self.chunk_tokens
+
+    def as_text(self, separator: str | None = None) -> str:
+        return (self.separator if separator is None else separator).join(c.content for c in self.chunks)
+
+
+def resolve_messages(params: LLMParams) -> list[LLMMessage]:
+    """Messages exactly as they will be sent (`messages` takes priority over `prompt`/`system`)."""
+    if params.messages:
+        return list(params.messages)
+    messages: list[LLMMessage] = []
+    if params.system:
+        messages.append(LLMMessage(role=MessageRole.SYSTEM, content=params.system))
+    if params.prompt:
+        messages.append(LLMMessage(role=MessageRole.USER, content=params.prompt))
+    return messages
+
+
+def _model_id(params: LLMParams) -> str | None:
+    """The model the request will run on: params.model, else the active chat model."""
+    if params.model:
+        return params.model
+    try:
+        return ai_config.active_chat_model_id
+    except ValueError:  # no default for the configured platform
+        return None
+
+
+def pack_context(
+    params: LLMParams,
+    chunks: list[ContextChunk],
+    config: PackingConfig | None = None,
+    counter: TokenCounter | None = None,
+) -> PackedContext:
+    """
+    Fit retrieval chunks into the prompt budget left over by the messages.
+    - Budget = min(context_limit - output_reserve, target_budget) - message tokens.
+    - Pinned chunks go first and are never trimmed; they may use up the soft `target_budget`
+      but must fit the context window. The rest follow by descending score.
+    - The first chunk that doesn't fit is trimmed to the remaining budget (if at least
+      `min_trim_tokens` remain); later chunks are kept only if they fit whole.
+    - Kept chunks are returned in input order so the prompt reads like the document.
+    Raises ContextBudgetExceeded if the messages, or the messages plus pinned chunks, overflow the window.
+    """
+    config = config or PackingConfig()
+    counter = counter or get_token_counter(_model_id(params))
+
+    context_limit = config.context_limit or counter.context_limit
+    output_reserve = config.output_reserve
+    if output_reserve is None:
+        output_reserve = params.max_output_tokens or DEFAULT_OUTPUT_RESERVE
+
+    hard_budget = context_limit - output_reserve
+    budget = min(hard_budget, config.target_budget) if config.target_budget else hard_budget
+
+    message_tokens = counter.count_messages(resolve_messages(params))
+    if message_tokens > hard_budget:
+        raise ContextBudgetExceeded(
+            f"Messages need {message_tokens} tokens but only {hard_budget} fit "
+            f"(context {context_limit}, output reserve {output_reserve})."
+        )
+
+    remaining = budget - message_tokens
+    overhead = config.chunk_overhead_tokens
+
+    pinned_tokens = sum(counter.count(c.content) + overhead for c in chunks if c.pinned)
+    if message_tokens + pinned_tokens > hard_budget:
+        raise ContextBudgetExceeded(
+            f"Messages and pinned chunks need {message_tokens + pinned_tokens} tokens but only {hard_budget} fit "
+            f"(context {context_limit}, output reserve {output_reserve})."
+        )
+
+    # Stable sort: pinned first, then score desc, ties keep input order
+    ranked = sorted(range(len(chunks)), key=lambda i: (not chunks[i].pinned, -chunks[i].score))
+
+    kept: dict[int, ContextChunk] = {}
+    dropped_ids: list[str] = []
+    trimmed_ids: list[str] = []
+    chunk_tokens = 0
+    trimmed_once = False
+
+    for i in ranked:
+        chunk = chunks[i]
+        cost = counter.count(chunk.content) + overhead
+        if cost <= remaining or chunk.pinned:
+            kept[i] = chunk
+            remaining -= cost
+            chunk_tokens += cost
+            continue
+        room = remaining - overhead
+        if not trimmed_once and room >= config.min_trim_tokens:
+            trimmed = counter.truncate(chunk.content, room)
+            cost = counter.count(trimmed) + overhead
+            kept[i] = chunk.model_copy(update={"content": trimmed})
+            trimmed_ids.append(chunk.id)
+            remaining -= cost
+            chunk_tokens += cost
+            trimmed_once = True
+            continue
+        dropped_ids.append(chunk.id)
+
+    if dropped_ids or trimmed_ids:
+        logger.info(
+            f"✂️ Packed context: kept {len(kept)}/{len(chunks)} chunks "
+            f"({len(trimmed_ids)} trimmed), {message_tokens + chunk_tokens}/{budget} tokens"
+        )
+
+    return PackedContext(
+        chunks=[kept[i] for i in sorted(kept)],
+        dropped_ids=dropped_ids,
+        trimmed_ids=trimmed_ids,
+        message_tokens=message_tokens,
+        chunk_tokens=chunk_tokens,
+        budget=budget,
+        context_limit=context_limit,
+        exact=counter.is_exact,
+        separator=config.separator,
+    )
@@ -0,0 +1,120 @@
+# backend/app/ai/context/token_counter.py
+from functools import lru_cache
+from typing import Any
+
+from app.shared.schemas import LLMMessage
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+# ---------- Static ----------
+# Context windows (input + output) per model id. Unknown models fall back to DEFAULT_CONTEXT_LIMIT.
+MODEL_CONTEXT_LIMITS: dict[str, int] = {
+    "gpt-5": 400_000,
+    "gpt-5-mini": 400_000,
+    "gpt-5-nano": 400_000,
+    "gpt-4o": 128_000,
+    "gpt-4o-mini": 128_000,
+}
+DEFAULT_CONTEXT_LIMIT = 128_000
+DEFAULT_ENCODING = "o200k_base"
+
+# Chat formatting overhead (OpenAI cookbook numbers, close enough for the other providers)
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_NAME = 1
+TOKENS_REPLY_PRIMING = 3
+
+# Heuristic used when no tokenizer is available: ~4 chars per token for English prose
+CHARS_PER_TOKEN = 4
+
+DEFAULT_CACHE_SIZE = 16_384
+
+
+def context_limit_for(model: str | None) -> int:
+    """Return the context window for a model id, matching dated snapshots by prefix."""
+    if not model:
+        return DEFAULT_CONTEXT_LIMIT
+    if model in MODEL_CONTEXT_LIMITS:
+        return MODEL_CONTEXT_LIMITS[model]
+    # e.g. "gpt-5-mini-2025-08-07" -> "gpt-5-mini" (longest prefix wins)
+    for known in sorted(MODEL_CONTEXT_LIMITS, key=len, reverse=True):
+        if model.startswith(known):
+            return MODEL_CONTEXT_LIMITS[known]
+    return DEFAULT_CONTEXT_LIMIT
+
+
+def _load_encoding(model: str | None) -> Any | None:
+    """Load a tiktoken encoding if tiktoken and its BPE files are available, else None."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        if model:
+            try:
+                return tiktoken.encoding_for_model(model)
+            except KeyError:
+                pass
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as e:  # BPE download can fail offline
+        logger.warning(f"⚠️ tiktoken unavailable, using heuristic token counts: {e}")
+        return None
+
+
+class TokenCounter:
+    """
+    Local token estimator for a single model.
+    - Uses tiktoken when available, otherwise a chars/4 heuristic.
+    - Per-text counts are memoized, so retrieval chunks seen across requests
+      are only tokenized once.
+    """
+
+    def __init__(self, model: str | None = None, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.model = model
+        self.context_limit = context_limit_for(model)
+        self._encoding = _load_encoding(model)
+        self.count = lru_cache(maxsize=cache_size)(self._count)
+
+    @property
+    def is_exact(self) -> bool:
+        """True when counts come from the model tokenizer rather than the heuristic."""
+        return self._encoding is not None
+
+    def _count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return -(-len(text) // CHARS_PER_TOKEN)  # ceil division
+
+    def count_message(self, message: LLMMessage) -> int:
+        tokens = TOKENS_PER_MESSAGE + self.count(message.content)
+        if message.name:
+            tokens += TOKENS_PER_NAME + self.count(message.name)
+        return tokens
+
+    def count_messages(self, messages: list[LLMMessage]) -> int:
+        """Tokens for a full chat request, including formatting and reply priming."""
+        if not messages:
+            return 0
+        return sum(self.count_message(m) for m in messages) + TOKENS_REPLY_PRIMING
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text to at most `max_tokens` tokens."""
+        if max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            return self._encoding.decode(tokens[:max_tokens])
+        return text[: max_tokens * CHARS_PER_TOKEN]
+
+    def cache_info(self):
+        return self.count.cache_info()
+
+
+@lru_cache(maxsize=32)
+def get_token_counter(model: str | None = None) -> TokenCounter:
+    """Shared TokenCounter per model id, so the memo is reused across requests."""
+    return TokenCounter(model)
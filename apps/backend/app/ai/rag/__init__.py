@@ -0,0 +1,54 @@
+"""
+RAG building blocks for FleetAI backend.
+Document loading, chunking, columnar chunk batches, embedding cache, vector/BM25
+indexes, hybrid retrieval, versioned re-indexing and ingestion pipelines.
+"""
+
+from .loader import iter_pages
+from .chunker import ChunkingConfig, iter_chunks
+from .chunk_batch import ChunkBatch
+from .embedding_cache import EmbeddingCache, EmbeddingCacheStats, CachedEmbedder, chunk_text_hash, normalize_chunk_text
+from .vector_index import VectorIndex, VectorHit, get_org_index
+from .bm25_index import BM25Index, BM25Hit, get_org_bm25_index, tokenize
+from .retriever import HybridRetriever, HybridHit, reciprocal_rank_fusion
+from .versioning import DocumentVersion, PageFingerprint, ChangeSummary, VersionedIngestResult, ingest_document_version
+from .pipeline import PipelineConfig, PipelineStats, run_ingest_pipeline
+
+__all__ = [
+    # Loading
+    "iter_pages",
+    # Chunking
+    "ChunkingConfig",
+    "iter_chunks",
+    # Columnar batches
+    "ChunkBatch",
+    # Embedding cache
+    "EmbeddingCache",
+    "EmbeddingCacheStats",
+    "CachedEmbedder",
+    "chunk_text_hash",
+    "normalize_chunk_text",
+    # Vector index
+    "VectorIndex",
+    "VectorHit",
+    "get_org_index",
+    # Lexical index
+    "BM25Index",
+    "BM25Hit",
+    "get_org_bm25_index",
+    "tokenize",
+    # Hybrid retrieval
+    "HybridRetriever",
+    "HybridHit",
+    "reciprocal_rank_fusion",
+    # Versioned ingestion
+    "DocumentVersion",
+    "PageFingerprint",
+    "ChangeSummary",
+    "VersionedIngestResult",
+    "ingest_document_version",
+    # Ingestion
+    "PipelineConfig",
+    "PipelineStats",
+    "run_ingest_pipeline",
+]
@@ -0,0 +1,365 @@
+# backend/app/ai/rag/bm25_index.py
+import json
+import math
+import os
+import re
+import threading
+from array import array
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+from pydantic import BaseModel
+
+from app.ai.rag.vector_index import DEFAULT_INDEX_ROOT
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Words, numbers and identifiers like "8061-536-001", "12.3.1", "A-1"
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-./][a-z0-9]+)*")
+_PART_RE = re.compile(r"[-./]")
+
+_INITIAL_CAPACITY = 1024
+LOG_NAME = "postings.jsonl"
+# Compact once replaced/removed rows outnumber the live ones (and there are at least this many)
+COMPACT_MIN_DEAD = 1024
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Lowercased tokens. Compound identifiers are kept whole *and* split into parts,
+    so "Jet A-1" matches both "a-1" and "a"/"1", and P/Ns match exactly.
+    """
+    tokens: list[str] = []
+    for tok in _TOKEN_RE.findall(text.lower()):
+        tokens.append(tok)
+        if _PART_RE.search(tok):
+            tokens.extend(p for p in _PART_RE.split(tok) if p)
+    return tokens
+
+
+class BM25Hit(BaseModel):
+    chunk_id: str
+    score: float
+    matched_terms: int
+    contract_id: str | None = None
+    doc_id: str | None = None
+
+
+class BM25Index:
+    """
+    In-memory inverted index with Okapi BM25 scoring over chunk content.
+    - Postings are compact int32 arrays per term, appended as chunks are added.
+    - Re-adding a chunk id replaces it; remove() tombstones a chunk. Once tombstoned rows outnumber
+      the live ones they are compacted away and the rows renumbered.
+    - With `path`, every write is appended to `path/postings.jsonl` (chunk id, contract/doc id and
+      term frequencies, or a removal) and the index is rebuilt from it on load, so it survives
+      restarts; an interrupted last line is dropped. Compaction rewrites the log too.
+    - Queries only touch the postings of the query terms, so identifier lookups
+      (part numbers, clause numbers, index names) take well under a millisecond.
+    """
+
+    def __init__(self, path: str | Path | None = None, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        self._reset()
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._load()
+
+    def _reset(self) -> None:
+        self._postings: dict[str, tuple[array, array]] = {}  # term -> (doc ids, term freqs)
+        self._chunk_ids: list[str] = []
+        self._row_of: dict[str, int] = {}
+        self._keys: dict[str, list[str]] = {"c": [], "d": []}
+        self._codes: dict[str, dict[str, int]] = {"c": {}, "d": {}}
+        self._size = 0
+        self._live = 0
+        self._total_len = 0
+        self._doc_len = np.zeros(_INITIAL_CAPACITY, dtype=np.int32)
+        self._alive = np.zeros(_INITIAL_CAPACITY, dtype=bool)
+        self._contract_codes = np.full(_INITIAL_CAPACITY, -1, dtype=np.int32)
+        self._doc_codes = np.full(_INITIAL_CAPACITY, -1, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __contains__(self, chunk_id: str) -> bool:
+        return chunk_id in self._row_of
+
+    # ---------- Files ----------
+    def _log_path(self) -> Path:
+        assert self.path is not None
+        return self.path / LOG_NAME
+
+    def _read_log(self) -> list[dict]:
+        log = self._log_path()
+        if not log.exists():
+            return []
+        data = log.read_bytes()
+        complete = data[: data.rfind(b"\n") + 1]
+        if len(complete) < len(data):  # interrupted append: cut back so the next one lines up
+            with open(log, "r+b") as f:
+                f.truncate(len(complete))
+        return [json.loads(line) for line in complete.splitlines()]
+
+    def _append_log(self, records: list[dict]) -> None:
+        if self.path is None or not records:
+            return
+        with open(self._log_path(), "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records))
+
+    def _load(self) -> None:
+        records = self._read_log()
+        for r in records:
+            if r.get("removed"):
+                self._remove_chunk(r["id"])
+            else:
+                self._add_row(r["id"], r["tf"], r.get("c"), r.get("d"))
+        if self._should_compact():
+            self._compact()
+        if records:
+            logger.info(f"📚 BM25 index loaded from {self.path}: {self._live} chunks, {len(self._postings)} terms")
+
+    # ---------- Writes ----------
+    def _grow(self, needed: int) -> None:
+        capacity = self._doc_len.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, fill in (("_doc_len", 0), ("_alive", False), ("_contract_codes", -1), ("_doc_codes", -1)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[: old.shape[0]] = old
+            setattr(self, name, new)
+
+    def _code(self, kind: str, value: str | None) -> int:
+        if value is None:
+            return -1
+        code = self._codes[kind].get(value)
+        if code is None:
+            code = self._codes[kind][value] = len(self._keys[kind])
+            self._keys[kind].append(value)
+        return code
+
+    def _remove_row(self, row: int) -> None:
+        if self._alive[row]:
+            self._alive[row] = False
+            self._total_len -= int(self._doc_len[row])
+            self._live -= 1
+
+    def _remove_chunk(self, chunk_id: str) -> bool:
+        row = self._row_of.pop(chunk_id, None)
+        if row is None:
+            return False
+        self._remove_row(row)
+        return True
+
+    def _add_row(self, chunk_id: str, freqs: dict[str, int], contract_id: str | None, doc_id: str | None) -> None:
+        old = self._row_of.get(chunk_id)
+        if old is not None:
+            self._remove_row(old)
+
+        self._grow(self._size + 1)
+        row = self._size
+        self._size += 1
+        self._chunk_ids.append(chunk_id)
+        self._row_of[chunk_id] = row
+
+        for term, tf in freqs.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = (array("i"), array("i"))
+            posting[0].append(row)
+            posting[1].append(tf)
+
+        doc_len = sum(freqs.values())
+        self._doc_len[row] = doc_len
+        self._alive[row] = True
+        self._contract_codes[row] = self._code("c", contract_id)
+        self._doc_codes[row] = self._code("d", doc_id)
+        self._total_len += doc_len
+        self._live += 1
+
+    def _should_compact(self) -> bool:
+        dead = self._size - self._live
+        return dead >= COMPACT_MIN_DEAD and dead > self._live
+
+    def _compact(self) -> None:
+        """Drop replaced and removed rows: renumber the live ones, remap postings, rewrite the log."""
+        live_rows = np.flatnonzero(self._alive[: self._size])
+        new_row = np.full(self._size, -1, dtype=np.int64)
+        new_row[live_rows] = np.arange(live_rows.shape[0])
+
+        postings: dict[str, tuple[array, array]] = {}
+        for term, (rows, tfs) in self._postings.items():
+            r = np.frombuffer(rows, dtype=np.int32)
+            keep = self._alive[r]
+            if keep.any():
+                postings[term] = (array("i", new_row[r[keep]].astype(np.int32).tobytes()), array("i", np.frombuffer(tfs, dtype=np.int32)[keep].tobytes()))
+        # Fresh objects rather than in-place edits: search() reads its snapshot outside the lock
+        n, capacity = live_rows.shape[0], max(_INITIAL_CAPACITY, live_rows.shape[0])
+        for name, fill in (("_doc_len", 0), ("_alive", False), ("_contract_codes", -1), ("_doc_codes", -1)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:n] = old[live_rows]
+            setattr(self, name, new)
+        dropped = self._size - n
+        self._postings = postings
+        self._chunk_ids = [self._chunk_ids[row] for row in live_rows.tolist()]
+        self._row_of = {chunk_id: row for row, chunk_id in enumerate(self._chunk_ids)}
+        self._size = n
+
+        if self.path is not None:
+            # The newest add record of each live chunk, in row order
+            latest: dict[str, dict] = {}
+            for r in self._read_log():
+                latest.pop(r["id"], None)
+                if not r.get("removed"):
+                    latest[r["id"]] = r
+            tmp = self._log_path().with_suffix(".tmp")
+            tmp.write_text("".join(json.dumps(r, separators=(",", ":")) + "\n" for r in latest.values()), encoding="utf-8")
+            os.replace(tmp, self._log_path())
+        logger.info(f"🧹 BM25 index compacted: dropped {dropped} stale rows, {n} live")
+
+    def add(
+        self,
+        chunk_ids: Sequence[str],
+        contents: Sequence[str],
+        contract_ids: Sequence[str | None] | str | None = None,
+        doc_ids: Sequence[str | None] | str | None = None,
+    ) -> None:
+        """Index chunks. contract_ids/doc_ids may be a single id for the whole batch."""
+        n = len(chunk_ids)
+        if len(contents) != n:
+            raise ValueError(f"Got {len(contents)} contents for {n} chunk ids")
+        if isinstance(contract_ids, str) or contract_ids is None:
+            contract_ids = [contract_ids] * n
+        if isinstance(doc_ids, str) or doc_ids is None:
+            doc_ids = [doc_ids] * n
+
+        records = []
+        for chunk_id, content, contract_id, doc_id in zip(chunk_ids, contents, contract_ids, doc_ids):
+            freqs: dict[str, int] = {}
+            for tok in tokenize(content or ""):
+                freqs[tok] = freqs.get(tok, 0) + 1
+            records.append({"id": chunk_id, "c": contract_id, "d": doc_id, "tf": freqs})
+
+        with self._lock:
+            self._append_log(records)
+            for r in records:
+                self._add_row(r["id"], r["tf"], r["c"], r["d"])
+            if self._should_compact():
+                self._compact()
+
+    def remove(self, chunk_ids: Iterable[str]) -> None:
+        with self._lock:
+            removed = [chunk_id for chunk_id in chunk_ids if self._remove_chunk(chunk_id)]
+            self._append_log([{"id": chunk_id, "removed": True} for chunk_id in removed])
+            if self._should_compact():
+                self._compact()
+
+    # ---------- Reads ----------
+    def _wanted_codes(self, kind: str, values: Iterable[str] | None) -> np.ndarray | None:
+        if values is None:
+            return None
+        return np.asarray([self._codes[kind][v] for v in values if v in self._codes[kind]], dtype=np.int32)
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        contract_ids: Iterable[str] | None = None,
+        doc_ids: Iterable[str] | None = None,
+    ) -> list[BM25Hit]:
+        """Top-k chunks by BM25, optionally restricted to some contracts/documents."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or k <= 0:
+            return []
+
+        with self._lock:
+            if self._live == 0:
+                return []
+            n_docs = self._live
+            avgdl = self._total_len / n_docs if n_docs else 1.0
+            doc_len, alive = self._doc_len, self._alive
+            contract_codes, doc_codes = self._contract_codes, self._doc_codes
+            postings = [(term, self._postings.get(term)) for term in terms]
+            postings = [(np.array(p[0], dtype=np.int32), np.array(p[1], dtype=np.float32)) for _, p in postings if p is not None]
+            wanted_c = self._wanted_codes("c", contract_ids)
+            wanted_d = self._wanted_codes("d", doc_ids)
+            chunk_ids = self._chunk_ids
+            keys = self._keys
+
+        if not postings:
+            return []
+
+        all_rows, all_scores = [], []
+        for rows, tf in postings:
+            live = alive[rows]
+            rows, tf = rows[live], tf[live]
+            if rows.shape[0] == 0:
+                continue
+            df = rows.shape[0]
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * doc_len[rows] / avgdl)
+            all_rows.append(rows)
+            all_scores.append(idf * tf * (self.k1 + 1) / (tf + norm))
+        if not all_rows:
+            return []
+
+        rows = np.concatenate(all_rows)
+        scores = np.concatenate(all_scores)
+        uniq, inverse = np.unique(rows, return_inverse=True)
+        totals = np.bincount(inverse, weights=scores)
+        matched = np.bincount(inverse)
+
+        mask = np.ones(uniq.shape[0], dtype=bool)
+        if wanted_c is not None:
+            mask &= np.isin(contract_codes[uniq], wanted_c)
+        if wanted_d is not None:
+            mask &= np.isin(doc_codes[uniq], wanted_d)
+        uniq, totals, matched = uniq[mask], totals[mask], matched[mask]
+        if uniq.shape[0] == 0:
+            return []
+
+        if uniq.shape[0] > k:
+            top = np.argpartition(-totals, k - 1)[:k]
+            uniq, totals, matched = uniq[top], totals[top], matched[top]
+        order = np.argsort(-totals)
+
+        hits = []
+        for i in order:
+            row = int(uniq[i])
+            c_code, d_code = int(contract_codes[row]), int(doc_codes[row])
+            hits.append(BM25Hit(
+                chunk_id=chunk_ids[row],
+                score=float(totals[i]),
+                matched_terms=int(matched[i]),
+                contract_id=keys["c"][c_code] if c_code >= 0 else None,
+                doc_id=keys["d"][d_code] if d_code >= 0 else None,
+            ))
+        return hits
+
+    def query_terms(self, query: str) -> int:
+        """Number of distinct index terms in a query (what `matched_terms` is compared against)."""
+        return len(dict.fromkeys(tokenize(query)))
+
+
+_indexes: dict[str, BM25Index] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_org_bm25_index(org_id: str, root: str | Path | None = None) -> BM25Index:
+    """Process-wide BM25Index per org, persisted under `root/<org_id>/bm25` next to its vector index."""
+    root = Path(root or os.getenv("VECTOR_INDEX_ROOT", DEFAULT_INDEX_ROOT))
+    key = str(root / org_id)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = BM25Index(root / org_id / "bm25")
+        return index
@@ -0,0 +1,133 @@
+# backend/app/ai/rag/chunker.py
+from collections import deque
+from typing import Iterable, Iterator
+from pydantic import BaseModel, Field, model_validator
+
+from app.ai.context import TokenCounter
+from app.schemas.invoice import InvoiceChunk
+
+DEFAULT_SEPARATORS = ["\n\n", "\n", ". ", " "]
+
+
+class ChunkingConfig(BaseModel):
+    """Settings for splitting document text into overlapping chunks"""
+    chunk_size: int = Field(1000, ge=1, description="Max characters per chunk.")
+    chunk_overlap: int = Field(150, ge=0, description="Characters shared between consecutive chunks.")
+    add_start_index: bool = Field(True, description="Record the chunk's character offset in meta['start_index'].")
+    separators: list[str] = Field(default_factory=lambda: list(DEFAULT_SEPARATORS), description="Preferred split points, strongest first.")
+    page_separator: str = Field("\n", description="Inserted between pages so words don't merge across page breaks.")
+    strip_whitespace: bool = True
+
+    @model_validator(mode="after")
+    def _check_overlap(self) -> "ChunkingConfig":
+        if self.chunk_overlap >= self.chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        return self
+
+
+def _split_point(text: str, size: int, separators: list[str]) -> int:
+    """Best end offset <= size: the last strong separator in the second half of the window."""
+    floor = size // 2
+    for sep in separators:
+        idx = text.rfind(sep, floor, size)
+        if idx != -1:
+            return idx + len(sep)
+    return size
+
+
+def iter_chunks(
+    pages: Iterable[tuple[int, str]],
+    config: ChunkingConfig | None = None,
+    counter: TokenCounter | None = None,
+) -> Iterator[InvoiceChunk]:
+    """
+    Split a lazily-read document into overlapping chunks.
+    - `pages` is any iterable of (page_number, text), e.g. loader.iter_pages(path).
+    - Only the unconsumed tail of the text (at most one page plus one chunk) is held in memory,
+      so peak memory stays flat as the document grows.
+    - Yields InvoiceChunk with `order`, `label` (first line), `content` and meta:
+      {"page", "page_end", "start_index", "span": [start_char, end_char], "tokens"?}.
+      Offsets are global character offsets into the concatenated document text.
+    """
+    config = config or ChunkingConfig()
+    size, overlap = config.chunk_size, config.chunk_overlap
+
+    buf = ""                # pending text, starting at global offset buf_start
+    buf_start = 0
+    doc_len = 0
+    emitted_until = 0       # global offset up to which text has been emitted
+    marks: deque[tuple[int, int]] = deque()  # (global_offset, page_number) for pages still in buf
+    order = 0
+
+    def page_at(offset: int) -> int | None:
+        page = None
+        for start, page_no in marks:
+            if start > offset:
+                break
+            page = page_no
+        return page
+
+    def take(final: bool) -> InvoiceChunk | None:
+        nonlocal buf, buf_start, emitted_until, order
+        end = len(buf) if final and len(buf) <= size else _split_point(buf, size, config.separators)
+        piece = buf[:end]
+        content = piece.strip() if config.strip_whitespace else piece
+        lead = len(piece) - len(piece.lstrip()) if config.strip_whitespace else 0
+        start = buf_start + lead
+        stop = start + len(content)
+
+        chunk = None
+        if content and stop > emitted_until:
+            meta = {
+                "page": page_at(start),
+                "page_end": page_at(max(stop - 1, start)),
+                "span": [start, stop],
+            }
+            if config.add_start_index:
+                meta["start_index"] = start
+            if counter is not None:
+                meta["tokens"] = counter.count(content)
+            chunk = InvoiceChunk(
+                order=order,
+                label=content.split("\n", 1)[0][:200],
+                content=content,
+                embedding=None,
+                meta=meta,
+            )
+            order += 1
+            emitted_until = stop
+
+        if final and end >= len(buf):
+            buf_start += len(buf)
+            buf = ""
+        else:
+            # Step back by the overlap, then forward to a word boundary so chunks don't start mid-word
+            next_start = end - overlap if end > overlap else end
+            boundary = buf.find(" ", next_start, end)
+            if boundary != -1:
+                next_start = boundary + 1
+            buf = buf[next_start:]
+            buf_start += next_start
+        # Forget pages that ended before the buffer
+        while len(marks) > 1 and marks[1][0] <= buf_start:
+            marks.popleft()
+        return chunk
+
+    for page_no, text in pages:
+        if not text:
+            continue
+        if doc_len and config.page_separator:
+            buf += config.page_separator
+            doc_len += len(config.page_separator)
+        marks.append((doc_len, page_no))
+        buf += text
+        doc_len += len(text)
+        while len(buf) > size:
+            chunk = take(final=False)
+            if chunk is not None:
+                yield chunk
+
+    while buf and buf_start + len(buf) > emitted_until:
+        chunk = take(final=True)
+        if chunk is not None:
+            yield chunk
@@ -0,0 +1,212 @@
+# backend/app/ai/rag/embedding_cache.py
+import hashlib
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Literal, Sequence
+
+import numpy as np
+from pydantic import BaseModel
+
+from app.ai.context import TokenCounter
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_PATH = ".cache/embeddings.sqlite3"
+DEFAULT_MEMORY_ITEMS = 50_000
+
+_WS_RE = re.compile(r"\s+")
+
+EmbedFn = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+
+def normalize_chunk_text(text: str) -> str:
+    """Canonical form used for hashing: NFKC, collapsed whitespace, trimmed."""
+    return _WS_RE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def chunk_text_hash(text: str) -> bytes:
+    """16-byte digest of the normalized text."""
+    return hashlib.blake2b(normalize_chunk_text(text).encode("utf-8"), digest_size=16).digest()
+
+
+class EmbeddingCacheStats(BaseModel):
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    tokens_total: int = 0
+    tokens_saved: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+
+    @property
+    def tokens_saved_share(self) -> float:
+        return self.tokens_saved / self.tokens_total if self.tokens_total else 0.0
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache keyed by (embedding model id, normalized chunk text hash).
+    - Disk tier: SQLite table with vectors stored as raw float32/float16 blobs.
+    - Memory tier: LRU of recently used vectors (float32 numpy arrays).
+    - Bulk get_many/put_many APIs; stats track hit rates and the share of tokens saved.
+    Boilerplate clauses shared across contracts are embedded once per model.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_CACHE_PATH,
+        storage_dtype: Literal["float32", "float16"] = "float32",
+        memory_items: int = DEFAULT_MEMORY_ITEMS,
+        counter: TokenCounter | None = None,
+    ):
+        self.path = Path(path)
+        self.storage_dtype = np.dtype(storage_dtype)
+        self.memory_items = memory_items
+        self.counter = counter
+        self.stats = EmbeddingCacheStats()
+        self._memory: OrderedDict[tuple[str, bytes], np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash BLOB NOT NULL,
+                dtype TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ---------- Memory tier ----------
+    def _remember(self, key: tuple[str, bytes], vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _tokens(self, text: str) -> int:
+        return self.counter.count(text) if self.counter else -(-len(text) // 4)
+
+    # ---------- Bulk API ----------
+    def get_many(self, model: str, texts: Sequence[str]) -> list[np.ndarray | None]:
+        """Look up vectors for texts; None where missing. Updates hit/token stats."""
+        hashes = [chunk_text_hash(t) for t in texts]
+        results: list[np.ndarray | None] = [None] * len(texts)
+        pending: dict[bytes, list[int]] = {}
+
+        with self._lock:
+            for i, h in enumerate(hashes):
+                vector = self._memory.get((model, h))
+                if vector is not None:
+                    self._memory.move_to_end((model, h))
+                    results[i] = vector
+                    self.stats.memory_hits += 1
+                else:
+                    pending.setdefault(h, []).append(i)
+
+            if pending:
+                keys = list(pending)
+                # SQLite caps bound parameters, so query in slices
+                for start in range(0, len(keys), 500):
+                    part = keys[start:start + 500]
+                    marks = ",".join("?" * len(part))
+                    rows = self._conn.execute(
+                        f"SELECT text_hash, dtype, vector FROM embeddings WHERE model = ? AND text_hash IN ({marks})",
+                        [model, *part],
+                    ).fetchall()
+                    for h, dtype, blob in rows:
+                        vector = np.frombuffer(blob, dtype=dtype).astype(np.float32)
+                        self._remember((model, h), vector)
+                        for i in pending.pop(h):
+                            results[i] = vector
+                            self.stats.disk_hits += 1
+                self.stats.misses += sum(len(v) for v in pending.values())
+
+        for text, vector in zip(texts, results):
+            tokens = self._tokens(text)
+            self.stats.tokens_total += tokens
+            if vector is not None:
+                self.stats.tokens_saved += tokens
+        return results
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]] | np.ndarray) -> None:
+        """Store vectors for texts (upsert)."""
+        if len(texts) != len(vectors):
+            raise ValueError(f"Got {len(vectors)} vectors for {len(texts)} texts")
+        rows = []
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                h = chunk_text_hash(text)
+                arr = np.asarray(vector, dtype=np.float32)
+                self._remember((model, h), arr)
+                rows.append((model, h, self.storage_dtype.name, arr.shape[0], arr.astype(self.storage_dtype).tobytes()))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, dtype, dim, vector) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+class CachedEmbedder:
+    """
+    Wrap a batch embedding function with an EmbeddingCache.
+    Only texts not already cached (and unique within the batch) are sent to the provider,
+    so re-ingesting a revised contract embeds just the chunks that changed.
+    Usable directly as the `embed_batch` stage of run_ingest_pipeline.
+    """
+
+    def __init__(self, embed_fn: EmbedFn, cache: EmbeddingCache, model: str):
+        self.embed_fn = embed_fn
+        self.cache = cache
+        self.model = model
+
+    async def __call__(self, texts: list[str]) -> list[list[float]]:
+        return (await self.embed_matrix(texts)).tolist()
+
+    async def embed_matrix(self, texts: Sequence[str]) -> np.ndarray:
+        """Same as calling the embedder, but returns a (n, dim) float32 matrix (see ChunkBatch)."""
+        cached = self.cache.get_many(self.model, texts)
+
+        # Dedupe misses by normalized hash so repeated boilerplate in one batch is embedded once
+        missing: dict[bytes, list[int]] = {}
+        for i, vector in enumerate(cached):
+            if vector is None:
+                missing.setdefault(chunk_text_hash(texts[i]), []).append(i)
+
+        if missing:
+            to_embed = [texts[idxs[0]] for idxs in missing.values()]
+            fresh = await self.embed_fn(to_embed)
+            self.cache.put_many(self.model, to_embed, fresh)
+            for idxs, vector in zip(missing.values(), fresh):
+                arr = np.asarray(vector, dtype=np.float32)
+                for i in idxs:
+                    cached[i] = arr
+            logger.info(f"🧮 Embedded {len(to_embed)}/{len(texts)} chunks (rest served from cache)")
+
+        vectors = [v for v in cached if v is not None]  # every slot is filled by now
+        return np.vstack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
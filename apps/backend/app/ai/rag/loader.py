@@ -0,0 +1,65 @@
+# backend/app/ai/rag/loader.py
+from pathlib import Path
+from typing import Iterator
+
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+TEXT_EXTENSIONS = (".txt", ".md")
+# Text files have no pages, so group lines into pseudo-pages of roughly this many chars
+TEXT_PAGE_CHARS = 4000
+
+
+def iter_pages(path: str | Path) -> Iterator[tuple[int, str]]:
+    """
+    Lazily yield (page_number, text) for a document, 1-based.
+    Only one page of text is held at a time, so memory does not grow with document size.
+    Supports PDF (via pypdf) and plain text / markdown.
+    """
+    path = Path(path)
+    ext = path.suffix.lower()
+    if ext == ".pdf":
+        yield from _iter_pdf_pages(path)
+    elif ext in TEXT_EXTENSIONS:
+        yield from _iter_text_pages(path)
+    else:
+        raise ValueError(f"Unsupported file type for streaming load: {ext}")
+
+
+def _iter_pdf_pages(path: Path) -> Iterator[tuple[int, str]]:
+    from pypdf import PdfReader
+
+    with open(path, "rb") as f:
+        reader = PdfReader(f)
+        for i, page in enumerate(reader.pages, start=1):
+            try:
+                text = page.extract_text() or ""
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to extract text from page {i} of {path.name}: {e}")
+                text = ""
+            yield i, text
+
+
+def _iter_text_pages(path: Path) -> Iterator[tuple[int, str]]:
+    page_no = 1
+    lines: list[str] = []
+    size = 0
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            # Form feed is the conventional page break in text exports
+            if "\f" in line:
+                head, _, tail = line.partition("\f")
+                lines.append(head)
+                yield page_no, "".join(lines)
+                page_no += 1
+                lines, size = [tail], len(tail)
+                continue
+            lines.append(line)
+            size += len(line)
+            if size >= TEXT_PAGE_CHARS:
+                yield page_no, "".join(lines)
+                page_no += 1
+                lines, size = [], 0
+    if lines:
+        yield page_no, "".join(lines)
@@ -0,0 +1,78 @@
+# backend/app/ai/rag/pipeline.py
+import asyncio
+from typing import Awaitable, Callable, Iterable
+from pydantic import BaseModel, Field
+
+from app.schemas.invoice import InvoiceChunk
+from app.utils import batched, get_logger
+
+logger = get_logger(__name__)
+
+EmbedBatchFn = Callable[[list[str]], Awaitable[list[list[float]]]]
+StoreBatchFn = Callable[[list[InvoiceChunk]], Awaitable[None]]
+
+_DONE = object()
+
+
+class PipelineConfig(BaseModel):
+    """Batching and backpressure settings for chunk -> embed -> store ingestion"""
+    batch_size: int = Field(64, ge=1, description="Chunks per embedding/storage batch.")
+    max_pending_batches: int = Field(2, ge=1, description="Batches buffered between stages before the upstream stage waits.")
+
+
+class PipelineStats(BaseModel):
+    chunks: int = 0
+    batches: int = 0
+
+
+async def run_ingest_pipeline(
+    chunks: Iterable[InvoiceChunk],
+    embed_batch: EmbedBatchFn,
+    store_batch: StoreBatchFn,
+    config: PipelineConfig | None = None,
+) -> PipelineStats:
+    """
+    Stream chunks through embedding and storage with bounded queues between stages.
+    - `chunks` is usually chunker.iter_chunks(loader.iter_pages(path)); it is pulled in a worker
+      thread so PDF text extraction doesn't block the event loop.
+    - Each queue holds at most `max_pending_batches`, so a slow embedder or database pauses
+      reading instead of piling chunks up in memory.
+    """
+    config = config or PipelineConfig()
+    to_embed: asyncio.Queue = asyncio.Queue(maxsize=config.max_pending_batches)
+    to_store: asyncio.Queue = asyncio.Queue(maxsize=config.max_pending_batches)
+    stats = PipelineStats()
+    batches = batched(chunks, config.batch_size)
+
+    async def produce() -> None:
+        while (batch := await asyncio.to_thread(next, batches, None)) is not None:
+            await to_embed.put(batch)
+        await to_embed.put(_DONE)
+
+    async def embed() -> None:
+        while (batch := await to_embed.get()) is not _DONE:
+            vectors = await embed_batch([c.content or "" for c in batch])
+            if len(vectors) != len(batch):
+                raise ValueError(f"Embedder returned {len(vectors)} vectors for {len(batch)} chunks")
+            for chunk, vector in zip(batch, vectors):
+                chunk.embedding = vector
+            await to_store.put(batch)
+        await to_store.put(_DONE)
+
+    async def store() -> None:
+        while (batch := await to_store.get()) is not _DONE:
+            await store_batch(batch)
+            stats.chunks += len(batch)
+            stats.batches += 1
+
+    tasks = [asyncio.create_task(t()) for t in (produce, embed, store)]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        # A failed stage would leave its neighbours blocked on a queue
+        for t in tasks:
+            t.cancel()
+        raise
+
+    logger.info(f"📦 Ingested {stats.chunks} chunks in {stats.batches} batches")
+    return stats
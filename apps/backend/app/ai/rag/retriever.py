@@ -0,0 +1,111 @@
+# backend/app/ai/rag/retriever.py
+import re
+from typing import Awaitable, Callable, Iterable, Sequence
+
+from pydantic import BaseModel, Field
+
+from app.ai.rag.bm25_index import BM25Index, get_org_bm25_index
+from app.ai.rag.vector_index import VectorIndex, get_org_index
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+EmbedQueryFn = Callable[[str], Awaitable[Sequence[float]]]
+
+# Standard RRF damping constant (Cormack et al.)
+RRF_K = 60
+# Identifier-ish queries are short and contain a digit: "8061-536-001", "clause 12.3", "Jet A-1"
+_IDENTIFIER_RE = re.compile(r"\d")
+IDENTIFIER_MAX_WORDS = 5
+
+
+class HybridHit(BaseModel):
+    chunk_id: str
+    score: float = Field(..., description="Reciprocal rank fusion score.")
+    bm25_rank: int | None = None
+    vector_rank: int | None = None
+    contract_id: str | None = None
+    doc_id: str | None = None
+
+
+def is_identifier_query(query: str) -> bool:
+    return len(query.split()) <= IDENTIFIER_MAX_WORDS and bool(_IDENTIFIER_RE.search(query))
+
+
+def reciprocal_rank_fusion(rankings: dict[str, list[str]], k: int = RRF_K) -> list[tuple[str, float]]:
+    """Fuse ranked id lists: score(id) = sum over lists of 1 / (k + rank), rank starting at 1."""
+    scores: dict[str, float] = {}
+    for ids in rankings.values():
+        for rank, chunk_id in enumerate(ids, start=1):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+
+
+class HybridRetriever:
+    """
+    BM25 + vector retrieval over one org's contract chunks, fused by reciprocal rank fusion.
+    - Filters by contract and document apply to both sides; the org is the index partition.
+    - Short queries containing digits (part numbers, clause numbers, index names) are answered
+      from the inverted index alone when the top hit contains every query term, so no
+      embedding call is made.
+    """
+
+    def __init__(
+        self,
+        bm25: BM25Index,
+        vectors: VectorIndex | None = None,
+        embed_query: EmbedQueryFn | None = None,
+        candidates: int = 20,
+    ):
+        self.bm25 = bm25
+        self.vectors = vectors
+        self.embed_query = embed_query
+        self.candidates = candidates
+
+    @classmethod
+    def for_org(cls, org_id: str, dim: int, embed_query: EmbedQueryFn | None = None, **kwargs) -> "HybridRetriever":
+        return cls(get_org_bm25_index(org_id), get_org_index(org_id, dim=dim), embed_query, **kwargs)
+
+    async def retrieve(
+        self,
+        query: str,
+        k: int = 4,
+        contract_ids: Iterable[str] | None = None,
+        doc_ids: Iterable[str] | None = None,
+    ) -> list[HybridHit]:
+        contract_ids = list(contract_ids) if contract_ids is not None else None
+        doc_ids = list(doc_ids) if doc_ids is not None else None
+        n = max(k, self.candidates)
+
+        lexical = self.bm25.search(query, k=n, contract_ids=contract_ids, doc_ids=doc_ids)
+        located = {h.chunk_id: (h.contract_id, h.doc_id) for h in lexical}
+
+        exact = bool(lexical) and lexical[0].matched_terms == self.bm25.query_terms(query)
+        if (exact and is_identifier_query(query)) or self.vectors is None or self.embed_query is None:
+            return [
+                HybridHit(chunk_id=h.chunk_id, score=1.0 / (RRF_K + rank), bm25_rank=rank, contract_id=h.contract_id, doc_id=h.doc_id)
+                for rank, h in enumerate(lexical[:k], start=1)
+            ]
+
+        query_vector = await self.embed_query(query)
+        semantic = self.vectors.search(query_vector, k=n, contract_ids=contract_ids, doc_ids=doc_ids)
+        for h in semantic:
+            located.setdefault(h.chunk_id, (h.contract_id, h.doc_id))
+
+        bm25_ids = [h.chunk_id for h in lexical]
+        vector_ids = [h.chunk_id for h in semantic]
+        bm25_rank = {cid: r for r, cid in enumerate(bm25_ids, start=1)}
+        vector_rank = {cid: r for r, cid in enumerate(vector_ids, start=1)}
+
+        fused = reciprocal_rank_fusion({"bm25": bm25_ids, "vector": vector_ids})
+        return [
+            HybridHit(
+                chunk_id=cid,
+                score=score,
+                bm25_rank=bm25_rank.get(cid),
+                vector_rank=vector_rank.get(cid),
+                contract_id=located[cid][0],
+                doc_id=located[cid][1],
+            )
+            for cid, score in fused[:k]
+        ]
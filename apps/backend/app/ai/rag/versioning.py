@@ -0,0 +1,231 @@
+# backend/app/ai/rag/versioning.py
+from difflib import SequenceMatcher
+from typing import Awaitable, Callable, Iterable
+
+from pydantic import BaseModel, Field
+
+from app.ai.rag.chunker import ChunkingConfig, iter_chunks
+from app.ai.rag.embedding_cache import chunk_text_hash
+from app.schemas.invoice import InvoiceChunk
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+PagesFactory = Callable[[], Iterable[tuple[int, str]]]
+EmbedBatchFn = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+
+# ---------- State ----------
+class PageFingerprint(BaseModel):
+    page: int
+    hash: str = Field(..., description="Hex digest of the normalized page text.")
+    offset: int = Field(..., description="Global character offset of the page in the chunked text.")
+    length: int
+
+
+class ChangeSummary(BaseModel):
+    """Compact description of what changed between two versions"""
+    doc_id: str
+    from_version: int | None = None
+    to_version: int
+    pages_total: int = 0
+    pages_changed: str = Field("", description="New-version page ranges that were re-chunked, e.g. '3-5,9'.")
+    pages_removed: str = Field("", description="Old-version page ranges with no counterpart, e.g. '12'.")
+    chunks_reused: int = 0
+    chunks_added: int = 0
+    chunks_removed: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        total = self.chunks_reused + self.chunks_added
+        return self.chunks_reused / total if total else 0.0
+
+
+class DocumentVersion(BaseModel):
+    """What we keep per document version to diff the next one against"""
+    doc_id: str
+    version: int = 1
+    pages: list[PageFingerprint] = Field(default_factory=list)
+    chunks: list[InvoiceChunk] = Field(default_factory=list)
+    summary: ChangeSummary | None = Field(None, description="How this version differs from the one before it.")
+
+
+class VersionedIngestResult(BaseModel):
+    version: DocumentVersion
+    summary: ChangeSummary
+    new_chunks: list[InvoiceChunk] = Field(default_factory=list, description="Chunks that were (re-)embedded.")
+    carried: dict[int, int] = Field(default_factory=dict, description="Old chunk order -> new chunk order for reused chunks.")
+    removed_orders: list[int] = Field(default_factory=list, description="Old chunk orders no longer present.")
+
+
+def _ranges(pages: Iterable[int]) -> str:
+    """[1,2,3,7,9,10] -> '1-3,7,9-10'"""
+    out: list[str] = []
+    run: list[int] = []
+    for p in sorted(set(pages)):
+        if run and p != run[-1] + 1:
+            out.append(f"{run[0]}-{run[-1]}" if len(run) > 1 else str(run[0]))
+            run = []
+        run.append(p)
+    if run:
+        out.append(f"{run[0]}-{run[-1]}" if len(run) > 1 else str(run[0]))
+    return ",".join(out)
+
+
+def fingerprint_pages(pages: Iterable[tuple[int, str]], config: ChunkingConfig) -> list[PageFingerprint]:
+    """Hash each page, tracking offsets exactly as iter_chunks lays the text out."""
+    prints: list[PageFingerprint] = []
+    doc_len = 0
+    for page_no, text in pages:
+        if text and doc_len:
+            doc_len += len(config.page_separator)
+        prints.append(PageFingerprint(page=page_no, hash=chunk_text_hash(text).hex(), offset=doc_len, length=len(text)))
+        doc_len += len(text)
+    return prints
+
+
+def _chunk_page(page_no: int, text: str, offset: int, config: ChunkingConfig) -> list[InvoiceChunk]:
+    """Chunk one page on its own, so chunks never straddle pages and edits stay local."""
+    chunks = list(iter_chunks([(page_no, text)], config))
+    for chunk in chunks:
+        meta = chunk.meta or {}
+        if "span" in meta:
+            meta["span"] = [meta["span"][0] + offset, meta["span"][1] + offset]
+        if "start_index" in meta:
+            meta["start_index"] += offset
+    return chunks
+
+
+def _chunk_pages(chunk: InvoiceChunk) -> range:
+    meta = chunk.meta or {}
+    start = meta.get("page") or 0
+    return range(start, (meta.get("page_end") or start) + 1)
+
+
+async def ingest_document_version(
+    doc_id: str,
+    pages: PagesFactory,
+    embed_batch: EmbedBatchFn,
+    previous: DocumentVersion | None = None,
+    config: ChunkingConfig | None = None,
+) -> VersionedIngestResult:
+    """
+    Ingest a new version of a document, reprocessing only the pages that changed.
+    - `pages` is called twice (hash pass, then re-read of changed regions), e.g.
+      `lambda: iter_pages(path)`, so the document is never held in memory whole.
+    - Pages are matched to the previous version by content hash (insertions, deletions and
+      edits are all handled). Chunks are page-aligned in this mode, so old chunks of unchanged
+      pages are carried forward by reference with their embeddings, and only changed pages are
+      re-chunked and embedded. Chunks from a non-versioned ingest that straddle pages are
+      rebuilt along with every page they touch.
+    - Cost is proportional to the changed pages, not the document size.
+    """
+    config = config or ChunkingConfig()
+    prints = fingerprint_pages(pages(), config)
+    version_no = (previous.version + 1) if previous else 1
+
+    old_prints = previous.pages if previous else []
+    old_chunks = previous.chunks if previous else []
+    old_by_page = {p.page: p for p in old_prints}
+    new_by_page = {p.page: p for p in prints}
+
+    # Map unchanged old pages -> new pages, and remember which equal block each belongs to
+    matcher = SequenceMatcher(a=[p.hash for p in old_prints], b=[p.hash for p in prints], autojunk=False)
+    old_to_new: dict[int, int] = {}
+    block_of: dict[int, int] = {}
+    for block_id, (i, j, size) in enumerate(matcher.get_matching_blocks()):
+        for d in range(size):
+            old_page, new_page = old_prints[i + d].page, prints[j + d].page
+            old_to_new[old_page] = new_page
+            block_of[old_page] = block_id
+    new_to_old = {n: o for o, n in old_to_new.items()}
+
+    dirty_new = {p.page for p in prints if p.page not in new_to_old}
+    removed_old = [p.page for p in old_prints if p.page not in old_to_new]
+
+    # Grow the dirty set until no surviving chunk touches it
+    carried_idx: list[int] = []
+    while True:
+        dirty_old = set(removed_old) | {new_to_old[n] for n in dirty_new if n in new_to_old}
+        carried_idx, grew = [], False
+        for idx, chunk in enumerate(old_chunks):
+            span = _chunk_pages(chunk)
+            blocks = {block_of.get(p) for p in span}
+            if any(p in dirty_old for p in span) or None in blocks or len(blocks) != 1:
+                for p in span:
+                    n = old_to_new.get(p)
+                    if n is not None and n not in dirty_new:
+                        dirty_new.add(n)
+                        grew = True
+            else:
+                carried_idx.append(idx)
+        if not grew:
+            break
+
+    # Carry chunks forward by reference, shifting page numbers and offsets
+    carried_chunks: list[tuple[int, InvoiceChunk]] = []
+    for idx in carried_idx:
+        chunk = old_chunks[idx]
+        meta = dict(chunk.meta or {})
+        first = meta.get("page") or 0  # same default as _chunk_pages
+        new_first = old_to_new[first]
+        page_shift = new_first - first
+        offset_shift = new_by_page[new_first].offset - old_by_page[first].offset
+        meta["page"] = new_first
+        meta["page_end"] = (meta.get("page_end") or first) + page_shift
+        if "span" in meta:
+            meta["span"] = [meta["span"][0] + offset_shift, meta["span"][1] + offset_shift]
+        if "start_index" in meta:
+            meta["start_index"] += offset_shift
+        carried_chunks.append((idx, chunk.model_copy(update={"meta": meta})))
+
+    # Re-chunk dirty pages, re-reading only those pages
+    fresh: list[InvoiceChunk] = []
+    if dirty_new:
+        for page_no, text in pages():
+            if page_no in dirty_new and text:
+                fresh.extend(_chunk_page(page_no, text, new_by_page[page_no].offset, config))
+
+    if fresh:
+        vectors = await embed_batch([c.content or "" for c in fresh])
+        for chunk, vector in zip(fresh, vectors):
+            chunk.embedding = vector
+
+    # Merge in document order and renumber
+    merged: list[tuple[int | None, InvoiceChunk]] = list(carried_chunks)
+    merged.extend((None, c) for c in fresh)
+    merged.sort(key=lambda item: ((item[1].meta or {}).get("page") or 0, (item[1].meta or {}).get("span", [0])[0]))
+    chunks: list[InvoiceChunk] = []
+    carried: dict[int, int] = {}
+    for order, (old_idx, chunk) in enumerate(merged):
+        chunk.order = order
+        if old_idx is not None:
+            old_order = old_chunks[old_idx].order
+            carried[old_order if old_order is not None else old_idx] = order
+        chunks.append(chunk)
+
+    carried_set = set(carried_idx)
+    removed_orders = [c.order if c.order is not None else i for i, c in enumerate(old_chunks) if i not in carried_set]
+
+    summary = ChangeSummary(
+        doc_id=doc_id,
+        from_version=previous.version if previous else None,
+        to_version=version_no,
+        pages_total=len(prints),
+        pages_changed=_ranges(dirty_new),
+        pages_removed=_ranges(removed_old),
+        chunks_reused=len(carried_chunks),
+        chunks_added=len(fresh),
+        chunks_removed=len(removed_orders),
+    )
+    logger.info(
+        f"🔁 {doc_id} v{version_no}: re-chunked pages [{summary.pages_changed}], "
+        f"reused {summary.chunks_reused} chunks, embedded {summary.chunks_added}"
+    )
+    return VersionedIngestResult(
+        version=DocumentVersion(doc_id=doc_id, version=version_no, pages=prints, chunks=chunks, summary=summary),
+        summary=summary,
+        new_chunks=fresh,
+        carried=carried,
+        removed_orders=removed_orders,
+    )
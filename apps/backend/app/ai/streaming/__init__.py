@@ -0,0 +1,12 @@
+"""
+Streaming helpers for LLM responses.
+Incremental parsing of structured (JSON) output against a `response_schema`.
+"""
+
+from .structured_stream import StreamEvent, StructuredStreamParser, stream_structured
+
+__all__ = [
+    "StreamEvent",
+    "StructuredStreamParser",
+    "stream_structured",
+]
@@ -0,0 +1,277 @@
+# backend/app/ai/streaming/structured_stream.py
+import json
+import types
+from typing import Any, AsyncIterator, Literal, Union, get_args, get_origin
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+
+from app.shared.schemas import LLMParams
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+_WS = " \t\r\n"
+_BARE_END = ",}]"
+
+
+# ---------- Events ----------
+class StreamEvent(BaseModel):
+    """One incremental result from a streamed structured response"""
+    kind: Literal["field", "item", "done", "error"]
+    field: str | None = Field(None, description="Top-level field name (None for 'done' and stream-level errors).")
+    index: int | None = Field(None, description="Position within a list field, for 'item' events.")
+    value: Any = Field(None, description="Validated value: field value, list item, or the full model on 'done'.")
+    errors: list[dict[str, Any]] | None = Field(None, description="Validation errors for 'error' events.")
+
+
+class _Frame:
+    """An open JSON object/array while scanning"""
+    __slots__ = ("kind", "state", "key", "streamed", "items")
+
+    def __init__(self, kind: str, state: str, key: str | None = None, streamed: bool = False):
+        self.kind = kind        # "obj" | "arr"
+        self.state = state      # obj: key/colon/value/after, arr: value/after
+        self.key = key          # current key (obj) or owning field (streamed arr)
+        self.streamed = streamed
+        self.items: list[Any] = []
+
+
+def _list_item_type(annotation: Any) -> Any | None:
+    """Return the item type if the annotation is (Optional) List[X] or list[X] | None, else None."""
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        if len(args) != 1:
+            return None
+        annotation = args[0]
+    if get_origin(annotation) is list:
+        args = get_args(annotation)
+        return args[0] if args else Any
+    return None
+
+
+class StructuredStreamParser:
+    """
+    Incremental JSON parser for a streamed `response_schema` object.
+    - feed() text chunks as they arrive; each call returns the events completed by that chunk.
+    - Each top-level field is validated against its annotation as soon as its value closes.
+    - List fields (e.g. `Contract.terms`, `QuoteSchema.quotes`) emit one 'item' event per
+      element, then a 'field' event with the validated list.
+    - close() validates the whole object and emits 'done' (or 'error').
+    Leading text such as markdown fences is skipped until the first '{'.
+    Only the value currently being read is buffered, never the whole response.
+    """
+
+    def __init__(self, schema: type[BaseModel]):
+        self.schema = schema
+        fields = schema.model_fields
+        self._field_adapters: dict[str, TypeAdapter] = {}
+        self._item_adapters: dict[str, TypeAdapter] = {}
+        for name, info in fields.items():
+            item_type = _list_item_type(info.annotation)
+            if item_type is not None:
+                self._item_adapters[name] = TypeAdapter(item_type)
+
+        self._stack: list[_Frame] = []
+        self._started = False
+        self._done = False
+        self._in_string = False
+        self._escape = False
+        self._bare = False
+        self._capture: list[str] | None = None
+        self._capture_depth = 0
+        self._in_key = False
+        self._key_buf: list[str] | None = None
+
+        self._raw: dict[str, Any] = {}
+        self._events: list[StreamEvent] = []
+
+    @classmethod
+    def from_params(cls, params: LLMParams) -> "StructuredStreamParser":
+        if params.response_schema is None:
+            raise ValueError("LLMParams.response_schema is required for structured streaming.")
+        return cls(params.response_schema)
+
+    @property
+    def partial(self) -> dict[str, Any]:
+        """Raw (decoded, not validated) values of the fields completed so far."""
+        return dict(self._raw)
+
+    # ---------- Public API ----------
+    def feed(self, chunk: str) -> list[StreamEvent]:
+        for c in chunk:
+            if self._done:
+                break
+            self._step(c)
+        events, self._events = self._events, []
+        return events
+
+    def close(self) -> list[StreamEvent]:
+        if not self._done:
+            self._events.append(StreamEvent(
+                kind="error",
+                errors=[{"type": "incomplete_json", "msg": "Stream ended before the root object closed."}],
+            ))
+        else:
+            try:
+                model = self.schema.model_validate(self._raw)
+                self._events.append(StreamEvent(kind="done", value=model))
+            except ValidationError as e:
+                self._events.append(StreamEvent(kind="error", errors=e.errors(include_url=False)))
+        events, self._events = self._events, []
+        return events
+
+    # ---------- Scanner ----------
+    def _step(self, c: str) -> None:
+        # A number/true/false/null ends at the first delimiter
+        if self._bare and (c in _WS or c in _BARE_END):
+            self._bare = False
+            self._value_done()
+
+        if self._capture is not None:
+            self._capture.append(c)
+
+        if self._in_string:
+            if self._key_buf is not None:
+                self._key_buf.append(c)
+            if self._escape:
+                self._escape = False
+            elif c == "\\":
+                self._escape = True
+            elif c == '"':
+                self._in_string = False
+                if self._in_key:
+                    self._in_key = False
+                    self._stack[-1].state = "colon"
+                    if self._key_buf is not None:
+                        self._stack[-1].key = json.loads('"' + "".join(self._key_buf))
+                        self._key_buf = None
+                else:
+                    self._value_done()
+            return
+
+        if self._bare:
+            return
+
+        if not self._started:
+            if c == "{":
+                self._started = True
+                self._stack.append(_Frame("obj", "key"))
+            return
+
+        if c in _WS:
+            return
+
+        frame = self._stack[-1]
+        if frame.state == "key":
+            if c == '"':
+                self._in_string = True
+                self._in_key = True
+                if len(self._stack) == 1:
+                    self._key_buf = []
+            elif c == "}":
+                self._close()
+        elif frame.state == "colon":
+            if c == ":":
+                frame.state = "value"
+        elif frame.state == "after":
+            if c == ",":
+                frame.state = "key" if frame.kind == "obj" else "value"
+            elif c in "}]":
+                self._close()
+        elif c == "]" and frame.kind == "arr":
+            self._close()  # empty array
+        else:
+            self._begin_value(c)
+
+    def _begin_value(self, c: str) -> None:
+        depth = len(self._stack)
+        parent = self._stack[-1]
+        streamed_list = depth == 1 and c == "[" and parent.key in self._item_adapters
+
+        if self._capture is None and not streamed_list:
+            if depth == 1 or (depth == 2 and parent.streamed):
+                self._capture = [c]
+                self._capture_depth = depth
+
+        if c == "{":
+            self._stack.append(_Frame("obj", "key"))
+        elif c == "[":
+            self._stack.append(_Frame("arr", "value", key=parent.key if streamed_list else None, streamed=streamed_list))
+        elif c == '"':
+            self._in_string = True
+        else:
+            self._bare = True
+
+    def _close(self) -> None:
+        frame = self._stack.pop()
+        if not self._stack:
+            self._done = True
+            return
+        if frame.streamed:
+            self._finish_list(frame)
+        self._value_done()
+
+    def _value_done(self) -> None:
+        frame = self._stack[-1]
+        frame.state = "after"
+        if self._capture is None or self._capture_depth != len(self._stack):
+            return
+        text = "".join(self._capture)
+        self._capture = None
+        try:
+            raw = json.loads(text)
+        except json.JSONDecodeError as e:
+            self._events.append(StreamEvent(kind="error", field=frame.key, errors=[{"type": "json_invalid", "msg": str(e)}]))
+            return
+        if frame.kind == "arr":
+            self._emit_item(frame, raw)
+        else:
+            self._emit_field(frame.key, raw)
+
+    # ---------- Validation ----------
+    def _field_adapter(self, name: str) -> TypeAdapter | None:
+        adapter = self._field_adapters.get(name)
+        if adapter is None:
+            info = self.schema.model_fields.get(name)
+            if info is None or info.annotation is None:
+                return None
+            adapter = self._field_adapters[name] = TypeAdapter(info.annotation)
+        return adapter
+
+    def _emit_field(self, name: str | None, raw: Any) -> None:
+        if name is None:
+            return
+        self._raw[name] = raw
+        adapter = self._field_adapter(name)
+        if adapter is None:
+            return  # unknown key, surfaced by the final model validation
+        try:
+            value = adapter.validate_python(raw)
+        except ValidationError as e:
+            self._events.append(StreamEvent(kind="error", field=name, errors=e.errors(include_url=False)))
+            return
+        self._events.append(StreamEvent(kind="field", field=name, value=value))
+
+    def _emit_item(self, frame: _Frame, raw: Any) -> None:
+        if frame.key is None:
+            return  # only streamed list fields capture items
+        index = len(frame.items)
+        frame.items.append(raw)
+        try:
+            value = self._item_adapters[frame.key].validate_python(raw)
+        except ValidationError as e:
+            self._events.append(StreamEvent(kind="error", field=frame.key, index=index, errors=e.errors(include_url=False)))
+            return
+        self._events.append(StreamEvent(kind="item", field=frame.key, index=index, value=value))
+
+    def _finish_list(self, frame: _Frame) -> None:
+        self._emit_field(frame.key, frame.items)
+
+
+async def stream_structured(chunks: AsyncIterator[str], schema: type[BaseModel]) -> AsyncIterator[StreamEvent]:
+    """Turn an async stream of text deltas into validated StreamEvents."""
+    parser = StructuredStreamParser(schema)
+    async for chunk in chunks:
+        for event in parser.feed(chunk):
+            yield event
+    for event in parser.close():
+        yield event
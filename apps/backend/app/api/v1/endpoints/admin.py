@@ -1,9 +1,11 @@
 # backend/app/api/v1/endpoints/admin.py
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import Response
+from app.core.profiling import get_profile_store, profile_scope, require_profiling_admin
 from app.shared.schemas import ResponseEnvelope
 from app.utils import get_logger
-from app.llama import update_extractor_agents
+from app.db.session import get_pool_stats
 
 logger = get_logger(__name__)
 
@@ -16,9 +18,53 @@ def update_extractors_endpoint(
     """
     Update the extractor agents with the latest schema and system prompt
     """
+    from app.llama import update_extractor_agents  # lazy: pulls in the LlamaCloud SDKs
+
     updated_agents = update_extractor_agents()
     return ResponseEnvelope(
         data={f"updated {len(updated_agents)} extractor agents"},
         success=True,
         message="Extractor agents updated successfully"
-    )
\ No newline at end of file
+    )
+
+# GET /api/v1/admin/db/pool - Database pool usage and checkout times
+@router.get("/db/pool", response_model=ResponseEnvelope)
+def db_pool_stats_endpoint(_: dict = Depends(require_profiling_admin)) -> ResponseEnvelope:
+    """
+    Connection pool size, checked-out connections and checkout time percentiles
+    """
+    return ResponseEnvelope(
+        data=get_pool_stats().model_dump(),
+        success=True,
+        message="Database pool stats"
+    )
+
+# GET /api/v1/admin/profiles - Most recent request profiles
+@router.get("/profiles", response_model=ResponseEnvelope)
+def list_profiles_endpoint(auth: dict = Depends(require_profiling_admin)) -> ResponseEnvelope:
+    """
+    Request profiles in the ring buffer, newest first (summary and hottest functions, no raw data).
+    Org admins only see their own org's requests.
+    """
+    profiles = get_profile_store().list(profile_scope(auth))
+    return ResponseEnvelope(
+        data=[p.model_dump(mode="json") for p in profiles],
+        success=True,
+        message=f"{len(profiles)} profiles"
+    )
+
+# GET /api/v1/admin/profiles/{profile_id} - Download one profile
+@router.get("/profiles/{profile_id}")
+def download_profile_endpoint(profile_id: str, auth: dict = Depends(require_profiling_admin)) -> Response:
+    """
+    Collapsed stacks (sampling mode, for speedscope/flamegraph.pl) or a pstats file (deterministic mode)
+    """
+    found = get_profile_store().get(profile_id, profile_scope(auth))
+    if found is None:
+        raise HTTPException(status_code=404, detail="Profile not found (evicted or never captured)")
+    summary, data = found
+    if summary.mode == "sampling":
+        media_type, filename = "text/plain", f"profile-{profile_id}.collapsed.txt"
+    else:
+        media_type, filename = "application/octet-stream", f"profile-{profile_id}.prof"
+    return Response(content=data, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
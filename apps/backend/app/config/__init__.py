@@ -18,12 +18,25 @@ from .ai_config import (
     OpenAISettings,
     TavilySettings,
 )
+from .db_config import DatabaseSettings
+from .server_config import ServerSettings
+from .profiling_config import ProfilingSettings, ProfileMode
 
 # Singleton config so we can `from config import ai_config` anywhere
 ai_config = AIConfig()
+db_config = DatabaseSettings()
+server_config = ServerSettings()
+profiling_config = ProfilingSettings()
 
 __all__ = [
     "ai_config", # Singleton instance
+    "db_config", # Singleton instance
+    "server_config", # Singleton instance
+    "profiling_config", # Singleton instance
+    "DatabaseSettings",
+    "ServerSettings",
+    "ProfilingSettings",
+    "ProfileMode",
     "AIConfig", # Class
     "AIPlatform", # Enum for switching/checking platforms
     "OpenAIChatModel",
@@ -41,6 +41,7 @@ class OpenAISettings(BaseModel):
 
 class LlamaSettings(BaseModel):
     cloud_api_key: str | None = None
+    base_url: str | None = None  # None = LlamaCloud; point at a local stand-in for load tests
     organization_id: str | None = None
     extract_project_id: str | None = None
 
@@ -82,6 +83,7 @@ class AIConfig(BaseModel):
         # Only secrets come from env
         self.openai.api_key = os.getenv("OPENAI_API_KEY")
         self.llama.cloud_api_key = os.getenv("LLAMA_CLOUD_API_KEY")
+        self.llama.base_url = os.getenv("LLAMA_CLOUD_BASE_URL")
         self.llama.organization_id = os.getenv("LLAMA_ORGANIZATION_ID")
         self.llama.extract_project_id = os.getenv("LLAMA_EXTRACT_PROJECT_ID")
         self.tavily.api_key = os.getenv("TAVILY_API_KEY")
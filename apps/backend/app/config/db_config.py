@@ -0,0 +1,71 @@
+# backend/app/config/db_config.py
+import os
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from pydantic import BaseModel, Field
+
+# Supabase's transaction pooler (pgbouncer/supavisor) listens on 6543
+POOLER_PORTS: tuple[int, ...] = (6543,)
+POOLER_HOST_MARKERS: tuple[str, ...] = ("pooler.supabase.com",)
+
+
+class DatabaseSettings(BaseModel):
+    url: str | None = None
+
+    # Client-side pool (per worker process)
+    pool_size: int = Field(5, ge=1, description="Connections kept open per worker.")
+    max_overflow: int = Field(5, ge=0, description="Extra connections allowed under burst load.")
+    pool_timeout: float = Field(10.0, gt=0, description="Seconds to wait for a free connection before failing.")
+    pool_recycle: int = Field(1800, description="Seconds after which a connection is replaced (-1 = never).")
+    pool_pre_ping: bool = True
+    connect_timeout: float = 10.0
+
+    # Statement caching. None = decide from the URL: off behind a transaction pooler,
+    # where prepared statements don't survive across transactions, on for direct connections.
+    statement_cache_size: int | None = None
+    echo: bool = False
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        env = os.getenv
+        self.url = self.url or env("DATABASE_URL")
+        self.pool_size = int(env("DB_POOL_SIZE", self.pool_size))
+        self.max_overflow = int(env("DB_MAX_OVERFLOW", self.max_overflow))
+        self.pool_timeout = float(env("DB_POOL_TIMEOUT", self.pool_timeout))
+        if cache_size := env("DB_STATEMENT_CACHE_SIZE"):  # empty = unset (decide from the URL)
+            self.statement_cache_size = int(cache_size)
+        self.echo = env("DB_ECHO", str(self.echo)).lower() == "true"
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.url)
+
+    @property
+    def uses_pooler(self) -> bool:
+        """True for the Supabase pooled (transaction mode) connection string."""
+        if not self.url:
+            return False
+        parts = urlsplit(self.url)
+        host = parts.hostname or ""
+        return parts.port in POOLER_PORTS or any(m in host for m in POOLER_HOST_MARKERS)
+
+    @property
+    def effective_statement_cache_size(self) -> int:
+        if self.statement_cache_size is not None:
+            return self.statement_cache_size
+        return 0 if self.uses_pooler else 100
+
+    @property
+    def async_url(self) -> str:
+        """DATABASE_URL rewritten for SQLAlchemy + asyncpg (driver prefix, libpq-only params removed)."""
+        if not self.url:
+            raise ValueError("DATABASE_URL is not set")
+        parts = urlsplit(self.url)
+        query = [(k, v) for k, v in parse_qsl(parts.query) if k != "sslmode"]
+        return urlunsplit(("postgresql+asyncpg", parts.netloc, parts.path, urlencode(query), parts.fragment))
+
+    @property
+    def ssl_mode(self) -> str | None:
+        if not self.url:
+            return None
+        return dict(parse_qsl(urlsplit(self.url).query)).get("sslmode")
@@ -0,0 +1,38 @@
+# backend/app/config/profiling_config.py
+import os
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+ProfileMode = Literal["sampling", "deterministic"]
+
+
+class ProfilingSettings(BaseModel):
+    # Off = the middleware isn't installed at all
+    enabled: bool = False
+    header: str = Field("X-Profile", description="Request header an admin sets to profile that request ('1', 'sampling' or 'deterministic').")
+    sample_rate: float = Field(0.0, ge=0, le=1, description="Share of all requests profiled without the header.")
+    mode: ProfileMode = "sampling"
+    interval_ms: float = Field(5.0, gt=0, description="Stack sampling interval in sampling mode.")
+
+    # Ring buffer (kept in the shared cache tier, so every worker sees the same profiles)
+    capacity: int = Field(50, ge=1, description="Most recent profiles kept.")
+    ttl_hours: float = Field(24.0, gt=0)
+
+    # Who may request profiles and read them
+    admin_roles: list[str] = Field(default_factory=list, description="org_role/orgRole claim values accepted as admins of their own org (they only see that org's profiles).")
+    admin_user_ids: list[str] = Field(default_factory=list, description="Clerk user ids of platform admins, who see every org's profiles.")
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        env = os.getenv
+        self.enabled = env("PROFILING_ENABLED", str(self.enabled)).lower() == "true"
+        self.header = env("PROFILE_HEADER", self.header)
+        self.sample_rate = float(env("PROFILE_SAMPLE_RATE", self.sample_rate))
+        self.mode = "deterministic" if env("PROFILE_MODE", self.mode).lower() == "deterministic" else "sampling"
+        self.interval_ms = float(env("PROFILE_INTERVAL_MS", self.interval_ms))
+        self.capacity = int(env("PROFILE_CAPACITY", self.capacity))
+        if roles := env("PROFILE_ADMIN_ROLES"):
+            self.admin_roles = [r.strip() for r in roles.split(",") if r.strip()]
+        if user_ids := env("PROFILE_ADMIN_USER_IDS"):
+            self.admin_user_ids = [u.strip() for u in user_ids.split(",") if u.strip()]
@@ -0,0 +1,65 @@
+# backend/app/config/server_config.py
+import os
+import tempfile
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+ServeMode = Literal["development", "production"]
+
+
+def _cpu_count() -> int:
+    """Cores this process may run on (respects container CPU affinity where the OS exposes it)."""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def _default_cache_dir() -> str:
+    # tmpfs on Linux, so the shared cache never touches disk
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+class ServerSettings(BaseModel):
+    mode: ServeMode = "development"
+    host: str = "0.0.0.0"
+    port: int = 8000
+    log_level: str = "info"
+
+    # Development only: production never reloads
+    reload: bool = True
+
+    # Production worker pool
+    workers: int = Field(0, ge=0, description="Worker processes (0 = one per available core).")
+    graceful_timeout: int = Field(30, ge=1, description="Seconds in-flight requests get to finish on shutdown/restart.")
+    keep_alive: int = Field(5, ge=1, description="Seconds an idle keep-alive connection stays open.")
+    max_requests: int | None = Field(None, description="Recycle a worker after this many requests (None = never).")
+
+    # Cross-process cache tier (JWKS, verified tokens); None = per-process memory only
+    shared_cache_path: str | None = None
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        env = os.getenv
+        self.mode = "production" if env("SERVE_MODE", self.mode).lower() in ("prod", "production") else "development"
+        self.host = env("HOST", self.host)
+        self.port = int(env("PORT", self.port))
+        self.log_level = env("LOG_LEVEL", self.log_level)
+        self.reload = env("RELOAD", str(self.reload)).lower() == "true"
+        self.workers = int(env("WEB_CONCURRENCY", self.workers))
+        self.graceful_timeout = int(env("GRACEFUL_TIMEOUT", self.graceful_timeout))
+        self.keep_alive = int(env("KEEP_ALIVE", self.keep_alive))
+        if max_requests := env("MAX_REQUESTS"):
+            self.max_requests = int(max_requests)
+        if self.shared_cache_path is None:
+            cache_dir = env("SHARED_CACHE_DIR", _default_cache_dir())
+            if cache_dir.lower() not in ("", "off", "none"):
+                self.shared_cache_path = os.path.join(cache_dir, f"fleet-ai-cache-{self.port}.sqlite3")
+
+    @property
+    def production(self) -> bool:
+        return self.mode == "production"
+
+    @property
+    def effective_workers(self) -> int:
+        return self.workers or _cpu_count()
@@ -1,3 +1,11 @@
 from .auth import require_auth
+from .profiling import ProfilingMiddleware, ProfileStore, ProfileSummary, get_profile_store, require_profiling_admin
 
-__all__ = ["require_auth"]
+__all__ = [
+    "require_auth",
+    "ProfilingMiddleware",
+    "ProfileStore",
+    "ProfileSummary",
+    "get_profile_store",
+    "require_profiling_admin",
+]
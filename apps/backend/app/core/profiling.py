@@ -0,0 +1,293 @@
+# backend/app/core/profiling.py
+import asyncio
+import base64
+import cProfile
+import marshal
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from pydantic import BaseModel, Field
+
+from app.config import ProfileMode, ProfilingSettings, profiling_config
+from app.core.auth import bearer, require_auth
+from app.services.shared_cache import SharedCache, get_shared_cache
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+KEY_PREFIX = "profile:"
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py", "concurrent/futures/thread.py")
+_SITE_MARKERS = ("site-packages/", "dist-packages/", "lib/python")
+
+
+class ProfileSummary(BaseModel):
+    id: str
+    method: str
+    path: str
+    status_code: int | None = None
+    trigger: str = Field(..., description="'header' (requested by an admin) or 'sample'.")
+    mode: ProfileMode
+    user_id: str | None = None
+    org_id: str | None = None
+    worker_pid: int
+    started_at: datetime
+    duration_ms: float
+    samples: int = Field(0, description="Stack samples (sampling) or profiled calls (deterministic).")
+    concurrent_requests: int = Field(0, description="Other requests in flight on this worker meanwhile; they can show up in the profile.")
+    top: list[dict[str, Any]] = Field(default_factory=list, description="Hottest functions by self time.")
+
+
+def is_profiling_admin(auth: dict, settings: ProfilingSettings = profiling_config) -> bool:
+    claims = auth.get("claims") or {}
+    role = claims.get("org_role") or claims.get("orgRole")
+    return auth.get("user_id") in settings.admin_user_ids or (role is not None and role in settings.admin_roles)
+
+
+async def require_profiling_admin(creds: HTTPAuthorizationCredentials | None = Depends(bearer)) -> dict:
+    auth = await require_auth(creds)
+    if not is_profiling_admin(auth):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Profiling is restricted to admins")
+    return auth
+
+
+def profile_scope(auth: dict, settings: ProfilingSettings = profiling_config) -> str | None:
+    """Org whose profiles this admin may read; None for platform admins, who see every org."""
+    return None if auth.get("user_id") in settings.admin_user_ids else auth.get("org_id") or ""
+
+
+# ---------- Ring buffer ----------
+class ProfileStore:
+    """
+    The `capacity` most recent profiles, oldest evicted first. Stored in the shared cache tier, so a
+    profile captured by one worker can be listed and downloaded through any other.
+    """
+
+    def __init__(self, cache: SharedCache, capacity: int, ttl_hours: float):
+        self.cache = cache
+        self.capacity = capacity
+        self.ttl = ttl_hours * 3600
+
+    def add(self, summary: ProfileSummary, data: bytes) -> None:
+        self.cache.set(KEY_PREFIX + summary.id, {"summary": summary.model_dump(mode="json"), "data": base64.b64encode(data).decode()}, ttl=self.ttl)
+        keys = self.cache.keys(KEY_PREFIX)
+        for key in keys[: max(0, len(keys) - self.capacity)]:  # ids sort by capture time
+            self.cache.delete(key)
+
+    def list(self, org_id: str | None = None) -> list[ProfileSummary]:
+        """Newest first; with `org_id`, only profiles of that org's requests."""
+        entries = (self.cache.get(key) for key in reversed(self.cache.keys(KEY_PREFIX)))
+        summaries = [ProfileSummary(**e["summary"]) for e in entries if e is not None]
+        return summaries if org_id is None else [s for s in summaries if s.org_id == org_id]
+
+    def get(self, profile_id: str, org_id: str | None = None) -> tuple[ProfileSummary, bytes] | None:
+        entry = self.cache.get(KEY_PREFIX + profile_id)
+        if entry is None:
+            return None
+        summary = ProfileSummary(**entry["summary"])
+        if org_id is not None and summary.org_id != org_id:
+            return None
+        return summary, base64.b64decode(entry["data"])
+
+
+_store: ProfileStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_profile_store() -> ProfileStore:
+    """Process-wide ProfileStore on the shared cache tier."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ProfileStore(get_shared_cache(), profiling_config.capacity, profiling_config.ttl_hours)
+        return _store
+
+
+# ---------- Captures ----------
+def _label(code) -> str:
+    path = code.co_filename.replace("\\", "/")
+    for marker in _SITE_MARKERS:
+        if marker in path:
+            path = path.split(marker, 1)[1]
+            break
+    else:
+        path = path.split("/app/", 1)[-1] if "/app/" in path else os.path.basename(path)
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+
+class _SamplingCapture:
+    """
+    Samples stacks every `interval_ms` from a background thread while the request runs.
+    Event-loop samples count only when this request's task is the one executing; busy worker threads
+    (sync endpoints run in the threadpool) are included too. Output is collapsed stacks
+    ('outer;inner count' lines) for speedscope or flamegraph.pl.
+    """
+
+    def __init__(self, interval_ms: float):
+        self.interval = interval_ms / 1000
+        self.stacks: Counter = Counter()
+        self._loop_thread = threading.get_ident()
+        task = asyncio.current_task()
+        self._task_frame = getattr(task.get_coro(), "cr_frame", None) if task is not None else None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                ours = ident != self._loop_thread or self._task_frame is None
+                while frame is not None:
+                    if frame is self._task_frame:
+                        ours = True
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                if not stack or not ours or self._stop.is_set():  # stop() itself shows up as a join
+                    continue
+                if ident != self._loop_thread and stack[0].co_filename.replace("\\", "/").endswith(_IDLE_FILES):
+                    continue  # parked worker thread
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def stop(self) -> tuple[bytes, int, list[dict[str, Any]]]:
+        self._stop.set()
+        self._thread.join()
+        total = sum(self.stacks.values())
+        lines = [";".join(_label(c) for c in stack) + f" {n}" for stack, n in self.stacks.most_common()]
+        leaves = Counter()
+        for stack, n in self.stacks.items():
+            leaves[_label(stack[-1])] += n
+        top = [{"function": f, "samples": n, "share": round(n / total, 3)} for f, n in leaves.most_common(10)]
+        return "\n".join(lines).encode(), total, top
+
+
+class _DeterministicCapture:
+    """cProfile on the event-loop thread; one at a time per worker. The download is a pstats file (snakeviz, pstats.Stats)."""
+
+    _busy = threading.Lock()
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self) -> bool:
+        if not self._busy.acquire(blocking=False):
+            return False
+        try:
+            self.profile.enable()
+        except ValueError:  # another profiler (e.g. a debugger) is active
+            self._busy.release()
+            return False
+        return True
+
+    def stop(self) -> tuple[bytes, int, list[dict[str, Any]]]:
+        self.profile.disable()
+        self._busy.release()
+        self.profile.create_stats()
+        raw: dict = self.profile.stats  # type: ignore[attr-defined]  # set by create_stats(), missing from the stubs
+        rows = sorted(raw.items(), key=lambda kv: -kv[1][2])[:10]  # by own (total) time
+        top = [
+            {"function": f"{func} ({os.path.basename(file)}:{line})", "calls": nc, "tottime_ms": round(tt * 1000, 3), "cumtime_ms": round(ct * 1000, 3)}
+            for (file, line, func), (_, nc, tt, ct, _) in rows
+        ]
+        return marshal.dumps(raw), sum(v[1] for v in raw.values()), top
+
+
+# ---------- Middleware ----------
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware, installed only when PROFILING_ENABLED=true. A request is profiled when it
+    carries the profiling header and its bearer token belongs to a profiling admin, or when it falls
+    in PROFILE_SAMPLE_RATE. Anything else passes through after one header lookup.
+    """
+
+    def __init__(self, app, settings: ProfilingSettings = profiling_config, store: ProfileStore | None = None):
+        self.app = app
+        self.settings = settings
+        self.store = store
+        self._header = settings.header.lower().encode()
+        self._in_flight = 0
+
+    async def _trigger(self, scope) -> tuple[str, ProfileMode, dict | None] | None:
+        headers = dict(scope.get("headers") or ())
+        requested = headers.get(self._header)
+        if requested is not None:
+            scheme, _, token = headers.get(b"authorization", b"").decode("latin-1").partition(" ")
+            try:
+                auth = await require_auth(HTTPAuthorizationCredentials(scheme=scheme, credentials=token) if token else None)
+            except HTTPException:
+                return None  # the route's own auth check answers the request
+            if not is_profiling_admin(auth, self.settings):
+                return None
+            value = requested.decode("latin-1").strip().lower()
+            mode = value if value in ("sampling", "deterministic") else self.settings.mode
+            return "header", mode, auth
+        if self.settings.sample_rate and random.random() < self.settings.sample_rate:
+            return "sample", self.settings.mode, None
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        self._in_flight += 1
+        try:
+            trigger = await self._trigger(scope)
+            if trigger is None or scope["path"].startswith("/api/v1/admin/profiles"):
+                return await self.app(scope, receive, send)
+            await self._profile(scope, receive, send, *trigger)
+        finally:
+            self._in_flight -= 1
+
+    async def _profile(self, scope, receive, send, trigger: str, mode: ProfileMode, auth: dict | None) -> None:
+        capture = _DeterministicCapture() if mode == "deterministic" else _SamplingCapture(self.settings.interval_ms)
+        if capture.start() is False:
+            logger.debug(f"Skipped profiling {scope['path']}: another deterministic profile is running")
+            return await self.app(scope, receive, send)
+
+        response_status: list[int] = []
+        peak_concurrency = self._in_flight - 1
+
+        async def send_wrapper(message):
+            nonlocal peak_concurrency
+            if message["type"] == "http.response.start":
+                response_status.append(message["status"])
+            peak_concurrency = max(peak_concurrency, self._in_flight - 1)
+            await send(message)
+
+        started_at, start = datetime.now(timezone.utc), time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            data, samples, top = capture.stop()
+            summary = ProfileSummary(
+                id=f"{time.time_ns():020d}-{os.getpid()}",
+                method=scope["method"],
+                path=scope["path"],
+                status_code=response_status[0] if response_status else None,
+                trigger=trigger,
+                mode=mode,
+                user_id=auth.get("user_id") if auth else None,
+                org_id=auth.get("org_id") if auth else None,
+                worker_pid=os.getpid(),
+                started_at=started_at,
+                duration_ms=round(duration_ms, 3),
+                samples=samples,
+                concurrent_requests=peak_concurrency,
+                top=top,
+            )
+            # SharedCache is SQLite-backed; keep its writes off the event loop
+            await asyncio.to_thread((self.store or get_profile_store()).add, summary, data)
+            logger.info(f"🔬 Profiled {summary.method} {summary.path} in {duration_ms:.1f} ms ({mode}, {trigger}) -> {summary.id}")
@@ -0,0 +1,81 @@
+# app/db/__init__.py
+"""Database access: pooled async engine/sessions, bulk writes and table operations."""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+from .session import (
+  init_engine,
+  dispose_engine,
+  get_engine,
+  connect,
+  raw_connection,
+  get_db,
+  get_raw_db,
+  get_table,
+  get_pool_stats,
+  PoolStats,
+)
+
+# Bulk writes (numpy, pgvector codecs) and test doubles load on first use, keeping app startup lean
+_LAZY = {
+  "BulkWriteConfig": ".bulk",
+  "bulk_upsert": ".bulk",
+  "upsert_rows": ".bulk",
+  "register_vector_codec": ".bulk",
+  "encode_vector": ".bulk",
+  "encode_vectors": ".bulk",
+  "decode_vector": ".bulk",
+  "decode_vectors": ".bulk",
+  "quote_ident": ".bulk",
+  "FakeConnection": ".fakes",
+  "FakeCall": ".fakes",
+}
+
+if TYPE_CHECKING:
+  from .bulk import (
+    BulkWriteConfig,
+    bulk_upsert,
+    upsert_rows,
+    register_vector_codec,
+    encode_vector,
+    encode_vectors,
+    decode_vector,
+    decode_vectors,
+    quote_ident,
+  )
+  from .fakes import FakeConnection, FakeCall
+
+
+def __getattr__(name: str):
+  module = _LAZY.get(name)
+  if module is None:
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+  return getattr(import_module(module, __name__), name)
+
+__all__ = [
+  # Engine and sessions
+  "init_engine",
+  "dispose_engine",
+  "get_engine",
+  "connect",
+  "raw_connection",
+  "get_db",
+  "get_raw_db",
+  "get_table",
+  "get_pool_stats",
+  "PoolStats",
+  # Bulk writes
+  "BulkWriteConfig",
+  "bulk_upsert",
+  "upsert_rows",
+  "register_vector_codec",
+  "encode_vector",
+  "encode_vectors",
+  "decode_vector",
+  "decode_vectors",
+  "quote_ident",
+  # Test doubles
+  "FakeConnection",
+  "FakeCall",
+]
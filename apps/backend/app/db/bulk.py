@@ -0,0 +1,177 @@
+# backend/app/db/bulk.py
+import struct
+import weakref
+from typing import Any, Iterable, Literal, Sequence
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from app.utils import batched, get_logger
+
+logger = get_logger(__name__)
+
+# pgvector binary wire format: int16 dim, int16 unused, then dim big-endian float4
+_PGVECTOR_HEADER = struct.Struct(">hh")
+
+# Connections (asyncpg Connection or test double) that already have the vector codec
+_codec_registered: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+class BulkWriteConfig(BaseModel):
+    """How bulk upserts are sent to Postgres"""
+    batch_size: int = Field(500, ge=1, description="Rows per COPY/executemany batch.")
+    method: Literal["copy", "executemany"] = Field(
+        "copy",
+        description="'copy' streams rows into a temp staging table with binary COPY and merges them with one "
+        "INSERT ... ON CONFLICT per batch; 'executemany' sends a pipelined parameterized upsert.",
+    )
+
+
+# ---------- pgvector codec ----------
+def encode_vector(value: bytes | memoryview | Sequence[float] | np.ndarray) -> bytes:
+    """pgvector binary value. Pre-encoded bytes (ChunkBatch.pgvector_binary) pass through untouched."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    arr = np.ascontiguousarray(value, dtype=">f4")
+    return _PGVECTOR_HEADER.pack(arr.shape[0], 0) + arr.tobytes()
+
+
+def encode_vectors(matrix: np.ndarray) -> list[bytes]:
+    """pgvector binary values for each row of an (n, dim) matrix, with one vectorized byteswap."""
+    n, dim = matrix.shape
+    raw = memoryview(np.ascontiguousarray(matrix, dtype=">f4")).cast("B")
+    header = _PGVECTOR_HEADER.pack(dim, 0)
+    row_bytes = dim * 4
+    return [header + raw[i * row_bytes:(i + 1) * row_bytes] for i in range(n)]
+
+
+def decode_vector(data: bytes) -> np.ndarray:
+    dim = _PGVECTOR_HEADER.unpack_from(data)[0]
+    return np.frombuffer(data, dtype=">f4", count=dim, offset=_PGVECTOR_HEADER.size).astype(np.float32)
+
+
+def decode_vectors(values: Sequence[bytes | memoryview]) -> np.ndarray:
+    """
+    (n, dim) float32 matrix from pgvector binary values of one dimension. The payloads are joined and
+    read with a single frombuffer: each 4-byte header lines up with one float column, which is dropped.
+    """
+    if not values:
+        return np.empty((0, 0), dtype=np.float32)
+    dim = _PGVECTOR_HEADER.unpack_from(values[0])[0]
+    blob = b"".join(values)
+    if len(blob) != len(values) * (dim + 1) * 4:
+        raise ValueError(f"pgvector values are not all {dim}-dimensional")
+    headers = np.frombuffer(blob, dtype=">i2").reshape(len(values), 2 * (dim + 1))[:, 0]
+    if (headers != dim).any():
+        raise ValueError(f"pgvector values are not all {dim}-dimensional")
+    return np.frombuffer(blob, dtype=">f4").reshape(len(values), dim + 1)[:, 1:].astype(np.float32)
+
+
+async def register_vector_codec(conn: Any, force: bool = False) -> None:
+    """Teach the connection to send/receive `vector` columns in binary. Done once per connection."""
+    raw = getattr(conn, "_con", None) or conn  # unwrap asyncpg pool proxies
+    if not force and raw in _codec_registered:
+        return
+    await conn.set_type_codec("vector", schema="public", encoder=encode_vector, decoder=decode_vector, format="binary")
+    _codec_registered.add(raw)
+
+
+# ---------- SQL helpers ----------
+def quote_ident(name: str) -> str:
+    """Quote an identifier ("order" is reserved), handling schema-qualified names."""
+    return ".".join('"' + part.replace('"', '""') + '"' for part in name.split("."))
+
+
+def _dedupe(batch: list[tuple], key_idx: list[int]) -> list[tuple]:
+    """Last row wins per conflict key; ON CONFLICT can't touch the same row twice in one statement."""
+    by_key = {tuple(r[i] for i in key_idx): r for r in batch}
+    return list(by_key.values()) if len(by_key) != len(batch) else batch
+
+
+def _upsert_sql(
+    table: str,
+    source: str,
+    columns: Sequence[str],
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str],
+    touch_column: str | None,
+) -> str:
+    cols = ", ".join(quote_ident(c) for c in columns)
+    conflict = ", ".join(quote_ident(c) for c in conflict_columns)
+    sets = [f"{quote_ident(c)} = EXCLUDED.{quote_ident(c)}" for c in update_columns]
+    if touch_column:
+        sets.append(f"{quote_ident(touch_column)} = now()")
+    action = f"DO UPDATE SET {', '.join(sets)}" if sets else "DO NOTHING"
+    return f"INSERT INTO {quote_ident(table)} ({cols}) {source} ON CONFLICT ({conflict}) {action}"
+
+
+# ---------- Bulk upsert ----------
+async def bulk_upsert(
+    conn: Any,
+    table: str,
+    columns: Sequence[str],
+    records: Iterable[tuple],
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str] | None = None,
+    touch_column: str | None = "updated_at",
+    config: BulkWriteConfig | None = None,
+) -> int:
+    """
+    Idempotently upsert many rows in one transaction; returns the number of rows sent.
+    - `conflict_columns` must be covered by a unique index (e.g. contract_chunks (doc_id, "order")).
+    - Columns not in `update_columns` (default: all non-key columns) keep their stored values;
+      `touch_column` is set to now() on update.
+    - Round-trips grow with len(records) / batch_size, not with len(records).
+    - Rolls back entirely if any batch fails, so a half-written document is never visible.
+    """
+    config = config or BulkWriteConfig()
+    columns = list(columns)
+    key_idx = [columns.index(c) for c in conflict_columns]
+    if update_columns is None:
+        update_columns = [c for c in columns if c not in conflict_columns]
+
+    written = 0
+    async with conn.transaction():
+        if config.method == "copy":
+            stage = f"_stage_{table.replace('.', '_')}"
+            await conn.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {quote_ident(stage)} "
+                f"(LIKE {quote_ident(table)} INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+            merge = _upsert_sql(
+                table,
+                f"SELECT {', '.join(quote_ident(c) for c in columns)} FROM {quote_ident(stage)}",
+                columns, conflict_columns, update_columns, touch_column,
+            )
+            for batch in batched(records, config.batch_size):
+                batch = _dedupe(batch, key_idx)
+                await conn.copy_records_to_table(stage, records=batch, columns=columns)
+                await conn.execute(merge)
+                await conn.execute(f"TRUNCATE {quote_ident(stage)}")
+                written += len(batch)
+        else:
+            params = ", ".join(f"${i}" for i in range(1, len(columns) + 1))
+            upsert = _upsert_sql(table, f"VALUES ({params})", columns, conflict_columns, update_columns, touch_column)
+            for batch in batched(records, config.batch_size):
+                batch = _dedupe(batch, key_idx)
+                await conn.executemany(upsert, batch)
+                written += len(batch)
+
+    logger.info(f"💾 Upserted {written} rows into {table} ({config.method}, batch_size={config.batch_size})")
+    return written
+
+
+async def upsert_rows(
+    conn: Any,
+    table: str,
+    rows: Sequence[dict[str, Any]],
+    conflict_columns: Sequence[str],
+    config: BulkWriteConfig | None = None,
+    **kwargs: Any,
+) -> int:
+    """bulk_upsert for dict rows (e.g. extracted entities); columns are the union of row keys."""
+    if not rows:
+        return 0
+    columns = list(dict.fromkeys(k for row in rows for k in row))
+    records = (tuple(row.get(c) for c in columns) for row in rows)
+    return await bulk_upsert(conn, table, columns, records, conflict_columns, config=config, **kwargs)
@@ -0,0 +1,99 @@
+# backend/app/db/fakes.py
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class FakeCall:
+    method: str
+    query: str | None = None
+    args: tuple = ()
+    records: list[tuple] = field(default_factory=list)
+
+
+class _FakeTransaction:
+    def __init__(self, conn: "FakeConnection"):
+        self.conn = conn
+
+    async def __aenter__(self) -> "_FakeTransaction":
+        self.conn.depth += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> bool:
+        self.conn.depth -= 1
+        if exc_type is None:
+            self.conn.commits += 1
+        else:
+            self.conn.rollbacks += 1
+        return False
+
+
+class FakeConnection:
+    """
+    Stand-in for an asyncpg connection that records every round-trip instead of talking to Postgres.
+    Useful to assert batching (`round_trips`), transaction boundaries (`commits`/`rollbacks`) and the
+    rows that would have been written (`copied_records`, `executemany_records`).
+    `fail_on` makes the first call to that method raise, to exercise rollback paths.
+    """
+
+    def __init__(self, fail_on: str | None = None, fetch_result: list | None = None):
+        self.calls: list[FakeCall] = []
+        self.codecs: dict[str, dict[str, Any]] = {}
+        self.fail_on = fail_on
+        self.fetch_result = fetch_result or []
+        self.depth = 0
+        self.commits = 0
+        self.rollbacks = 0
+
+    def _record(self, call: FakeCall) -> None:
+        self.calls.append(call)
+        if self.fail_on == call.method:
+            self.fail_on = None
+            raise RuntimeError(f"FakeConnection: injected failure in {call.method}")
+
+    @property
+    def round_trips(self) -> int:
+        return len(self.calls)
+
+    @property
+    def copied_records(self) -> list[tuple]:
+        return [r for c in self.calls if c.method == "copy_records_to_table" for r in c.records]
+
+    @property
+    def executemany_records(self) -> list[tuple]:
+        return [r for c in self.calls if c.method == "executemany" for r in c.records]
+
+    def queries(self, method: str | None = None) -> list[str]:
+        return [c.query or "" for c in self.calls if method is None or c.method == method]
+
+    # ---------- asyncpg surface ----------
+    def transaction(self) -> _FakeTransaction:
+        return _FakeTransaction(self)
+
+    async def set_type_codec(self, typename: str, *, schema: str = "public", encoder, decoder, format: str = "text") -> None:
+        self.codecs[typename] = {"schema": schema, "encoder": encoder, "decoder": decoder, "format": format}
+        self._record(FakeCall("set_type_codec", typename))
+
+    async def execute(self, query: str, *args: Any) -> str:
+        self._record(FakeCall("execute", query, args))
+        return "OK"
+
+    async def executemany(self, query: str, args: list[tuple]) -> None:
+        self._record(FakeCall("executemany", query, records=list(args)))
+
+    async def copy_records_to_table(self, table_name: str, *, records, columns=None, **kwargs: Any) -> str:
+        records = list(records)
+        self._record(FakeCall("copy_records_to_table", table_name, tuple(columns or ()), records))
+        return f"COPY {len(records)}"
+
+    async def fetch(self, query: str, *args: Any) -> list:
+        self._record(FakeCall("fetch", query, args))
+        return list(self.fetch_result)
+
+    async def fetchrow(self, query: str, *args: Any) -> Any:
+        self._record(FakeCall("fetchrow", query, args))
+        return self.fetch_result[0] if self.fetch_result else None
+
+    async def fetchval(self, query: str, *args: Any) -> Any:
+        row = await self.fetchrow(query, *args)
+        return row[0] if row else None
@@ -0,0 +1,15 @@
+# app/db/operations/__init__.py
+
+from .contract_chunks import (
+  CHUNK_COLUMNS,
+  chunk_records,
+  upsert_contract_chunks,
+  upsert_invoice_chunks,
+)
+
+__all__ = [
+  "CHUNK_COLUMNS",
+  "chunk_records",
+  "upsert_contract_chunks",
+  "upsert_invoice_chunks",
+]
@@ -0,0 +1,87 @@
+# backend/app/db/operations/contract_chunks.py
+import json
+from typing import Any, Iterator, Sequence
+
+from app.ai.rag.chunk_batch import ChunkBatch
+from app.db.bulk import BulkWriteConfig, bulk_upsert, encode_vector, quote_ident, register_vector_codec
+from app.schemas.invoice import InvoiceChunk
+
+CHUNK_COLUMNS = ("doc_id", "order", "label", "content", "embedding", "meta")
+CHUNK_CONFLICT = ("doc_id", "order")
+
+
+def _label(content: str) -> str:
+    return content.split("\n", 1)[0][:200]
+
+
+def chunk_records(doc_id: str, chunks: ChunkBatch | Sequence[InvoiceChunk]) -> Iterator[tuple]:
+    """(doc_id, order, label, content, embedding, meta) tuples with embeddings pre-encoded as pgvector binary."""
+    if isinstance(chunks, ChunkBatch):
+        # Straight from the columns: no InvoiceChunk per row on the bulk path
+        vectors = chunks.pgvector_binary() if chunks.embeddings is not None else [None] * len(chunks)
+        for i, (order, meta, vector) in enumerate(zip(chunks.order.tolist(), chunks.metas(), vectors)):
+            content = chunks.text(i)
+            yield (doc_id, order, _label(content), content, vector, json.dumps(meta))
+        return
+    for i, chunk in enumerate(chunks):
+        content = chunk.content or ""
+        yield (
+            doc_id,
+            chunk.order if chunk.order is not None else i,
+            chunk.label or _label(content),
+            content,
+            encode_vector(chunk.embedding) if chunk.embedding is not None else None,
+            json.dumps(chunk.meta or {}),
+        )
+
+
+async def _upsert_chunks(
+    conn: Any,
+    table: str,
+    parent_column: str,
+    parent_id: str,
+    doc_id: str,
+    chunks: ChunkBatch | Sequence[InvoiceChunk],
+    prune: bool,
+    config: BulkWriteConfig | None,
+) -> int:
+    await register_vector_codec(conn)
+    columns = (parent_column, *CHUNK_COLUMNS)
+    records = ((parent_id, *r) for r in chunk_records(doc_id, chunks))
+    async with conn.transaction():
+        written = await bulk_upsert(conn, table, columns, records, CHUNK_CONFLICT, config=config)
+        if prune:
+            # Versioned re-ingests renumber chunks 0..n-1, so anything at or past n is stale
+            await conn.execute(
+                f'DELETE FROM {quote_ident(table)} WHERE "doc_id" = $1 AND "order" >= $2',
+                doc_id, len(chunks),
+            )
+    return written
+
+
+async def upsert_contract_chunks(
+    conn: Any,
+    contract_id: str,
+    doc_id: str,
+    chunks: ChunkBatch | Sequence[InvoiceChunk],
+    prune: bool = False,
+    config: BulkWriteConfig | None = None,
+) -> int:
+    """
+    Write all chunks of a contract document in one transaction, upserting by (doc_id, order).
+    Re-running with the same chunks is a no-op apart from updated_at. With `prune`, chunks
+    past the end of `chunks` are deleted, so the table mirrors the given document version.
+    """
+    return await _upsert_chunks(conn, "contract_chunks", "contract_id", contract_id, doc_id, chunks, prune, config)
+
+
+async def upsert_invoice_chunks(
+    conn: Any,
+    invoice_id: str,
+    doc_id: str,
+    chunks: ChunkBatch | Sequence[InvoiceChunk],
+    prune: bool = False,
+    config: BulkWriteConfig | None = None,
+) -> int:
+    """Same as upsert_contract_chunks, for invoice_chunks."""
+    return await _upsert_chunks(conn, "invoice_chunks", "invoice_id", invoice_id, doc_id, chunks, prune, config)
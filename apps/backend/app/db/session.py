@@ -0,0 +1,202 @@
+# backend/app/db/session.py
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+from uuid import uuid4
+
+from pydantic import BaseModel
+from sqlalchemy import MetaData, Table, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, create_async_engine
+
+from app.config import DatabaseSettings, db_config
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+_CHECKOUT_SAMPLES = 2048
+
+_engine: AsyncEngine | None = None
+_metadata = MetaData()
+_tables: dict[str, Table] = {}
+_tables_lock = asyncio.Lock()
+
+
+# ---------- Pool metrics ----------
+class PoolStats(BaseModel):
+    size: int = 0
+    checked_out: int = 0
+    overflow: int = 0
+    acquisitions: int = 0
+    timeouts: int = 0
+    # Time for connect() to hand out a usable connection: waiting for a free one, plus opening
+    # it when the pool grows and the pre-ping. A high p95 with checked_out < size + overflow
+    # points at slow connects, not at an exhausted pool.
+    checkout_ms_p50: float = 0.0
+    checkout_ms_p95: float = 0.0
+    checkout_ms_max: float = 0.0
+
+
+class _CheckoutTimes:
+    """Time to check out a pooled connection, over the last N acquisitions."""
+
+    def __init__(self, samples: int = _CHECKOUT_SAMPLES):
+        self.samples: deque[float] = deque(maxlen=samples)
+        self.acquisitions = 0
+        self.timeouts = 0
+
+    def observe(self, seconds: float) -> None:
+        self.samples.append(seconds * 1000)
+        self.acquisitions += 1
+
+    def percentile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+_checkouts = _CheckoutTimes()
+
+
+def get_pool_stats() -> PoolStats:
+    stats = PoolStats(
+        acquisitions=_checkouts.acquisitions,
+        timeouts=_checkouts.timeouts,
+        checkout_ms_p50=round(_checkouts.percentile(0.50), 3),
+        checkout_ms_p95=round(_checkouts.percentile(0.95), 3),
+        checkout_ms_max=round(max(_checkouts.samples, default=0.0), 3),
+    )
+    if _engine is not None:
+        pool: Any = _engine.pool
+        stats.size = pool.size()
+        stats.checked_out = pool.checkedout()
+        stats.overflow = max(0, pool.overflow())
+    return stats
+
+
+# ---------- Engine lifecycle ----------
+def _connect_args(settings: DatabaseSettings) -> dict[str, Any]:
+    cache_size = settings.effective_statement_cache_size
+    args: dict[str, Any] = {
+        "timeout": settings.connect_timeout,
+        "statement_cache_size": cache_size,            # asyncpg's own cache
+        "prepared_statement_cache_size": cache_size,   # SQLAlchemy dialect cache
+    }
+    if settings.uses_pooler:
+        # pgbouncer may hand each transaction a different server connection; unique names
+        # keep unnamed/cached statements from colliding there
+        args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    if settings.ssl_mode:
+        args["ssl"] = settings.ssl_mode  # asyncpg takes libpq sslmode names
+    return args
+
+
+async def init_engine(settings: DatabaseSettings | None = None) -> AsyncEngine:
+    """Create the process-wide engine (called from the FastAPI lifespan) and check one connection."""
+    global _engine
+    if _engine is not None:
+        return _engine
+    settings = settings or db_config
+    _engine = create_async_engine(
+        settings.async_url,
+        pool_size=settings.pool_size,
+        max_overflow=settings.max_overflow,
+        pool_timeout=settings.pool_timeout,
+        pool_recycle=settings.pool_recycle,
+        pool_pre_ping=settings.pool_pre_ping,
+        echo=settings.echo,
+        connect_args=_connect_args(settings),
+    )
+    try:
+        async with connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception:
+        await dispose_engine()
+        raise
+    logger.info(
+        f"🗄️ Database pool ready (size={settings.pool_size}, overflow={settings.max_overflow}, "
+        f"statement_cache={settings.effective_statement_cache_size}, pooler={settings.uses_pooler})"
+    )
+    return _engine
+
+
+async def dispose_engine() -> None:
+    global _engine
+    if _engine is not None:
+        await _engine.dispose()
+        logger.info("🗄️ Database pool closed")
+    _engine = None
+    _tables.clear()
+    _metadata.clear()
+
+
+async def get_engine() -> AsyncEngine:
+    """The shared engine; created lazily outside the app (scripts, notebooks)."""
+    return _engine if _engine is not None else await init_engine()
+
+
+# ---------- Connections and sessions ----------
+@asynccontextmanager
+async def connect() -> AsyncIterator[AsyncConnection]:
+    """Check a connection out of the pool, recording how long the checkout took."""
+    engine = await get_engine()
+    start = time.perf_counter()
+    try:
+        conn = await engine.connect()
+    except PoolTimeoutError:
+        _checkouts.timeouts += 1
+        raise
+    _checkouts.observe(time.perf_counter() - start)
+    try:
+        yield conn
+    finally:
+        await conn.close()
+
+
+@asynccontextmanager
+async def raw_connection() -> AsyncIterator[Any]:
+    """Pooled asyncpg connection for COPY and other driver-level calls (see app.db.bulk)."""
+    async with connect() as conn:
+        fairy = await conn.get_raw_connection()
+        yield fairy.driver_connection
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """
+    FastAPI dependency: one session per request on a pooled connection.
+    Commits when the handler returns, rolls back if it raises.
+    """
+    async with connect() as conn:
+        async with AsyncSession(bind=conn, expire_on_commit=False) as session:
+            try:
+                yield session
+                await session.commit()
+            except BaseException:
+                await session.rollback()
+                raise
+
+
+async def get_raw_db() -> AsyncIterator[Any]:
+    """FastAPI dependency yielding a pooled asyncpg connection."""
+    async with raw_connection() as conn:
+        yield conn
+
+
+# ---------- Reflection ----------
+async def get_table(name: str) -> Table:
+    """Reflected table, loaded once per process and reused."""
+    table = _tables.get(name)
+    if table is not None:
+        return table
+    async with _tables_lock:
+        if name not in _tables:
+            try:
+                import pgvector.sqlalchemy  # noqa: F401  registers the `vector` type for reflection
+            except ImportError:
+                pass
+            async with connect() as conn:
+                _tables[name] = await conn.run_sync(lambda sync_conn: Table(name, _metadata, autoload_with=sync_conn))
+        return _tables[name]
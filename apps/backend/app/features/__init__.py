@@ -0,0 +1,3 @@
+"""
+Domain features for FleetAI backend (fuel tenders, quotes, contracts).
+"""
@@ -0,0 +1,57 @@
+"""
+Contract term evaluation, search, invoice reconciliation and effective-period queries.
+"""
+
+from .facets import ContractFacetIndex, RangeFilter, get_org_facet_index
+from .formula import (
+    CompiledFormula,
+    FormulaBatchResult,
+    FormulaError,
+    compile_formula,
+    compile_term,
+    evaluate_formulas,
+    formula_variables,
+    variable_name,
+)
+from .periods import (
+    ContractPeriod,
+    ContractPeriodIndex,
+    IntervalTree,
+    RenewalAlert,
+    RenewalAlertJob,
+    get_org_period_index,
+)
+from .reconciliation import (
+    ContractTermIndex,
+    ContractVersion,
+    InvoiceLine,
+    LeakageFlag,
+    ReconcileConfig,
+    reconcile,
+)
+
+__all__ = [
+    "ContractFacetIndex",
+    "RangeFilter",
+    "get_org_facet_index",
+    "CompiledFormula",
+    "FormulaBatchResult",
+    "FormulaError",
+    "compile_formula",
+    "compile_term",
+    "evaluate_formulas",
+    "formula_variables",
+    "variable_name",
+    "ContractPeriod",
+    "ContractPeriodIndex",
+    "IntervalTree",
+    "RenewalAlert",
+    "RenewalAlertJob",
+    "get_org_period_index",
+    "ContractTermIndex",
+    "ContractVersion",
+    "InvoiceLine",
+    "LeakageFlag",
+    "ReconcileConfig",
+    "reconcile",
+]
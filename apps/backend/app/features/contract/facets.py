@@ -0,0 +1,261 @@
+# backend/app/features/contract/facets.py
+import threading
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from typing import Literal
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from app.features.contract.formula import variable_name
+from app.features.fx.currency import normalize_currency
+from app.schemas.contract import Contract, DurationValue, MoneyValue, NumberValue, PercentageValue, RateValue
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+NumericKind = Literal["money", "percentage", "duration", "number", "rate"]
+COMPACT_RATIO = 0.25  # renumber doc ids once this share of them belongs to removed contracts
+
+
+class RangeFilter(BaseModel):
+    """Numeric condition on a typed term, e.g. late_payment percentage > 2."""
+    key: str = Field(..., description="Term.key (matched by canonical name).")
+    kind: NumericKind
+    gt: float | None = None
+    gte: float | None = None
+    lt: float | None = None
+    lte: float | None = None
+    currency: str | None = Field(None, description="Money/rate terms only: restrict to this currency.")
+
+
+def _tag_key(key: str) -> str:
+    return key.strip().lower()
+
+
+def _tag_value(value: str) -> str:
+    return " ".join(value.casefold().split())
+
+
+def _numeric(value) -> tuple[str, float, str | None] | None:
+    if isinstance(value, MoneyValue):
+        return "money", value.amount, normalize_currency(value.currency)
+    if isinstance(value, PercentageValue):
+        return "percentage", value.value, None
+    if isinstance(value, DurationValue):
+        return "duration", float(value.days), None
+    if isinstance(value, NumberValue):
+        return "number", value.value, None
+    if isinstance(value, RateValue):
+        return "rate", value.amount, normalize_currency(value.currency)
+    return None
+
+
+def _intersect(sets: list[np.ndarray]) -> list[int] | None:
+    """Sorted doc ids in every set (None = no condition). Plain ints out, so no array views outlive the lock."""
+    if not sets:
+        return None
+    sets.sort(key=len)
+    result = sets[0]
+    for other in sets[1:]:
+        if not result.shape[0]:
+            break
+        pos = np.searchsorted(other, result)
+        hit = pos < other.shape[0]
+        hit[hit] = other[pos[hit]] == result[hit]
+        result = result[hit]
+    return result.tolist()
+
+
+class ContractFacetIndex:
+    """
+    Search contracts by term keys, tags, type/vendor and numeric term ranges without loading them.
+    - Posting lists (facet -> doc ids) are append-only int arrays: a re-indexed contract gets a new
+      doc id, so every list stays sorted; ids of removed contracts are skipped until a compaction
+      drops them and renumbers the live ones (order kept, so lists stay sorted).
+    - Numeric terms live in sorted (value, doc id, seq, currency) columns per (term key, kind); a range
+      is two bisects. seq (the term's position in its contract) makes entries unique, so sorting
+      never compares currencies, which may be None.
+    - Queries intersect the smallest candidate set against the rest with searchsorted.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: dict[tuple[str, ...], array] = {}
+        self._numeric: dict[tuple[str, str], list[tuple[float, int, int, str | None]]] = {}
+        self._contract_of: list[str | None] = []  # doc id -> contract id (None = removed)
+        self._doc_of: dict[str, int] = {}
+        self._entries: dict[int, list[tuple[tuple[str, str], tuple[float, int, int, str | None]]]] = {}
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_of)
+
+    # ---------- Updates ----------
+    @staticmethod
+    def _facets(contract: Contract) -> set[tuple[str, ...]]:
+        facets: set[tuple[str, ...]] = set()
+        if contract.contract_type:
+            facets.add(("type", contract.contract_type.value))
+        vendor = " ".join((contract.vendor.vendor_name or "").casefold().split())
+        if vendor:
+            facets.add(("vendor", vendor))
+        for term in contract.terms:
+            facets.add(("term", variable_name(term.key)))
+        for tag in contract.tags or []:
+            facets.add(("tag", _tag_key(tag.key)))
+            facets.add(("tag", _tag_key(tag.key), _tag_value(tag.value)))
+        return facets
+
+    def _remove(self, contract_id: str) -> bool:
+        doc = self._doc_of.pop(contract_id, None)
+        if doc is None:
+            return False
+        self._contract_of[doc] = None
+        self._dead += 1
+        for column_key, entry in self._entries.pop(doc, []):
+            column = self._numeric[column_key]
+            i = bisect_left(column, entry)
+            if i < len(column) and column[i] == entry:
+                del column[i]
+        return True
+
+    def upsert(self, contract_id: str, contract: Contract) -> None:
+        """Index (or re-index) one contract."""
+        with self._lock:
+            self._remove(contract_id)
+            doc = len(self._contract_of)
+            self._contract_of.append(contract_id)
+            self._doc_of[contract_id] = doc
+            for facet in self._facets(contract):
+                self._postings.setdefault(facet, array("q")).append(doc)
+            entries = []
+            for seq, term in enumerate(contract.terms):
+                numeric = _numeric(term.value)
+                if numeric is None:
+                    continue
+                kind, value, currency = numeric
+                column_key, entry = (variable_name(term.key), kind), (value, doc, seq, currency)
+                insort(self._numeric.setdefault(column_key, []), entry)
+                entries.append((column_key, entry))
+            if entries:
+                self._entries[doc] = entries
+            self._maybe_compact()
+
+    def remove(self, contract_id: str) -> bool:
+        with self._lock:
+            removed = self._remove(contract_id)
+            self._maybe_compact()
+            return removed
+
+    def _maybe_compact(self) -> None:
+        if self._dead > COMPACT_RATIO * len(self._contract_of) and self._dead > 1000:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drop removed doc ids and renumber the live ones 0..n-1 in postings, numeric columns and lookups."""
+        alive = np.array([c is not None for c in self._contract_of], dtype=bool)
+        new_doc = np.cumsum(alive, dtype=np.int64) - 1  # old doc id -> new doc id (where alive)
+        for facet, docs in list(self._postings.items()):
+            ids = np.frombuffer(docs, dtype=np.int64)
+            kept = new_doc[ids[alive[ids]]]
+            if kept.shape[0]:
+                self._postings[facet] = array("q", kept.tobytes())
+            else:
+                del self._postings[facet]
+        # Removed contracts' numeric entries are already gone, and the remap keeps doc order, so columns stay sorted
+        remap = new_doc.tolist()
+        for column_key, column in self._numeric.items():
+            self._numeric[column_key] = [(value, remap[doc], seq, currency) for value, doc, seq, currency in column]
+        self._entries = {
+            remap[doc]: [(column_key, (value, remap[doc], seq, currency)) for column_key, (value, _, seq, currency) in entries]
+            for doc, entries in self._entries.items()
+        }
+        live: list[str] = [c for c in self._contract_of if c is not None]
+        self._contract_of = list(live)
+        self._doc_of = {contract_id: doc for doc, contract_id in enumerate(live)}
+        logger.info(f"🗜️ Compacted contract facets: dropped {self._dead} removed doc ids, {len(self._contract_of)} live")
+        self._dead = 0
+
+    # ---------- Queries ----------
+    def _posting(self, facet: tuple[str, ...]) -> np.ndarray:
+        docs = self._postings.get(facet)
+        return np.frombuffer(docs, dtype=np.int64) if docs else np.zeros(0, dtype=np.int64)
+
+    def _range(self, f: RangeFilter) -> np.ndarray:
+        column = self._numeric.get((variable_name(f.key), f.kind), [])
+        lo, hi = 0, len(column)
+        if f.gte is not None:
+            lo = max(lo, bisect_left(column, (f.gte, -1)))
+        if f.gt is not None:
+            lo = max(lo, bisect_right(column, (f.gt, float("inf"))))
+        if f.lte is not None:
+            hi = min(hi, bisect_right(column, (f.lte, float("inf"))))
+        if f.lt is not None:
+            hi = min(hi, bisect_left(column, (f.lt, -1)))
+        entries = column[lo:hi]
+        if f.currency is not None:
+            currency = normalize_currency(f.currency)
+            entries = [e for e in entries if e[3] == currency]
+        return np.unique(np.fromiter((e[1] for e in entries), dtype=np.int64, count=len(entries)))
+
+    def search(
+        self,
+        contract_type: str | None = None,
+        vendor: str | None = None,
+        terms: list[str] | None = None,
+        tags: dict[str, str | None] | None = None,
+        ranges: list[RangeFilter] | None = None,
+        limit: int | None = None,
+    ) -> list[str]:
+        """
+        Contract ids matching every condition: contract type, vendor, having each term key,
+        each tag (value None = any value) and each numeric range. Oldest-indexed first.
+        """
+        facets: list[tuple[str, ...]] = []
+        if contract_type:
+            facets.append(("type", contract_type))
+        if vendor:
+            facets.append(("vendor", " ".join(vendor.casefold().split())))
+        facets += [("term", variable_name(k)) for k in terms or []]
+        for key, value in (tags or {}).items():
+            facets.append(("tag", _tag_key(key)) if value is None else ("tag", _tag_key(key), _tag_value(value)))
+
+        with self._lock:
+            docs = _intersect([self._posting(f) for f in facets] + [self._range(r) for r in ranges or []])
+            if docs is None:
+                docs = range(len(self._contract_of))
+            ids = [self._contract_of[d] for d in docs]
+        ids = [c for c in ids if c is not None]
+        return ids[:limit] if limit is not None else ids
+
+    def facet_counts(self, kind: Literal["type", "vendor", "term", "tag"], contract_ids: list[str] | None = None) -> dict[str, int]:
+        """How many (of the given) contracts carry each facet of one kind, e.g. tag keys for a result page."""
+        with self._lock:
+            docs = None
+            if contract_ids is not None:
+                docs = np.sort(np.array([self._doc_of[c] for c in contract_ids if c in self._doc_of], dtype=np.int64))
+            alive = np.array([c is not None for c in self._contract_of], dtype=bool)
+            counts = {}
+            for facet, posting in self._postings.items():
+                if facet[0] != kind or len(facet) != 2:
+                    continue
+                ids = np.frombuffer(posting, dtype=np.int64)
+                ids = ids[alive[ids]]
+                n = int(np.isin(ids, docs, assume_unique=True).sum()) if docs is not None else int(ids.shape[0])
+                if n:
+                    counts[facet[1]] = n
+        return dict(sorted(counts.items(), key=lambda kv: -kv[1]))
+
+
+_indexes: dict[str, ContractFacetIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_org_facet_index(org_id: str) -> ContractFacetIndex:
+    """Process-wide ContractFacetIndex per org."""
+    with _indexes_lock:
+        index = _indexes.get(org_id)
+        if index is None:
+            index = _indexes[org_id] = ContractFacetIndex()
+        return index
@@ -0,0 +1,312 @@
+# backend/app/features/contract/formula.py
+import ast
+import re
+from functools import lru_cache, reduce
+from typing import Mapping, Sequence
+
+import numpy as np
+from pydantic import BaseModel
+
+from app.schemas.contract import FormulaValue, RateValue, Term
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+MAX_EXPRESSION_LENGTH = 2_000
+MAX_NODES = 500          # AST nodes per formula
+MAX_DEPTH = 100          # nesting depth; keeps the recursive visitor and compile() far from the recursion limit
+# Index names with spaces/punctuation can be written in brackets: "[Platts Jet A-1 Med] * 1.02 + 0.05"
+_BRACKETED_RE = re.compile(r"\[([^\[\]]+)\]|\{([^{}]+)\}")
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+ArrayLike = float | int | Sequence[float] | np.ndarray
+
+
+class FormulaError(ValueError):
+    """Expression is not a valid or allowed pricing formula."""
+
+
+def variable_name(name: str) -> str:
+    """Canonical variable name: 'Platts Jet A-1 Med' -> 'platts_jet_a_1_med'."""
+    slug = _SLUG_RE.sub("_", name.strip().lower()).strip("_")
+    return f"_{slug}" if slug[:1].isdigit() else slug
+
+
+# ---------- Sandbox ----------
+def _min(*args):
+    return reduce(np.minimum, args)
+
+
+def _max(*args):
+    return reduce(np.maximum, args)
+
+
+def _avg(*args):
+    return reduce(np.add, args) / len(args)
+
+
+def _round(x, digits=0):
+    return np.round(x, int(digits))
+
+
+_FUNCTIONS = {
+    "min": _min,
+    "max": _max,
+    "avg": _avg,
+    "mean": _avg,
+    "abs": np.abs,
+    "round": _round,
+    "floor": np.floor,
+    "ceil": np.ceil,
+    "clip": np.clip,
+    "sqrt": np.sqrt,
+}
+# Vectorized stand-ins for constructs whose Python form is scalar-only
+_HELPERS = {
+    "__where": np.where,
+    "__and": lambda *a: reduce(np.logical_and, a),
+    "__or": lambda *a: reduce(np.logical_or, a),
+    "__not": np.logical_not,
+}
+
+# Variables live under a prefix so a variable called "floor" or "max" can't shadow a function
+_VAR_PREFIX = "v__"
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp, ast.Call,
+    ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.FloorDiv, ast.USub, ast.UAdd, ast.Not,
+    ast.And, ast.Or, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq,
+)
+
+
+class _Vectorize(ast.NodeTransformer):
+    """Rewrite a validated expression so every operation works elementwise on numpy arrays."""
+
+    def __init__(self):
+        self.variables: list[str] = []
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        # Function names are only reached through visit_Call, so every Name here is a variable
+        name = variable_name(node.id)
+        if name not in self.variables:
+            self.variables.append(name)
+        return ast.copy_location(ast.Name(id=_VAR_PREFIX + name, ctx=ast.Load()), node)
+
+    def visit_Constant(self, node: ast.Constant) -> ast.AST:
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise FormulaError(f"Only numeric constants are allowed, got {node.value!r}")
+        # Floats only: keeps `9 ** 9 ** 9` from becoming an unbounded Python int
+        return ast.copy_location(ast.Constant(value=float(node.value)), node)
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS or node.keywords:
+            raise FormulaError(f"Unsupported function call: {ast.unparse(node)}")
+        node.args = [self.visit(a) for a in node.args]
+        return node
+
+    def _helper(self, name: str, args: list[ast.expr], like: ast.AST) -> ast.AST:
+        return ast.copy_location(ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=args, keywords=[]), like)
+
+    def visit_IfExp(self, node: ast.IfExp) -> ast.AST:
+        self.generic_visit(node)
+        return self._helper("__where", [node.test, node.body, node.orelse], node)
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.AST:
+        self.generic_visit(node)
+        return self._helper("__and" if isinstance(node.op, ast.And) else "__or", node.values, node)
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.AST:
+        self.generic_visit(node)
+        return self._helper("__not", [node.operand], node) if isinstance(node.op, ast.Not) else node
+
+    def visit_Compare(self, node: ast.Compare) -> ast.AST:
+        self.generic_visit(node)
+        if len(node.ops) == 1:
+            return node
+        # a < b < c  ->  (a < b) & (b < c)
+        parts, left = [], node.left
+        for op, right in zip(node.ops, node.comparators):
+            parts.append(ast.Compare(left=left, ops=[op], comparators=[right]))
+            left = right
+        return self._helper("__and", parts, node)
+
+
+# ---------- Compiled formulas ----------
+class CompiledFormula:
+    """A parsed, validated expression evaluated with numpy broadcasting."""
+
+    __slots__ = ("expression", "variables", "_code")
+
+    def __init__(self, expression: str, variables: tuple[str, ...], code):
+        self.expression = expression
+        self.variables = variables
+        self._code = code
+
+    def __repr__(self) -> str:
+        return f"CompiledFormula({self.expression!r}, variables={self.variables})"
+
+    def missing(self, values: Mapping[str, ArrayLike]) -> list[str]:
+        names = {variable_name(k) for k in values}
+        return [v for v in self.variables if v not in names]
+
+    def evaluate(self, values: Mapping[str, ArrayLike]) -> np.ndarray:
+        """
+        Evaluate with scalars or arrays per variable (keys are matched by variable_name()).
+        Arrays broadcast: a (T,) price series gives a (T,) result; (n, 1) constants with (T,) series give (n, T).
+        """
+        scope = {_VAR_PREFIX + variable_name(k): np.asarray(v, dtype=np.float64) for k, v in values.items()}
+        missing = [v for v in self.variables if _VAR_PREFIX + v not in scope]
+        if missing:
+            raise FormulaError(f"Missing values for {', '.join(missing)} in {self.expression!r}")
+        try:
+            with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+                result = eval(self._code, {"__builtins__": {}, **_FUNCTIONS, **_HELPERS}, scope)  # noqa: S307 - AST is whitelisted
+        except (ArithmeticError, TypeError, ValueError) as e:
+            # Constant-only sub-expressions use Python floats (1/0, 9**9**9); min() with no
+            # arguments or round() with an array of digits fail inside the helpers
+            raise FormulaError(f"Cannot evaluate {self.expression!r}: {e}") from e
+        return np.asarray(result, dtype=np.float64)
+
+    __call__ = evaluate
+
+
+@lru_cache(maxsize=4096)
+def compile_formula(expression: str) -> CompiledFormula:
+    """Parse and validate once; repeated expressions (common across contracts) hit the cache."""
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise FormulaError(f"Expression longer than {MAX_EXPRESSION_LENGTH} characters")
+    source = _BRACKETED_RE.sub(lambda m: variable_name(m.group(1) or m.group(2)), expression.strip())
+    source = source.replace("^", "**")  # spreadsheet-style power
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as e:
+        raise FormulaError(f"Cannot parse formula {expression!r}: {e.msg}") from e
+    except (RecursionError, MemoryError, ValueError) as e:  # "-" * 1990 + "1", null bytes
+        raise FormulaError(f"Cannot parse formula {expression!r}: {type(e).__name__}") from e
+
+    _check_tree(tree, expression)
+    vectorize = _Vectorize()
+    try:
+        tree = ast.fix_missing_locations(vectorize.visit(tree))
+        code = compile(tree, "<formula>", "eval")
+    except FormulaError:
+        raise
+    except (RecursionError, OverflowError, MemoryError, ValueError) as e:  # e.g. a 400-digit constant
+        raise FormulaError(f"Cannot compile formula {expression!r}: {e}") from e
+    return CompiledFormula(expression, tuple(vectorize.variables), code)
+
+
+def _check_tree(tree: ast.AST, expression: str) -> None:
+    """Whitelist node types and bound size and nesting, without recursing."""
+    stack = [(tree, 1)]
+    nodes = 0
+    while stack:
+        node, depth = stack.pop()
+        nodes += 1
+        if nodes > MAX_NODES:
+            raise FormulaError(f"Formula has more than {MAX_NODES} elements: {expression[:80]!r}")
+        if depth > MAX_DEPTH:
+            raise FormulaError(f"Formula is nested more than {MAX_DEPTH} levels deep: {expression[:80]!r}")
+        if not isinstance(node, _ALLOWED_NODES):
+            raise FormulaError(f"{type(node).__name__} is not allowed in formulas: {expression!r}")
+        if isinstance(node, ast.Name) and node.id.startswith("__"):
+            raise FormulaError(f"Name {node.id!r} is not allowed in formulas")
+        stack.extend((child, depth + 1) for child in ast.iter_child_nodes(node))
+
+
+def formula_variables(expression: str) -> tuple[str, ...]:
+    """Variables a formula depends on (canonical names)."""
+    return compile_formula(expression).variables
+
+
+# ---------- Schema integration ----------
+def compile_term(term: Term | FormulaValue | RateValue) -> CompiledFormula | None:
+    """Compiled formula for a FormulaValue, or for a RateValue whose `formula` text is a valid expression."""
+    value = term.value if isinstance(term, Term) else term
+    if isinstance(value, FormulaValue):
+        return compile_formula(value.expression)
+    if isinstance(value, RateValue) and value.formula:
+        try:
+            return compile_formula(value.formula)
+        except FormulaError:
+            logger.debug(f"Rate formula is descriptive only: {value.formula!r}")
+    return None
+
+
+class FormulaBatchResult(BaseModel):
+    """Results of evaluate_formulas, one row per input formula"""
+    model_config = {"arbitrary_types_allowed": True}
+
+    values: np.ndarray  # (n_formulas, T) float64, NaN where a formula couldn't be evaluated
+    variables: list[tuple[str, ...]]
+    errors: dict[int, str]
+
+
+def evaluate_formulas(
+    formulas: Sequence[FormulaValue | str],
+    series: Mapping[str, ArrayLike],
+    length: int | None = None,
+) -> FormulaBatchResult:
+    """
+    Evaluate many formulas against shared time series in one pass per distinct expression.
+    - `series` maps index/variable names to (T,) arrays (e.g. a year of daily Platts prices).
+    - Each FormulaValue's own `variables` (contract constants such as a differential) are stacked
+      into (n, 1) columns, so all contracts sharing an expression evaluate as a single (n, T) op.
+    """
+    shared = {variable_name(k): np.asarray(v, dtype=np.float64) for k, v in series.items()}
+    if length is None:
+        length = int(max((a.shape[-1] for a in shared.values() if a.ndim), default=1))
+    out = np.full((len(formulas), length), np.nan)
+    variables: list[tuple[str, ...]] = [()] * len(formulas)
+    errors: dict[int, str] = {}
+
+    groups: dict[str, list[int]] = {}
+    for i, f in enumerate(formulas):
+        groups.setdefault(f.expression if isinstance(f, FormulaValue) else f, []).append(i)
+
+    for expression, rows in groups.items():
+        try:
+            compiled = compile_formula(expression)
+        except FormulaError as e:
+            for i in rows:
+                errors[i] = str(e)
+            continue
+        for i in rows:
+            variables[i] = compiled.variables
+
+        consts = [
+            {variable_name(kv.name): kv.value for kv in f.variables} if isinstance(f, FormulaValue) else {}
+            for f in (formulas[i] for i in rows)
+        ]
+        scope: dict[str, np.ndarray] = {}
+        ok = np.ones(len(rows), dtype=bool)
+        for name in compiled.variables:
+            given = np.array([[c.get(name, np.nan)] for c in consts])
+            if name in shared:
+                # A formula's own constant wins over the shared series
+                scope[name] = shared[name] if np.isnan(given).all() else np.where(np.isnan(given), shared[name], given)
+            else:
+                scope[name] = given
+                ok &= ~np.isnan(given[:, 0])
+
+        try:
+            value = compiled.evaluate(scope)
+        except FormulaError as e:
+            for i in rows:
+                errors[i] = str(e)
+            continue
+        try:
+            result = np.broadcast_to(value, (len(rows), length))
+        except ValueError:
+            for i in rows:
+                errors[i] = f"Result of {expression!r} has shape {value.shape}, expected ({len(rows)}, {length})"
+            continue
+        idx = np.asarray(rows)
+        out[idx[ok]] = result[ok]
+        for j in np.flatnonzero(~ok):
+            missing = [v for v in compiled.variables if v not in shared and v not in consts[j]]
+            errors[rows[j]] = f"Missing values for {', '.join(missing)}"
+
+    logger.info(f"🧮 Evaluated {len(formulas)} formulas ({len(groups)} distinct) over {length} points")
+    return FormulaBatchResult(values=out, variables=variables, errors=errors)
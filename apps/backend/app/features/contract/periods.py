@@ -0,0 +1,311 @@
+# backend/app/features/contract/periods.py
+import random
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, timedelta
+from typing import Iterator
+
+from pydantic import BaseModel, Field
+
+from app.schemas.contract import Contract
+from app.schemas.enums import ContractTypes
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+_OPEN_START, _OPEN_END = date.min.toordinal(), date.max.toordinal()
+
+
+class ContractPeriod(BaseModel):
+    contract_id: str
+    vendor_name: str | None = None
+    contract_type: ContractTypes | None = None
+    effective_from: date | None = Field(None, description="None = in force since forever.")
+    effective_to: date | None = Field(None, description="None = open-ended.")
+
+    @classmethod
+    def from_contract(cls, contract_id: str, contract: Contract) -> "ContractPeriod":
+        return cls(
+            contract_id=contract_id,
+            vendor_name=contract.vendor.vendor_name,
+            contract_type=contract.contract_type,
+            effective_from=contract.effective_from,
+            effective_to=contract.effective_to,
+        )
+
+
+class RenewalAlert(BaseModel):
+    contract_id: str
+    vendor_name: str | None = None
+    contract_type: ContractTypes | None = None
+    effective_to: date
+    days_left: int
+
+
+def _vendor_key(name: str | None) -> str:
+    return " ".join((name or "").casefold().split())
+
+
+def _bounds(period: ContractPeriod) -> tuple[int, int]:
+    start = period.effective_from.toordinal() if period.effective_from else _OPEN_START
+    end = period.effective_to.toordinal() if period.effective_to else _OPEN_END
+    return start, max(start, end)  # an end before the start is indexed as a one-day period
+
+
+# ---------- Interval tree ----------
+class _Node:
+    __slots__ = ("key", "end", "max_end", "priority", "left", "right")
+
+    def __init__(self, key: tuple[int, str], end: int):
+        self.key = key  # (start, contract_id)
+        self.end = end
+        self.max_end = end
+        self.priority = random.random()
+        self.left: "_Node | None" = None
+        self.right: "_Node | None" = None
+
+    def update(self) -> None:
+        m = self.end
+        if self.left is not None and self.left.max_end > m:
+            m = self.left.max_end
+        if self.right is not None and self.right.max_end > m:
+            m = self.right.max_end
+        self.max_end = m
+
+
+def _rotate_right(node: _Node) -> _Node:
+    top = node.left
+    if top is None:
+        return node
+    node.left, top.right = top.right, node
+    node.update()
+    top.update()
+    return top
+
+
+def _rotate_left(node: _Node) -> _Node:
+    top = node.right
+    if top is None:
+        return node
+    node.right, top.left = top.left, node
+    node.update()
+    top.update()
+    return top
+
+
+def _insert(node: _Node | None, new: _Node) -> _Node:
+    if node is None:
+        return new
+    if new.key < node.key:
+        node.left = _insert(node.left, new)
+        if node.left.priority > node.priority:
+            node = _rotate_right(node)
+    else:
+        node.right = _insert(node.right, new)
+        if node.right.priority > node.priority:
+            node = _rotate_left(node)
+    node.update()
+    return node
+
+
+def _delete(node: _Node | None, key: tuple[int, str]) -> _Node | None:
+    if node is None:
+        return None
+    if key < node.key:
+        node.left = _delete(node.left, key)
+    elif key > node.key:
+        node.right = _delete(node.right, key)
+    else:
+        if node.left is None:
+            return node.right
+        if node.right is None:
+            return node.left
+        if node.left.priority > node.right.priority:
+            node = _rotate_right(node)
+            node.right = _delete(node.right, key)
+        else:
+            node = _rotate_left(node)
+            node.left = _delete(node.left, key)
+    node.update()
+    return node
+
+
+def _overlapping(node: _Node | None, lo: int, hi: int, out: list[str]) -> None:
+    """Intervals with start <= hi and end >= lo; subtrees whose max_end < lo are skipped."""
+    if node is None or node.max_end < lo:
+        return
+    _overlapping(node.left, lo, hi, out)
+    if node.key[0] > hi:
+        return  # everything to the right starts later still
+    if node.end >= lo:
+        out.append(node.key[1])
+    _overlapping(node.right, lo, hi, out)
+
+
+class IntervalTree:
+    """Treap keyed by (start, id) and augmented with the subtree's max end: O(log n + k) overlap queries."""
+
+    def __init__(self):
+        self._root: _Node | None = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, contract_id: str, start: int, end: int) -> None:
+        self._root = _insert(self._root, _Node((start, contract_id), end))
+        self._size += 1
+
+    def remove(self, contract_id: str, start: int) -> None:
+        self._root = _delete(self._root, (start, contract_id))
+        self._size -= 1
+
+    def overlapping(self, lo: int, hi: int) -> list[str]:
+        out: list[str] = []
+        _overlapping(self._root, lo, hi, out)
+        return out
+
+
+# ---------- Period index ----------
+class ContractPeriodIndex:
+    """
+    Contract effective periods for one org, overall and per vendor.
+    - Interval trees answer "in force on day d" (stabbing) and "overlapping [a, b]" queries.
+    - A list sorted by effective_to answers "expiring between a and b" with two binary searches.
+    - upsert()/remove() keep both current as contracts are extracted or edited.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._periods: dict[str, ContractPeriod] = {}
+        self._all = IntervalTree()
+        self._by_vendor: dict[str, IntervalTree] = {}
+        self._by_end: list[tuple[int, str]] = []  # (effective_to ordinal, contract_id); open-ended excluded
+
+    def __len__(self) -> int:
+        return len(self._periods)
+
+    def get(self, contract_id: str) -> ContractPeriod | None:
+        return self._periods.get(contract_id)
+
+    # ---------- Updates ----------
+    def _remove(self, contract_id: str) -> bool:
+        period = self._periods.pop(contract_id, None)
+        if period is None:
+            return False
+        start, end = _bounds(period)
+        self._all.remove(contract_id, start)
+        vendor = _vendor_key(period.vendor_name)
+        tree = self._by_vendor[vendor]
+        tree.remove(contract_id, start)
+        if not len(tree):
+            del self._by_vendor[vendor]
+        if period.effective_to is not None:
+            i = bisect_left(self._by_end, (end, contract_id))
+            if i < len(self._by_end) and self._by_end[i] == (end, contract_id):
+                del self._by_end[i]
+        return True
+
+    def upsert(self, period: ContractPeriod) -> None:
+        with self._lock:
+            self._remove(period.contract_id)
+            start, end = _bounds(period)
+            if period.effective_from and period.effective_to and period.effective_to < period.effective_from:
+                logger.warning(f"⚠️ Contract {period.contract_id} ends before it starts; indexed as a single day")
+            self._periods[period.contract_id] = period
+            self._all.insert(period.contract_id, start, end)
+            self._by_vendor.setdefault(_vendor_key(period.vendor_name), IntervalTree()).insert(period.contract_id, start, end)
+            if period.effective_to is not None:
+                insort(self._by_end, (end, period.contract_id))
+
+    def add_contract(self, contract_id: str, contract: Contract) -> ContractPeriod:
+        period = ContractPeriod.from_contract(contract_id, contract)
+        self.upsert(period)
+        return period
+
+    def remove(self, contract_id: str) -> bool:
+        with self._lock:
+            return self._remove(contract_id)
+
+    # ---------- Queries ----------
+    def _tree(self, vendor: str | None) -> IntervalTree | None:
+        return self._all if vendor is None else self._by_vendor.get(_vendor_key(vendor))
+
+    def overlapping(self, start: date | None, end: date | None, vendor: str | None = None) -> list[ContractPeriod]:
+        """Contracts in force at any point of [start, end] (None = unbounded)."""
+        lo = start.toordinal() if start else _OPEN_START
+        hi = end.toordinal() if end else _OPEN_END
+        with self._lock:
+            tree = self._tree(vendor)
+            ids = tree.overlapping(lo, hi) if tree is not None else []
+            return [self._periods[i] for i in ids]
+
+    def in_force(self, day: date, vendor: str | None = None) -> list[ContractPeriod]:
+        """Stabbing query: contracts in force on `day`."""
+        return self.overlapping(day, day, vendor)
+
+    def covering(self, start: date, end: date | None = None, vendor: str | None = None) -> list[ContractPeriod]:
+        """Contracts in force for the whole of [start, end], e.g. an invoice's billing period."""
+        end = end or start
+        return [
+            p for p in self.in_force(start, vendor)
+            if p.effective_to is None or p.effective_to >= end
+        ]
+
+    def expiring(self, start: date, end: date, vendor: str | None = None) -> Iterator[ContractPeriod]:
+        """Contracts whose effective_to falls in [start, end], soonest first."""
+        with self._lock:
+            lo = bisect_left(self._by_end, (start.toordinal(), ""))
+            hi = bisect_right(self._by_end, (end.toordinal(), "\U0010ffff"))
+            hits = [self._periods[cid] for _, cid in self._by_end[lo:hi]]
+        key = _vendor_key(vendor) if vendor is not None else None
+        return (p for p in hits if key is None or _vendor_key(p.vendor_name) == key)
+
+
+# ---------- Renewal alerts ----------
+class RenewalAlertJob:
+    """
+    Reports contracts entering the renewal window (effective_to within `horizon_days`), once each.
+    A run reads only the window's slice of the end-date list, so its cost follows the number of
+    contracts in the window, not the number indexed; contracts added or re-dated later still alert.
+    """
+
+    def __init__(self, index: ContractPeriodIndex, horizon_days: int = 90):
+        self.index = index
+        self.horizon = timedelta(days=horizon_days)
+        self._alerted: set[tuple[str, date]] = set()  # (contract_id, effective_to) already reported
+
+    def run(self, as_of: date | None = None) -> list[RenewalAlert]:
+        as_of = as_of or date.today()
+        window_end = as_of + self.horizon
+        alerts = []
+        for p in self.index.expiring(as_of, window_end):
+            end = p.effective_to  # always set for periods on the end-date list
+            if end is None or (p.contract_id, end) in self._alerted:
+                continue
+            self._alerted.add((p.contract_id, end))
+            alerts.append(RenewalAlert(
+                contract_id=p.contract_id,
+                vendor_name=p.vendor_name,
+                contract_type=p.contract_type,
+                effective_to=end,
+                days_left=(end - as_of).days,
+            ))
+        # Expired contracts can't alert again; keep the set bounded by the window
+        self._alerted = {(cid, end) for cid, end in self._alerted if end >= as_of}
+        if alerts:
+            logger.info(f"🔔 {len(alerts)} contracts expire by {window_end.isoformat()}")
+        return alerts
+
+
+_indexes: dict[str, ContractPeriodIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_org_period_index(org_id: str) -> ContractPeriodIndex:
+    """Process-wide ContractPeriodIndex per org."""
+    with _indexes_lock:
+        index = _indexes.get(org_id)
+        if index is None:
+            index = _indexes[org_id] = ContractPeriodIndex()
+        return index
@@ -0,0 +1,340 @@
+# backend/app/features/contract/reconciliation.py
+from datetime import date
+from heapq import heappop, heappush
+from itertools import groupby
+from typing import Iterable, Iterator, Literal, Sequence, get_args
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from app.features.contract.formula import variable_name
+from app.features.fx.currency import normalize_currency
+from app.schemas.contract import Contract, MoneyValue, PercentageValue, RateValue
+from app.schemas.enums import ContractTypes
+from app.utils import batched, get_logger
+
+logger = get_logger(__name__)
+
+# Term value kinds that can be checked against a billed line
+_RATE, _MONEY, _PERCENT = 0, 1, 2
+_OPEN_START, _OPEN_END = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+FlagKind = Literal["overcharge", "uncontracted_charge", "no_contract", "currency_mismatch"]
+_FLAG_KINDS: tuple[FlagKind, ...] = get_args(FlagKind)
+
+
+# ---------- Inputs / outputs ----------
+class InvoiceLine(BaseModel):
+    """One billed charge. Invoice extraction has no line items yet, so callers build these from their source."""
+    invoice_id: str
+    vendor_name: str | None = None
+    contract_type: ContractTypes | None = Field(None, description="Narrows the contract lookup; None matches any contract of the vendor.")
+    service_date: date | None = Field(None, description="Date the charge was incurred (falls back to nothing: undated lines can't be matched).")
+    charge_key: str = Field(..., description="Matched against Term.key, e.g. 'into_plane_fee'.")
+    quantity: float = 1.0
+    unit_price: float | None = None
+    amount: float | None = Field(None, description="Line total; derived from unit_price * quantity when missing.")
+    base_amount: float | None = Field(None, description="Amount a percentage term applies to (e.g. fuel cost for an admin fee).")
+    currency: str | None = None
+
+
+class ContractVersion(BaseModel):
+    """A contract as stored: same contract_id with a higher version supersedes overlapping dates."""
+    contract_id: str
+    version: int = 1
+    contract: Contract
+
+
+class ReconcileConfig(BaseModel):
+    rel_tolerance: float = Field(0.005, ge=0, description="Allowed overbilling as a share of the expected line total.")
+    abs_tolerance: float = Field(0.01, ge=0, description="Allowed overbilling in line currency (rounding).")
+    fx_to_usd: dict[str, float] = Field(default_factory=lambda: {"USD": 1.0}, description="Currency -> USD, used when term and line currencies differ.")
+    flag_unmatched: bool = Field(True, description="Emit no_contract / uncontracted_charge flags.")
+
+
+class LeakageFlag(BaseModel):
+    row: int = Field(..., description="Position of the line in the reconciled input.")
+    invoice_id: str
+    kind: FlagKind
+    charge_key: str
+    contract_id: str | None = None
+    version: int | None = None
+    billed: float | None = Field(None, description="Billed unit price (rate terms) or amount, line currency.")
+    expected: float | None = Field(None, description="Contracted equivalent of `billed`, line currency.")
+    excess: float | None = Field(None, description="Overbilled total for the line, line currency.")
+    currency: str | None = None
+
+
+def _vendor_key(name: str | None) -> str:
+    return " ".join((name or "").casefold().split())
+
+
+def _day(value: date | None, default: int) -> int:
+    return value.toordinal() if value is not None else default
+
+
+# ---------- Contract index ----------
+class ContractTermIndex:
+    """
+    Contract versions by (vendor, contract type) and effective date, with their checkable terms.
+    - Each group's timeline is cut into segments at every effective_from / effective_to, and each
+      segment records the version in force (latest effective_from, then highest version). Resolving
+      a batch of lines is then one searchsorted on packed (group, day) keys, however many versions
+      overlap or have expired.
+    - Terms are a sorted array of packed (placement, term key) ids with parallel value columns.
+    """
+
+    def __init__(self, versions: Iterable[ContractVersion]):
+        self.versions = list(versions)
+        self._scopes: dict[str, dict[str, int]] = {}  # vendor -> contract type ('' = untyped) -> group
+        self._term_keys: dict[str, int] = {}
+        self._currencies: dict[str, int] = {}
+
+        placements = []  # (group, start, version, end, contract row)
+        self._version_start = np.empty(len(self.versions), dtype=np.int64)
+        n_groups = 0
+        for row, v in enumerate(self.versions):
+            c = v.contract
+            start, end = _day(c.effective_from, _OPEN_START), _day(c.effective_to, _OPEN_END)
+            scopes = self._scopes.setdefault(_vendor_key(c.vendor.vendor_name), {})
+            scope = c.contract_type.value if c.contract_type else ""
+            if scope not in scopes:
+                scopes[scope], n_groups = n_groups, n_groups + 1
+            placements.append((scopes[scope], start, v.version, end, row))
+            self._version_start[row] = start
+        placements.sort()
+
+        segments = []  # (group, first day, contract row or -1)
+        for group, items in groupby(placements, key=lambda p: p[0]):
+            items = list(items)
+            cuts = sorted({p[1] for p in items} | {p[3] + 1 for p in items if p[3] < _OPEN_END})
+            active: list[tuple[int, int, int, int, int]] = []  # heap of (-start, -version, -end, -row, end)
+            i = 0
+            for day in cuts:
+                while i < len(items) and items[i][1] <= day:
+                    _, start, version, end, row = items[i]
+                    heappush(active, (-start, -version, -end, -row, end))
+                    i += 1
+                while active and active[0][4] < day:  # expired; later-starting versions stay on top
+                    heappop(active)
+                segments.append((group, day, -active[0][3] if active else -1))
+        table = np.array(segments, dtype=np.int64).reshape(-1, 3)
+        self._seg_group, self._seg_row = table[:, 0], table[:, 2]
+        self._seg_packed = self._pack(table[:, 0], table[:, 1])
+
+        term_ids, kinds, values, currencies = [], [], [], []
+        for row, v in enumerate(self.versions):
+            for term in v.contract.terms:
+                value = term.value
+                if isinstance(value, RateValue):
+                    kind, amount, currency = _RATE, value.amount, value.currency
+                elif isinstance(value, MoneyValue):
+                    kind, amount, currency = _MONEY, value.amount, value.currency
+                elif isinstance(value, PercentageValue):
+                    kind, amount, currency = _PERCENT, value.value, None
+                else:
+                    continue
+                key = self._term_keys.setdefault(variable_name(term.key), len(self._term_keys))
+                term_ids.append((row, key))
+                kinds.append(kind)
+                values.append(amount)
+                currencies.append(self._currency(currency))
+        packed = np.array([r * max(len(self._term_keys), 1) + k for r, k in term_ids], dtype=np.int64)
+        # First occurrence wins when a contract repeats a term key
+        order = np.argsort(packed, kind="stable")
+        packed, first = np.unique(packed[order], return_index=True)
+        self._term_packed = packed
+        self._term_kind = np.array(kinds, dtype=np.int8)[order][first]
+        self._term_value = np.array(values, dtype=np.float64)[order][first]
+        self._term_currency = np.array(currencies, dtype=np.int32)[order][first]
+        logger.info(f"📑 Contract term index: {len(self.versions)} versions, {n_groups} groups, {packed.shape[0]} terms")
+
+    @staticmethod
+    def _pack(group: np.ndarray, day: np.ndarray) -> np.ndarray:
+        return (group.astype(np.int64) << 32) + (day.astype(np.int64) - _OPEN_START)
+
+    def _currency(self, code: str | None) -> int:
+        iso = normalize_currency(code)
+        if iso is None:
+            return -1
+        return self._currencies.setdefault(iso, len(self._currencies))
+
+    @property
+    def currencies(self) -> list[str]:
+        return list(self._currencies)
+
+    def currency_id(self, code: str) -> int:
+        """Id of an ISO currency some indexed term is priced in; -1 if none is."""
+        return self._currencies.get(code, -1)
+
+    def term_key(self, charge_key: str) -> int:
+        """Id of a term key some indexed contract has; -1 if none has it."""
+        return self._term_keys.get(variable_name(charge_key), -1)
+
+    def resolve(self, groups: np.ndarray, days: np.ndarray) -> np.ndarray:
+        """Contract row in force for each (group, day); -1 where none. Latest effective_from wins."""
+        out = np.full(groups.shape[0], -1, dtype=np.int64)
+        if not self._seg_row.shape[0]:
+            return out
+        pos = np.searchsorted(self._seg_packed, self._pack(groups, days), side="right") - 1
+        p = np.clip(pos, 0, None)
+        hit = (groups >= 0) & (pos >= 0) & (self._seg_group[p] == groups)
+        out[hit] = self._seg_row[p[hit]]
+        return out
+
+    def match(
+        self,
+        vendors: Sequence[str | None],
+        contract_types: Sequence[ContractTypes | None],
+        days: np.ndarray,
+        keys: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (contract row, term position) for each line; -1 where none. A typed line only sees the
+        vendor's contracts of that type. An untyped line sees all of them: the latest-starting
+        contract in force that has the charge's term, else the latest-starting one in force.
+        """
+        combos: dict[tuple[str | None, ContractTypes | None], int] = {}
+        line_combo = np.array([combos.setdefault(vc, len(combos)) for vc in zip(vendors, contract_types)], dtype=np.int64)
+        candidates = []
+        for vendor, contract_type in combos:  # distinct (vendor, type) pairs only
+            scopes = self._scopes.get(_vendor_key(vendor), {})
+            if contract_type is None:
+                candidates.append(list(scopes.values()))
+            else:
+                group = scopes.get(contract_type.value)
+                candidates.append([] if group is None else [group])
+        table = np.full((max((len(c) for c in candidates), default=0), len(candidates)), -1, dtype=np.int64)
+        for i, groups in enumerate(candidates):
+            table[: len(groups), i] = groups
+        grid = table[:, line_combo]
+        grid[:, days == _OPEN_START] = -1  # undated lines can't be matched
+
+        n = days.shape[0]
+        rows = np.full(n, -1, dtype=np.int64)
+        terms = np.full(n, -1, dtype=np.int64)
+        best_start = np.full(n, _OPEN_START - 1, dtype=np.int64)
+        for groups in grid:
+            r = self.resolve(groups, days)
+            t = self.terms(r, keys)
+            start = np.where(r >= 0, self._version_start[np.clip(r, 0, None)], _OPEN_START - 1)
+            has, had = t >= 0, terms >= 0
+            better = (r >= 0) & ((has & ~had) | ((has == had) & (start > best_start)))
+            rows[better], terms[better], best_start[better] = r[better], t[better], start[better]
+        return rows, terms
+
+    def term_values(self, terms: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(kind, value, currency id) for each term position; -1 / NaN / -1 where terms is -1."""
+        has_term = terms >= 0
+        t = np.clip(terms, 0, None)
+        if not self._term_packed.shape[0]:
+            return np.full(terms.shape[0], -1), np.full(terms.shape[0], np.nan), np.full(terms.shape[0], -1)
+        return (
+            np.where(has_term, self._term_kind[t], -1),
+            np.where(has_term, self._term_value[t], np.nan),
+            np.where(has_term, self._term_currency[t], -1),
+        )
+
+    def terms(self, rows: np.ndarray, keys: np.ndarray) -> np.ndarray:
+        """Term position for each (contract row, term key id); -1 where the contract has no such term."""
+        out = np.full(rows.shape[0], -1, dtype=np.int64)
+        if not self._term_packed.shape[0]:
+            return out
+        valid = (rows >= 0) & (keys >= 0)
+        packed = rows * max(len(self._term_keys), 1) + keys
+        pos = np.searchsorted(self._term_packed, packed)
+        p = np.clip(pos, 0, self._term_packed.shape[0] - 1)
+        hit = valid & (self._term_packed[p] == packed)
+        out[hit] = p[hit]
+        return out
+
+
+# ---------- Reconciliation ----------
+def reconcile(
+    index: ContractTermIndex,
+    lines: Iterable[InvoiceLine],
+    config: ReconcileConfig | None = None,
+    batch_size: int = 100_000,
+) -> Iterator[LeakageFlag]:
+    """
+    Check invoice lines against the contract version in force on their service date.
+    Lines are processed in column batches (one vectorized pass per batch) and flags are
+    yielded as each batch finishes, so a year of invoices never has to sit in memory twice.
+    """
+    config = config or ReconcileConfig()
+    fx = {normalize_currency(k) or k.upper(): v for k, v in config.fx_to_usd.items()}
+    offset = flagged = 0
+
+    for batch in batched(lines, batch_size):
+        n = len(batch)
+        days = np.array([_day(l.service_date, _OPEN_START) for l in batch], dtype=np.int64)
+        keys = np.array([index.term_key(l.charge_key) for l in batch], dtype=np.int64)
+        qty = np.array([l.quantity for l in batch], dtype=np.float64)
+        unit = np.array([np.nan if l.unit_price is None else l.unit_price for l in batch])
+        amount = np.array([np.nan if l.amount is None else l.amount for l in batch])
+        base = np.array([np.nan if l.base_amount is None else l.base_amount for l in batch])
+        line_names = [normalize_currency(l.currency) or ((l.currency or "").strip().upper() or None) for l in batch]
+        # -1 = not stated, -2 = a currency no contract term uses
+        line_ccy = np.array([index.currency_id(c) if c else -1 for c in line_names], dtype=np.int64)
+        line_ccy[(line_ccy == -1) & np.array([c is not None for c in line_names], dtype=bool)] = -2
+
+        amount = np.where(np.isnan(amount), unit * qty, amount)
+        unit = np.where(np.isnan(unit), amount / np.where(qty == 0, np.nan, qty), unit)
+
+        rows, terms = index.match([l.vendor_name for l in batch], [l.contract_type for l in batch], days, keys)
+        has_term = terms >= 0
+        kind, value, term_ccy = index.term_values(terms)
+
+        # Term currency -> line currency; same or unstated currency needs no rate
+        term_fx = np.array([fx.get(c, np.nan) for c in index.currencies] + [np.nan])[np.where(term_ccy >= 0, term_ccy, -1)]
+        line_fx = np.array([fx.get(c, np.nan) if c else np.nan for c in line_names])
+        same = (term_ccy < 0) | (line_ccy == -1) | (term_ccy == line_ccy)
+        with np.errstate(invalid="ignore"):
+            rate = np.where(same, 1.0, term_fx / line_fx)
+        mismatch = has_term & (kind != _PERCENT) & ~same & np.isnan(rate)
+
+        expected = np.full(n, np.nan)
+        billed = np.full(n, np.nan)
+        excess = np.full(n, np.nan)
+        is_rate, is_money, is_pct = kind == _RATE, kind == _MONEY, kind == _PERCENT
+        expected[is_rate] = (value * rate)[is_rate]
+        billed[is_rate] = unit[is_rate]
+        excess[is_rate] = ((unit - value * rate) * qty)[is_rate]
+        expected[is_money] = (value * rate)[is_money]
+        billed[is_money] = amount[is_money]
+        excess[is_money] = (amount - value * rate)[is_money]
+        expected[is_pct] = (base * value / 100)[is_pct]
+        billed[is_pct] = amount[is_pct]
+        excess[is_pct] = (amount - base * value / 100)[is_pct]
+
+        expected_total = np.where(is_rate, expected * qty, expected)
+        with np.errstate(invalid="ignore"):
+            allowed = np.maximum(config.abs_tolerance, config.rel_tolerance * np.abs(expected_total))
+            over = has_term & ~mismatch & (excess > allowed)
+
+        flag = np.full(n, -1, dtype=np.int8)
+        flag[over] = 0
+        flag[mismatch] = 3
+        if config.flag_unmatched:
+            flag[(rows >= 0) & ~has_term] = 1
+            flag[rows < 0] = 2
+
+        for i in np.flatnonzero(flag >= 0).tolist():
+            line = batch[i]
+            version = index.versions[rows[i]] if rows[i] >= 0 else None
+            yield LeakageFlag(
+                row=offset + i,
+                invoice_id=line.invoice_id,
+                kind=_FLAG_KINDS[flag[i]],
+                charge_key=line.charge_key,
+                contract_id=version.contract_id if version else None,
+                version=version.version if version else None,
+                billed=None if np.isnan(billed[i]) else round(float(billed[i]), 6),
+                expected=None if np.isnan(expected[i]) else round(float(expected[i]), 6),
+                excess=None if np.isnan(excess[i]) else round(float(excess[i]), 6),
+                currency=line_names[i],
+            )
+            flagged += 1
+        offset += n
+
+    logger.info(f"🧾 Reconciled {offset} invoice lines: {flagged} flags")
@@ -0,0 +1,21 @@
+"""
+Fuel tender evaluation.
+"""
+
+from .tender_evaluation import (
+    EvaluationConfig,
+    BidColumns,
+    RankedBid,
+    TenderEvaluation,
+    evaluate_bids,
+    apply_normalized_prices,
+)
+
+__all__ = [
+    "EvaluationConfig",
+    "BidColumns",
+    "RankedBid",
+    "TenderEvaluation",
+    "evaluate_bids",
+    "apply_normalized_prices",
+]
@@ -0,0 +1,279 @@
+# backend/app/features/fuel/tender_evaluation.py
+from dataclasses import dataclass, fields
+from decimal import Decimal
+from typing import Sequence
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from app.features.fx.currency import normalize_currency
+from app.schemas.fuel_bid import FuelBid
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+# ---------- Units ----------
+LITERS_PER_USG = 3.785411784
+# Multiplier from "price per <uom>" to "price per USG" (MT depends on density, handled in evaluate_bids)
+UOM_CODES: dict[str, int] = {"usg": 0, "gal": 0, "l": 1, "ltr": 1, "m3": 2, "cbm": 2, "mt": 3}
+_UOM_TO_USG = np.array([1.0, LITERS_PER_USG, LITERS_PER_USG / 1000, np.nan])
+
+# Differential unit codes: same unit as the bid price, USD per USG, US cents per USG
+_DIFF_SAME, _DIFF_USD_USG, _DIFF_CENTS_USG = 0, 1, 2
+
+# Tri-state booleans stored as int8
+_UNKNOWN, _NO, _YES = -1, 0, 1
+
+
+class EvaluationConfig(BaseModel):
+    """Market inputs and policy used to put every bid on an all-in USD/USG basis"""
+    index_prices: dict[str, float] = Field(default_factory=dict, description="Index name -> current price in USD/USG.")
+    fx_to_usd: dict[str, float] = Field(default_factory=lambda: {"USD": 1.0}, description="Currency -> USD per unit of currency.")
+    tax_rate: float = Field(0.0, ge=0, description="Share added to bids that exclude (or don't mention) taxes.")
+    airport_fee_usd_per_usg: float = Field(0.0, ge=0, description="Added to bids that exclude (or don't mention) airport fees.")
+    default_density: float = Field(800.0, gt=0, description="kg/m3 used for MT prices when the bid gives no density (Jet A-1 ~775-840).")
+
+
+# ---------- Columnar bids ----------
+def _codes(values: Sequence[str | None], normalize=lambda v: v) -> tuple[np.ndarray, list[str]]:
+    keys: dict[str, int] = {}
+    out = np.empty(len(values), dtype=np.int32)
+    for i, v in enumerate(values):
+        if v is None:
+            out[i] = -1
+            continue
+        v = normalize(v)
+        code = keys.get(v)
+        if code is None:
+            code = keys[v] = len(keys)
+        out[i] = code
+    return out, list(keys)
+
+
+def _num(value) -> float:
+    return float(value) if value is not None else np.nan
+
+
+def _tri(value: bool | None) -> int:
+    return _UNKNOWN if value is None else (_YES if value else _NO)
+
+
+def _diff_unit(unit: str | None) -> int:
+    unit = (unit or "").lower().replace(" ", "_")
+    if "cent" in unit:
+        return _DIFF_CENTS_USG
+    if "usd" in unit and ("usg" in unit or "gal" in unit):
+        return _DIFF_USD_USG
+    return _DIFF_SAME
+
+
+@dataclass(slots=True)
+class BidColumns:
+    """
+    Fuel bids as parallel numpy arrays; string fields are dictionary-encoded (-1 = missing).
+    Build once per tender with from_bids(); evaluate_bids() then works on whole columns.
+    """
+
+    airport: np.ndarray         # int32 code into `airports`
+    round: np.ndarray           # int32
+    vendor: np.ndarray          # int32 code into `vendors`
+    is_index: np.ndarray        # bool
+    base_price: np.ndarray      # float64, NaN = missing
+    index: np.ndarray           # int32 code into `indexes`
+    differential: np.ndarray    # float64
+    diff_unit: np.ndarray       # int8 _DIFF_* code
+    fees: np.ndarray            # float64, per bid uom and currency
+    uom: np.ndarray             # int8 UOM_CODES value
+    currency: np.ndarray        # int32 code into `currencies`
+    density: np.ndarray         # float64 kg/m3
+    includes_taxes: np.ndarray  # int8 tri-state
+    includes_airport_fees: np.ndarray  # int8 tri-state
+    airports: list[str]
+    vendors: list[str]
+    indexes: list[str]
+    currencies: list[str]
+
+    def __post_init__(self):
+        n = self.airport.shape[0]
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if isinstance(value, np.ndarray) and value.shape[0] != n:
+                raise ValueError(f"Column {f.name} has {value.shape[0]} rows, expected {n}")
+
+    def __len__(self) -> int:
+        return self.airport.shape[0]
+
+    @classmethod
+    def from_bids(cls, bids: Sequence[FuelBid], airports: Sequence[str] | str) -> "BidColumns":
+        """`airports` is the tender airport for each bid (or one code for all; bids don't carry it)."""
+        if isinstance(airports, str):
+            airports = [airports] * len(bids)
+        if len(airports) != len(bids):
+            raise ValueError(f"Got {len(airports)} airports for {len(bids)} bids")
+
+        airport, airport_keys = _codes(airports, str.upper)
+        vendor, vendor_keys = _codes([b.vendor.vendor_name or b.vendor_name for b in bids], str.strip)
+        index, index_keys = _codes([b.index_name for b in bids], lambda v: v.strip().lower())
+        currency, currency_keys = _codes([normalize_currency(b.currency, "USD") for b in bids])
+        uoms = [UOM_CODES.get((b.uom or "USG").strip().lower(), -1) for b in bids]
+        fees = [
+            sum(float(f) for f in (b.into_plane_fee, b.handling_fee, b.other_fee) if f is not None)
+            for b in bids
+        ]
+        return cls(
+            airport=airport,
+            round=np.array([b.round or 1 for b in bids], dtype=np.int32),
+            vendor=vendor,
+            is_index=np.array([(b.price_type or "").lower().startswith("index") for b in bids], dtype=bool),
+            base_price=np.array([_num(b.base_unit_price) for b in bids]),
+            index=index,
+            differential=np.array([_num(b.differential) for b in bids]),
+            diff_unit=np.array([_diff_unit(b.differential_unit) for b in bids], dtype=np.int8),
+            fees=np.array(fees),
+            uom=np.array(uoms, dtype=np.int8),
+            currency=currency,
+            density=np.array([_num(b.density_at_15c) for b in bids]),
+            includes_taxes=np.array([_tri(b.includes_taxes) for b in bids], dtype=np.int8),
+            includes_airport_fees=np.array([_tri(b.includes_airport_fees) for b in bids], dtype=np.int8),
+            airports=airport_keys,
+            vendors=vendor_keys,
+            indexes=index_keys,
+            currencies=currency_keys,
+        )
+
+
+# ---------- Results ----------
+class RankedBid(BaseModel):
+    row: int = Field(..., description="Position of the bid in the evaluated input.")
+    airport: str
+    round: int
+    vendor: str | None = None
+    rank: int
+    unit_price_usd_per_usg: float
+    all_in_usd_per_usg: float
+    delta_vs_prev_round: float | None = Field(None, description="Change vs. the vendor's best bid in its previous round (negative = cheaper).")
+
+
+class TenderEvaluation:
+    """Per-bid results as arrays aligned with the input rows; NaN / -1 where a bid can't be priced."""
+
+    def __init__(self, bids: BidColumns, unit_price: np.ndarray, all_in: np.ndarray, rank: np.ndarray, delta: np.ndarray):
+        self.bids = bids
+        self.unit_price = unit_price
+        self.all_in = all_in
+        self.rank = rank
+        self.delta = delta
+
+    @property
+    def priced(self) -> int:
+        return int(np.count_nonzero(~np.isnan(self.all_in)))
+
+    def _ranked(self, row: int) -> RankedBid:
+        b = self.bids
+        vendor = int(b.vendor[row])
+        delta = float(self.delta[row])
+        return RankedBid(
+            row=row,
+            airport=b.airports[b.airport[row]],
+            round=int(b.round[row]),
+            vendor=b.vendors[vendor] if vendor >= 0 else None,
+            rank=int(self.rank[row]),
+            unit_price_usd_per_usg=round(float(self.unit_price[row]), 6),
+            all_in_usd_per_usg=round(float(self.all_in[row]), 6),
+            delta_vs_prev_round=None if np.isnan(delta) else round(delta, 6),
+        )
+
+    def top(self, n: int = 3, airport: str | None = None, round: int | None = None) -> list[RankedBid]:
+        """Best n bids per (airport, round), ordered by airport, round, rank."""
+        b = self.bids
+        mask = (self.rank >= 1) & (self.rank <= n)
+        if airport is not None:
+            code = b.airports.index(airport.upper()) if airport.upper() in b.airports else -2
+            mask &= b.airport == code
+        if round is not None:
+            mask &= b.round == round
+        rows = np.flatnonzero(mask)
+        rows = rows[np.lexsort((self.rank[rows], b.round[rows], b.airport[rows]))]
+        return [self._ranked(int(r)) for r in rows]
+
+
+# ---------- Evaluation ----------
+def _lookup(keys: list[str], table: dict[str, float], normalize=lambda k: k) -> np.ndarray:
+    """Per-code value from a dict (NaN if missing), plus a trailing NaN slot for code -1."""
+    norm = {normalize(k): v for k, v in table.items()}
+    return np.array([norm.get(k, np.nan) for k in keys] + [np.nan])
+
+
+def evaluate_bids(bids: BidColumns, config: EvaluationConfig) -> TenderEvaluation:
+    """
+    All-in USD/USG price for every bid, rank within (airport, round), and round-over-round deltas.
+    - Fixed bids: base price; index bids: index price (USD/USG) + differential.
+    - Bid-currency amounts are converted with fx_to_usd and from the bid's uom to USG
+      (MT via density_at_15c, else default_density).
+    - Fees (into-plane, handling, other) are added; taxes and airport fees are added when the bid
+      excludes them or says nothing, so every bid is compared on the same basis.
+    Bids with an unknown index, currency or uom get NaN and are left unranked (rank -1).
+    """
+    n = len(bids)
+    fx = _lookup(bids.currencies, config.fx_to_usd, lambda k: normalize_currency(k) or k.upper())[bids.currency]
+    index_price = _lookup(bids.indexes, config.index_prices, lambda k: k.strip().lower())[bids.index]
+
+    density = np.where(np.isnan(bids.density), config.default_density, bids.density)
+    per_usg = _UOM_TO_USG[np.where(bids.uom >= 0, bids.uom, 3)]
+    per_usg = np.where(bids.uom == 3, density * LITERS_PER_USG / 1e6, per_usg)  # per-MT -> per-USG
+    per_usg = np.where(bids.uom < 0, np.nan, per_usg)
+    to_usd_usg = fx * per_usg
+
+    diff = np.nan_to_num(bids.differential)
+    diff_usd_usg = np.select(
+        [bids.diff_unit == _DIFF_USD_USG, bids.diff_unit == _DIFF_CENTS_USG],
+        [diff, diff / 100],
+        diff * to_usd_usg,
+    )
+    unit_price = np.where(bids.is_index, index_price + diff_usd_usg, bids.base_price * to_usd_usg)
+
+    all_in = unit_price + bids.fees * to_usd_usg
+    all_in = np.where(bids.includes_taxes == _YES, all_in, all_in * (1 + config.tax_rate))
+    all_in = np.where(bids.includes_airport_fees == _YES, all_in, all_in + config.airport_fee_usd_per_usg)
+
+    priced = ~np.isnan(all_in)
+    sort_price = np.where(priced, all_in, np.inf)
+
+    # Rank within (airport, round): sort by group then price; rank = position - group start + 1
+    order = np.lexsort((sort_price, bids.round, bids.airport))
+    grp_a, grp_r = bids.airport[order], bids.round[order]
+    starts = np.ones(n, dtype=bool)
+    starts[1:] = (grp_a[1:] != grp_a[:-1]) | (grp_r[1:] != grp_r[:-1])
+    pos = np.arange(n)
+    first = np.maximum.accumulate(np.where(starts, pos, 0))
+    rank = np.empty(n, dtype=np.int32)
+    rank[order] = pos - first + 1
+    rank[~priced] = -1
+
+    # Round deltas: each vendor's best price per (airport, round) vs. its best in the previous round it bid
+    delta = np.full(n, np.nan)
+    has_vendor = priced & (bids.vendor >= 0)
+    rows = np.flatnonzero(has_vendor)
+    if rows.shape[0]:
+        a, v, r, p = bids.airport[rows], bids.vendor[rows], bids.round[rows], all_in[rows]
+        o = np.lexsort((p, r, v, a))
+        a, v, r, p, rows = a[o], v[o], r[o], p[o], rows[o]
+        new_group = np.ones(rows.shape[0], dtype=bool)
+        new_group[1:] = (a[1:] != a[:-1]) | (v[1:] != v[:-1]) | (r[1:] != r[:-1])
+        group_id = np.cumsum(new_group) - 1
+        best = p[new_group]  # first of each (airport, vendor, round) is its best
+        ga, gv = a[new_group], v[new_group]
+        prev_best = np.full(best.shape[0], np.nan)
+        same_vendor = np.zeros(best.shape[0], dtype=bool)
+        same_vendor[1:] = (ga[1:] == ga[:-1]) & (gv[1:] == gv[:-1])
+        prev_best[1:] = np.where(same_vendor[1:], best[:-1], np.nan)
+        delta[rows] = p - prev_best[group_id]
+
+    logger.info(f"⛽ Evaluated {n} fuel bids ({int(priced.sum())} priced, {len(bids.airports)} airports)")
+    return TenderEvaluation(bids, unit_price, all_in, rank, delta)
+
+
+def apply_normalized_prices(bids: Sequence[FuelBid], evaluation: TenderEvaluation) -> None:
+    """Write the computed unit price back to FuelBid.normalized_unit_price_usd_per_usg."""
+    for bid, price in zip(bids, evaluation.unit_price.tolist()):
+        bid.normalized_unit_price_usd_per_usg = None if np.isnan(price) else Decimal(str(round(price, 6)))
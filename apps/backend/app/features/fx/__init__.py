@@ -0,0 +1,15 @@
+"""
+Currency normalization and dated FX rate snapshots.
+"""
+
+from .currency import CURRENCY_ALIASES, currency_codes, normalize_currency
+from .rates import FxError, FxRateTable, get_fx_table
+
+__all__ = [
+    "CURRENCY_ALIASES",
+    "currency_codes",
+    "normalize_currency",
+    "FxError",
+    "FxRateTable",
+    "get_fx_table",
+]
@@ -0,0 +1,65 @@
+# backend/app/features/fx/currency.py
+import re
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+
+# Symbols and spelled-out names seen in extracted documents -> ISO 4217.
+# Bare "$" is taken as USD; prefixed dollar symbols ("C$", "A$") are checked first.
+CURRENCY_ALIASES: dict[str, str] = {
+    "$": "USD", "US$": "USD", "U$S": "USD", "USD$": "USD", "DOLLAR": "USD", "DOLLARS": "USD", "US DOLLAR": "USD", "US DOLLARS": "USD",
+    "€": "EUR", "EURO": "EUR", "EUROS": "EUR",
+    "£": "GBP", "POUND": "GBP", "POUNDS": "GBP", "POUND STERLING": "GBP", "STERLING": "GBP", "GB£": "GBP",
+    "₪": "ILS", "NIS": "ILS", "SHEKEL": "ILS", "SHEKELS": "ILS",
+    "¥": "JPY", "YEN": "JPY", "JP¥": "JPY",
+    "CN¥": "CNY", "RMB": "CNY", "YUAN": "CNY",
+    "C$": "CAD", "CA$": "CAD", "CAN$": "CAD",
+    "A$": "AUD", "AU$": "AUD",
+    "S$": "SGD", "HK$": "HKD", "NZ$": "NZD",
+    "CHF": "CHF", "FR.": "CHF", "SWISS FRANC": "CHF", "SWISS FRANCS": "CHF",
+    "₹": "INR", "RUPEE": "INR", "RUPEES": "INR",
+    "₩": "KRW", "₺": "TRY", "R$": "BRL", "AED": "AED", "DIRHAM": "AED", "DIRHAMS": "AED",
+}
+_ISO_RE = re.compile(r"^[A-Z]{3}$")
+
+
+@lru_cache(maxsize=1024)
+def _normalize(text: str) -> str | None:
+    text = " ".join(text.upper().split())
+    if text in CURRENCY_ALIASES:
+        return CURRENCY_ALIASES[text]
+    if _ISO_RE.match(text):
+        return text
+    # "USD 1,200.00", "€ 350", "1.200 EUR": first alias or ISO-looking token
+    for token in re.split(r"[\s\d.,]+", text):
+        if token in CURRENCY_ALIASES:
+            return CURRENCY_ALIASES[token]
+        if _ISO_RE.match(token):
+            return token
+    for symbol in sorted((a for a in CURRENCY_ALIASES if not a.isalpha()), key=len, reverse=True):
+        if symbol in text:
+            return CURRENCY_ALIASES[symbol]
+    return None
+
+
+def normalize_currency(value: str | None, default: str | None = None) -> str | None:
+    """'$' -> 'USD', '€' -> 'EUR', 'Pounds' -> 'GBP', 'eur' -> 'EUR'; `default` when missing, None when unrecognized."""
+    if not value or not value.strip():
+        return default
+    return _normalize(value.strip())
+
+
+def currency_codes(values: Sequence[str | None], default: str | None = "USD") -> tuple[np.ndarray, list[str]]:
+    """Dictionary-encode a column of raw currencies: (int32 codes, ISO code per code); -1 = unknown."""
+    keys: dict[str, int] = {}
+    seen: dict[str | None, int] = {}  # raw value -> code, so repeated spellings skip normalization
+    out = np.empty(len(values), dtype=np.int32)
+    for i, raw in enumerate(values):
+        code = seen.get(raw)
+        if code is None:
+            iso = normalize_currency(raw, default)
+            code = -1 if iso is None else keys.setdefault(iso, len(keys))
+            seen[raw] = code
+        out[i] = code
+    return out, list(keys)
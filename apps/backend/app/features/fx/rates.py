@@ -0,0 +1,164 @@
+# backend/app/features/fx/rates.py
+import csv
+import json
+import os
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Mapping, Sequence
+
+import numpy as np
+
+from app.features.fx.currency import currency_codes, normalize_currency
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+DateLike = date | str | np.datetime64
+
+
+class FxError(ValueError):
+    """Rates are missing for a requested conversion."""
+
+
+def _day(value: DateLike) -> np.datetime64:
+    if isinstance(value, np.datetime64):
+        return value.astype("datetime64[D]")
+    return np.datetime64(value, "D")
+
+
+class FxRateTable:
+    """
+    Dated FX snapshots held as a (dates x currencies) matrix of USD per unit of currency.
+    - Gaps are forward-filled at load, so the rate "as of" any day is one searchsorted on dates.
+    - convert() works on whole columns: amounts, raw currency strings and as-of dates.
+    """
+
+    def __init__(self, snapshots: Mapping[DateLike, Mapping[str, float]]):
+        per_day: dict[np.datetime64, dict[str, float]] = {}
+        for day, rates in snapshots.items():
+            target = per_day.setdefault(_day(day), {})
+            for currency, rate in rates.items():
+                iso = normalize_currency(currency)
+                if iso is not None and rate is not None and rate > 0:
+                    target[iso] = float(rate)
+        currencies = sorted({c for rates in per_day.values() for c in rates} | {"USD"})
+        self.currencies = currencies
+        self._index = {c: i for i, c in enumerate(currencies)}
+        self.dates = np.array(sorted(per_day), dtype="datetime64[D]")
+
+        matrix = np.full((len(self.dates), len(currencies)), np.nan)
+        for row, day in enumerate(self.dates.tolist()):
+            for currency, rate in per_day[np.datetime64(day, "D")].items():
+                matrix[row, self._index[currency]] = rate
+        matrix[:, self._index["USD"]] = 1.0
+        # Forward-fill: a currency missing from a snapshot keeps its previous rate
+        filled = np.where(np.isnan(matrix), 0, np.arange(len(self.dates))[:, None])
+        np.maximum.accumulate(filled, axis=0, out=filled)
+        matrix = matrix[filled, np.arange(len(currencies))]
+        # Leading gaps have nothing to carry forward; an extra NaN column stands for unknown currencies
+        self._rates = np.hstack([matrix, np.full((len(self.dates), 1), np.nan)])
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def latest(self) -> date | None:
+        return self.dates[-1].item() if len(self.dates) else None
+
+    # ---------- Loading ----------
+    @classmethod
+    def from_file(cls, path: str | Path) -> "FxRateTable":
+        """
+        CSV with `date,currency,usd_per_unit` columns (one row per rate), or JSON
+        `{"2025-01-02": {"EUR": 1.03, "GBP": 1.24}, ...}` with the same USD-per-unit rates.
+        """
+        path = Path(path)
+        snapshots: dict[DateLike, dict[str, float]] = {}
+        if path.suffix.lower() == ".json":
+            snapshots = json.loads(path.read_text())
+        else:
+            with path.open(newline="") as f:
+                for row in csv.DictReader(f):
+                    snapshots.setdefault(row["date"], {})[row["currency"]] = float(row["usd_per_unit"])
+        table = cls(snapshots)
+        logger.info(f"💱 Loaded {len(table)} FX snapshots for {len(table.currencies)} currencies from {path.name}")
+        return table
+
+    # ---------- Lookups ----------
+    def _rows(self, as_of: DateLike | Sequence[DateLike] | np.ndarray | None, n: int) -> np.ndarray:
+        if not len(self.dates):
+            raise FxError("No FX snapshots loaded")
+        if as_of is None:
+            return np.full(n, len(self.dates) - 1)
+        days = np.asarray(as_of, dtype="datetime64[D]")
+        rows = np.searchsorted(self.dates, days, side="right") - 1
+        if np.any(rows < 0):
+            raise FxError(f"No FX snapshot on or before {days.min()}")
+        return np.broadcast_to(rows, (n,)) if rows.ndim == 0 else rows
+
+    def _columns(self, currencies: Sequence[str | None] | str | None, n: int) -> np.ndarray:
+        unknown = len(self.currencies)
+        if currencies is None or isinstance(currencies, str):
+            iso = normalize_currency(currencies, "USD")
+            return np.full(n, self._index.get(iso, unknown) if iso else unknown)
+        codes, names = currency_codes(currencies, default="USD")
+        lookup = np.array([self._index.get(c, unknown) for c in names] + [unknown], dtype=np.int64)
+        return lookup[codes]
+
+    def usd_rates(self, as_of: DateLike | None = None) -> dict[str, float]:
+        """Currency -> USD per unit on a date, for code that takes an `fx_to_usd` mapping."""
+        row = self._rows(as_of, 1)[0]
+        return {c: float(r) for c, r in zip(self.currencies, self._rates[row, :-1]) if not np.isnan(r)}
+
+    def rate(self, currency: str | None, to: str = "USD", as_of: DateLike | None = None) -> float:
+        return float(self.convert([1.0], currency, to, as_of)[0])
+
+    def convert(
+        self,
+        amounts: Sequence[float] | np.ndarray,
+        currencies: Sequence[str | None] | str | None,
+        to: str = "USD",
+        as_of: DateLike | Sequence[DateLike] | np.ndarray | None = None,
+        strict: bool = False,
+    ) -> np.ndarray:
+        """
+        Convert a column of amounts in one pass. `currencies` and `as_of` are either one value for
+        the whole column or one per amount; raw symbols ('$', '€') are accepted. Missing currencies
+        default to USD; unknown ones (or no rate yet on that date) give NaN, or FxError with strict=True.
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)
+        n = amounts.shape[0]
+        rows = self._rows(as_of, n)
+        source = self._rates[rows, self._columns(currencies, n)]
+        target_iso = normalize_currency(to, "USD")
+        target_col = self._index.get(target_iso, len(self.currencies)) if target_iso else len(self.currencies)
+        target = self._rates[rows, target_col]
+        if strict and (np.isnan(source).any() or np.isnan(target).any()):
+            raise FxError(f"Missing FX rates converting to {to}")
+        return amounts * source / target
+
+
+# ---------- Process-wide table ----------
+_table: FxRateTable | None = None
+_table_mtime: float | None = None
+_table_lock = threading.Lock()
+
+
+def get_fx_table(path: str | Path | None = None) -> FxRateTable:
+    """
+    Snapshot table from FX_RATES_PATH (or `path`), kept in memory and reloaded only when
+    the file changes. Without a file the table only knows USD.
+    """
+    global _table, _table_mtime
+    path = path or os.getenv("FX_RATES_PATH")
+    with _table_lock:
+        if not path or not Path(path).exists():
+            if _table is None:
+                logger.warning("⚠️ No FX rates file (FX_RATES_PATH); only USD amounts can be converted")
+                _table = FxRateTable({date(1970, 1, 1): {"USD": 1.0}})
+            return _table
+        mtime = Path(path).stat().st_mtime
+        if _table is None or mtime != _table_mtime:
+            _table, _table_mtime = FxRateTable.from_file(path), mtime
+        return _table
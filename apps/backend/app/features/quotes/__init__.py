@@ -0,0 +1,41 @@
+"""
+Quote comparison across vendors and fuzzy part-number search.
+"""
+
+from .part_numbers import normalize_part_number, split_part_numbers
+from .compare_quotes import (
+    QuoteOffer,
+    QuoteComparisonIndex,
+    get_org_quote_index,
+    normalize_condition,
+)
+from .normalize import (
+    NormalizedQuote,
+    QuoteColumns,
+    lead_time_hours,
+    normalize_quote,
+    normalize_quotes,
+    parse_date,
+    warranty_months,
+)
+from .part_search import PartCandidate, PartNumberIndex, get_org_part_index, prefix_edit_distance
+
+__all__ = [
+    "normalize_part_number",
+    "split_part_numbers",
+    "QuoteOffer",
+    "QuoteComparisonIndex",
+    "get_org_quote_index",
+    "normalize_condition",
+    "lead_time_hours",
+    "NormalizedQuote",
+    "QuoteColumns",
+    "normalize_quote",
+    "normalize_quotes",
+    "parse_date",
+    "warranty_months",
+    "PartCandidate",
+    "PartNumberIndex",
+    "get_org_part_index",
+    "prefix_edit_distance",
+]
@@ -0,0 +1,223 @@
+# backend/app/features/quotes/compare_quotes.py
+import heapq
+import itertools
+import math
+import threading
+from bisect import bisect_left, insort
+from datetime import date
+from typing import Iterable, Iterator
+
+from pydantic import BaseModel, Field
+
+from app.features.fx.currency import normalize_currency
+from app.features.quotes.normalize import normalize_quote
+from app.features.quotes.part_numbers import normalize_part_number, split_part_numbers
+from app.schemas.quote import Quote, QuoteSchema
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Free-text condition -> standard code
+CONDITION_ALIASES: dict[str, str] = {
+    "FACTORY NEW": "FN",
+    "NEW": "NE",
+    "NEW SURPLUS": "NS",
+    "OVERHAULED": "OH",
+    "SERVICEABLE": "SV",
+    "REPAIRED": "RP",
+    "AS REMOVED": "AR",
+    "BEYOND ECONOMICAL REPAIR": "BER",
+    "USED": "US",
+    "MODIFIED": "MOD",
+}
+
+
+def normalize_condition(value: str | None) -> str:
+    if not value:
+        return ""
+    text = " ".join(value.upper().replace("-", " ").split())
+    return CONDITION_ALIASES.get(text, text)
+
+
+# ---------- Offers ----------
+class QuoteOffer(BaseModel):
+    """One quote line with its comparison fields precomputed"""
+    offer_id: int
+    doc_id: str
+    vendor: str | None = None
+    part_number: str = Field(..., description="Normalized primary part number of the quote.")
+    alternates: list[str] = Field(default_factory=list, description="Normalized alternate part numbers.")
+    condition: str = ""
+    price_type: str | None = None
+    currency: str | None = None
+    unit_price: float | None = None
+    core_charge: float = 0.0
+    landed_cost: float | None = Field(None, description="Unit price plus per-unit share of additional charges, quote currency.")
+    landed_cost_usd: float | None = None
+    lead_time_hours: float | None = None
+    expiration_date: date | None = None
+    quote: Quote
+
+    @property
+    def sort_key(self) -> tuple[float, float, int]:
+        """Cheapest first, then fastest; unpriced offers sort last."""
+        cost = self.landed_cost_usd if self.landed_cost_usd is not None else math.inf
+        lead = self.lead_time_hours if self.lead_time_hours is not None else math.inf
+        return (cost, lead, self.offer_id)
+
+
+def _landed_cost(quote: Quote) -> float | None:
+    if quote.unit_price is None:
+        return None
+    qty = quote.quantity or 1
+    return quote.unit_price + (quote.additional_charges or 0.0) / qty
+
+
+class QuoteComparisonIndex:
+    """
+    In-memory cross-vendor offer index keyed by normalized part number.
+    - Each (part number, condition) bucket is a list kept sorted by (landed USD cost, lead time),
+      so best offers are a dict lookup plus a slice, and inserts are a binary search.
+    - Alternate part numbers are linked to their primary (union-find); linking merges buckets.
+    - add_extraction/remove_document update the index incrementally as extractions arrive.
+    """
+
+    def __init__(self, fx_to_usd: dict[str, float] | None = None):
+        self.fx_to_usd = {normalize_currency(k) or k.upper(): v for k, v in (fx_to_usd or {"USD": 1.0}).items()}
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._parent: dict[str, str] = {}
+        self._buckets: dict[str, dict[str, list[tuple[tuple, QuoteOffer]]]] = {}
+        self._by_doc: dict[str, list[QuoteOffer]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._by_doc.values())
+
+    # ---------- Part-number groups ----------
+    def _find(self, pn: str) -> str:
+        root = pn
+        while self._parent.get(root, root) != root:
+            root = self._parent[root]
+        while self._parent.get(pn, pn) != root:  # path compression
+            self._parent[pn], pn = root, self._parent[pn]
+        return root
+
+    def _link(self, primary: str, alternate: str) -> None:
+        a, b = self._find(primary), self._find(alternate)
+        if a == b:
+            return
+        self._parent[b] = a
+        moved = self._buckets.pop(b, {})
+        target = self._buckets.setdefault(a, {})
+        for condition, entries in moved.items():
+            target[condition] = list(heapq.merge(target.get(condition, []), entries, key=lambda e: e[0]))
+
+    def canonical(self, part_number: str) -> str:
+        with self._lock:
+            return self._find(normalize_part_number(part_number))
+
+    # ---------- Updates ----------
+    def _fx(self, currency: str | None) -> float | None:
+        iso = normalize_currency(currency, "USD")
+        return self.fx_to_usd.get(iso) if iso else None
+
+    def add_quotes(
+        self, doc_id: str, quotes: Iterable[Quote], vendor: str | None = None, received: date | None = None,
+    ) -> list[QuoteOffer]:
+        """`received` anchors relative expiry phrasings ('valid 30 days')."""
+        offers = []
+        with self._lock:
+            for quote in quotes:
+                pns = split_part_numbers(quote.part.part_number)
+                for alt in split_part_numbers(quote.part.alt_part_number):
+                    if alt not in pns:
+                        pns.append(alt)
+                if not pns:
+                    continue
+                for alt in pns[1:]:
+                    self._link(pns[0], alt)
+
+                typed = normalize_quote(quote, received)
+                landed = _landed_cost(quote)
+                fx = self._fx(quote.currency)
+                offer = QuoteOffer(
+                    offer_id=next(self._ids),
+                    doc_id=doc_id,
+                    vendor=vendor,
+                    part_number=pns[0],
+                    alternates=pns[1:],
+                    condition=normalize_condition(quote.part.condition_code),
+                    price_type=quote.price_type,
+                    currency=quote.currency,
+                    unit_price=quote.unit_price,
+                    core_charge=quote.core_charge or 0.0,
+                    landed_cost=landed,
+                    landed_cost_usd=landed * fx if landed is not None and fx is not None else None,
+                    lead_time_hours=typed.lead_time_hours,
+                    expiration_date=typed.expiration_date,
+                    quote=quote,
+                )
+                bucket = self._buckets.setdefault(self._find(pns[0]), {}).setdefault(offer.condition, [])
+                insort(bucket, (offer.sort_key, offer), key=lambda e: e[0])
+                self._by_doc.setdefault(doc_id, []).append(offer)
+                offers.append(offer)
+        return offers
+
+    def add_extraction(self, doc_id: str, extraction: QuoteSchema, received: date | None = None) -> list[QuoteOffer]:
+        """Index (or re-index) every quote of one extracted vendor document."""
+        self.remove_document(doc_id)
+        offers = self.add_quotes(doc_id, extraction.quotes, vendor=extraction.vendor.vendor_name, received=received)
+        logger.info(f"📊 Indexed {len(offers)} quote offers from {doc_id}")
+        return offers
+
+    def remove_document(self, doc_id: str) -> int:
+        with self._lock:
+            offers = self._by_doc.pop(doc_id, [])
+            for offer in offers:
+                bucket = self._buckets.get(self._find(offer.part_number), {}).get(offer.condition)
+                if not bucket:
+                    continue
+                i = bisect_left(bucket, offer.sort_key, key=lambda e: e[0])
+                if i < len(bucket) and bucket[i][1] is offer:
+                    del bucket[i]
+        return len(offers)
+
+    # ---------- Queries ----------
+    def conditions(self, part_number: str) -> list[str]:
+        with self._lock:
+            buckets = self._buckets.get(self._find(normalize_part_number(part_number)), {})
+            return sorted(c for c, entries in buckets.items() if entries)
+
+    def best_offers(
+        self, part_number: str, condition: str | None = None, k: int = 5, as_of: date | None = None,
+    ) -> list[QuoteOffer]:
+        """Best k offers for a part number (any of its alternates), optionally for one condition code.
+        With `as_of`, offers that expired before that date are skipped."""
+        with self._lock:
+            buckets = self._buckets.get(self._find(normalize_part_number(part_number)), {})
+            if condition is not None:
+                entries: Iterator = iter(buckets.get(normalize_condition(condition), []))
+            else:
+                entries = heapq.merge(*buckets.values(), key=lambda e: e[0])
+            offers = (offer for _, offer in entries)
+            if as_of is not None:
+                offers = (o for o in offers if o.expiration_date is None or o.expiration_date >= as_of)
+            return list(itertools.islice(offers, k))
+
+    def best_by_condition(self, part_number: str, k: int = 1) -> dict[str, list[QuoteOffer]]:
+        with self._lock:
+            buckets = self._buckets.get(self._find(normalize_part_number(part_number)), {})
+            return {c: [o for _, o in entries[:k]] for c, entries in sorted(buckets.items()) if entries}
+
+
+_indexes: dict[str, QuoteComparisonIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_org_quote_index(org_id: str) -> QuoteComparisonIndex:
+    """Process-wide QuoteComparisonIndex per org."""
+    with _indexes_lock:
+        index = _indexes.get(org_id)
+        if index is None:
+            index = _indexes[org_id] = QuoteComparisonIndex()
+        return index
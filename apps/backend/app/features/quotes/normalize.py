@@ -0,0 +1,203 @@
+# backend/app/features/quotes/normalize.py
+import re
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Sequence
+
+import numpy as np
+from pydantic import BaseModel
+
+from app.schemas.quote import Quote, QuoteSchema
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Extractions repeat the same phrasings ("Stock", "3 years", "30 days"), so every parser is
+# memoized on the whitespace/case-normalized text.
+PARSE_CACHE_SIZE = 8192
+
+_LEAD_RE = re.compile(
+    r"(\d+(?:\.\d+)?)\s*(?:(?:working|business|calendar)\s+)?(hours?|hrs?|h|days?|d|weeks?|wks?|w|months?|mos?)\b",
+    re.IGNORECASE,
+)
+_LEAD_UNIT_HOURS = {"h": 1, "d": 24, "w": 24 * 7, "m": 24 * 30}
+# Checked before the stock words: "not available", "Unavailable", "Backorder - ready next month"
+_UNAVAILABLE_RE = re.compile(r"\b(?:not|no|none|n/a|unavailable|unable|back\s*-?\s*orders?(?:ed)?|out\s+of\s+stock)\b")
+_STOCK_WORDS = ("stock", "available", "ready", "immediate", "ex stock")
+
+_MONTHS = {m: i for i, m in enumerate(("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1)}
+_ISO_RE = re.compile(r"\b(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})\b")
+_NUMERIC_RE = re.compile(r"\b(\d{1,2})[-/.](\d{1,2})[-/.](\d{2}|\d{4})\b")
+_DAY_MON_RE = re.compile(r"\b(\d{1,2})(?:st|nd|rd|th)?[\s\-/.]*([a-z]{3})[a-z]*\.?[\s\-/.,]*(\d{4}|\d{2})\b")
+_MON_DAY_RE = re.compile(r"\b([a-z]{3})[a-z]*\.?\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})\b")
+_RELATIVE_RE = re.compile(r"(\d+)\s*(day|d|week|wk|w|month|mo|year|yr|y)s?\b")
+_RELATIVE_DAYS = {"d": 1, "w": 7, "m": 30, "y": 365}
+
+_WARRANTY_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(years?|yrs?|y|months?|mos?|m|days?|d|hours?|hrs?|h)\b", re.IGNORECASE)
+_WARRANTY_MONTHS = {"y": 12.0, "m": 1.0, "d": 1 / 30, "h": None}
+_NO_WARRANTY = ("no warranty", "none", "as is", "as-is", "n/a")
+
+
+def _key(value: str | None) -> str:
+    return " ".join(value.lower().split()) if value else ""
+
+
+# ---------- Parsers ----------
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _lead_time_hours(text: str) -> float | None:
+    match = _LEAD_RE.search(text)
+    if match:
+        return float(match.group(1)) * _LEAD_UNIT_HOURS[match.group(2)[0].lower()]
+    if _UNAVAILABLE_RE.search(text):
+        return None
+    if any(w in text for w in _STOCK_WORDS):
+        return 0.0
+    return None
+
+
+def lead_time_hours(value: str | None) -> float | None:
+    """'Stock' -> 0, '72 hours' -> 72, '1 week' -> 168; None if unknown (e.g. 'Backorder')."""
+    return _lead_time_hours(_key(value)) if value else None
+
+
+def _year(y: str) -> int:
+    return int(y) + 2000 if len(y) == 2 else int(y)
+
+
+def _safe_date(y: int, m: int, d: int) -> date | None:
+    try:
+        return date(y, m, d)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_date(text: str, day_first: bool) -> date | int | None:
+    """Absolute date, or a day offset for relative phrasings ('valid 30 days') resolved by the caller."""
+    if match := _ISO_RE.search(text):
+        return _safe_date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+    if match := _DAY_MON_RE.search(text):
+        month = _MONTHS.get(match.group(2))
+        if month:
+            return _safe_date(_year(match.group(3)), month, int(match.group(1)))
+    if match := _MON_DAY_RE.search(text):
+        month = _MONTHS.get(match.group(1))
+        if month:
+            return _safe_date(int(match.group(3)), month, int(match.group(2)))
+    if match := _NUMERIC_RE.search(text):
+        a, b, y = int(match.group(1)), int(match.group(2)), _year(match.group(3))
+        # Unambiguous when one side can't be a month; otherwise follow day_first
+        if a > 12 or (day_first and b <= 12):
+            return _safe_date(y, b, a)
+        return _safe_date(y, a, b)
+    if match := _RELATIVE_RE.search(text):
+        return int(match.group(1)) * _RELATIVE_DAYS[match.group(2)[0]]
+    return None
+
+
+def parse_date(value: str | None, reference: date | None = None, day_first: bool = False) -> date | None:
+    """
+    Date from free text: '2025-08-14', '14 Aug 2025', 'Aug 14, 2025', '14-AUG-25', '08/14/2025'.
+    Relative phrasings ('30 days', 'valid 2 weeks') need `reference` (e.g. the quote date).
+    """
+    if not value:
+        return None
+    parsed = _parse_date(_key(value), day_first)
+    if isinstance(parsed, int):
+        return reference + timedelta(days=parsed) if reference is not None else None
+    return parsed
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _warranty_months(text: str) -> float | None:
+    if any(w == text or text.startswith(w) for w in _NO_WARRANTY):
+        return 0.0
+    match = _WARRANTY_RE.search(text)
+    if not match:
+        return None
+    per = _WARRANTY_MONTHS[match.group(2)[0].lower()]
+    return round(float(match.group(1)) * per, 2) if per is not None else None
+
+
+def warranty_months(value: str | None) -> float | None:
+    """'1 year' -> 12, '6 months' -> 6, '90 days' -> 3, 'No warranty' -> 0; None if not a duration."""
+    return _warranty_months(_key(value)) if value else None
+
+
+# ---------- Normalized quotes ----------
+class NormalizedQuote(BaseModel):
+    """A quote with its free-text fields parsed once; the raw text stays on `quote`."""
+    quote: Quote
+    lead_time_hours: float | None = None
+    core_due_date: date | None = None
+    expiration_date: date | None = None
+    warranty_months: float | None = None
+    tagged_date: date | None = None
+
+    def is_expired(self, as_of: date) -> bool:
+        return self.expiration_date is not None and self.expiration_date < as_of
+
+
+def normalize_quote(quote: Quote, received: date | None = None, day_first: bool = False) -> NormalizedQuote:
+    """`received` anchors relative phrasings such as 'valid 30 days'."""
+    return NormalizedQuote(
+        quote=quote,
+        lead_time_hours=lead_time_hours(quote.lead_time),
+        core_due_date=parse_date(quote.core_due, received, day_first),
+        expiration_date=parse_date(quote.quote_expiration_date, received, day_first),
+        warranty_months=warranty_months(quote.warranty),
+        tagged_date=parse_date(quote.part.tagged_date, None, day_first),
+    )
+
+
+def _nan(value: float | None) -> float:
+    return np.nan if value is None else value
+
+
+def _dates(values: Sequence[date | None]) -> np.ndarray:
+    return np.array(values, dtype="datetime64[D]")
+
+
+class QuoteColumns:
+    """
+    Typed quote fields as parallel arrays (NaN / NaT where unknown) for sorting and filtering
+    many quotes at once. Row i is normalized[i].
+    """
+
+    __slots__ = ("normalized", "lead_time_hours", "core_due_date", "expiration_date", "warranty_months", "tagged_date")
+
+    def __init__(self, normalized: Sequence[NormalizedQuote]):
+        self.normalized = list(normalized)
+        self.lead_time_hours = np.array([_nan(n.lead_time_hours) for n in self.normalized], dtype=np.float64)
+        self.warranty_months = np.array([_nan(n.warranty_months) for n in self.normalized], dtype=np.float64)
+        self.core_due_date = _dates([n.core_due_date for n in self.normalized])
+        self.expiration_date = _dates([n.expiration_date for n in self.normalized])
+        self.tagged_date = _dates([n.tagged_date for n in self.normalized])
+
+    def __len__(self) -> int:
+        return len(self.normalized)
+
+    def by_lead_time(self) -> np.ndarray:
+        """Row order, fastest first; unknown lead times last."""
+        return np.argsort(self.lead_time_hours, kind="stable")
+
+    def valid_mask(self, as_of: date) -> np.ndarray:
+        """True where the quote hasn't expired (no expiry date counts as valid)."""
+        expiry = self.expiration_date
+        return np.isnat(expiry) | (expiry >= np.datetime64(as_of, "D"))
+
+    def take(self, rows: np.ndarray) -> list[NormalizedQuote]:
+        return [self.normalized[i] for i in rows.tolist()]
+
+
+def normalize_quotes(
+    quotes: QuoteSchema | Sequence[Quote],
+    received: date | None = None,
+    day_first: bool = False,
+) -> QuoteColumns:
+    """Normalize a whole extraction once; returns typed columns alongside the NormalizedQuote rows."""
+    items = quotes.quotes if isinstance(quotes, QuoteSchema) else quotes
+    columns = QuoteColumns([normalize_quote(q, received, day_first) for q in items])
+    info = _lead_time_hours.cache_info()
+    logger.debug(f"🧹 Normalized {len(columns)} quotes (lead-time parse cache {info.hits} hits / {info.misses} misses)")
+    return columns
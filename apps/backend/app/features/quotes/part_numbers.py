@@ -0,0 +1,27 @@
+# backend/app/features/quotes/part_numbers.py
+import re
+
+# Anything that isn't a letter or digit is formatting: "8061-536-001" == "8061 536 001" == "8061536001"
+_NON_ALNUM_RE = re.compile(r"[^0-9A-Z]+")
+# "P/N 8061-536-001 / 8061-536-002", "8061-536-001 or 8061-536-002", "A; B"
+# "or" only as a word of its own, so "A-OR-1" stays one part number
+_ALTERNATE_SPLIT_RE = re.compile(r"\s*[/;,]\s*|\s+or\s+", re.IGNORECASE)
+_PN_PREFIX_RE = re.compile(r"^\s*(?:P\s*/?\s*N|PN|PART\s*(?:NO|NUMBER)?)\s*[.:#]?\s*", re.IGNORECASE)
+# A "P/N" label further in ("A / P/N B") must not be split on its slash either
+_INNER_PN_RE = re.compile(r"\bP\s*/\s*N\b", re.IGNORECASE)
+
+
+def normalize_part_number(value: str | None) -> str:
+    """Canonical key for a part number: uppercase letters and digits only ('' if nothing left)."""
+    if not value:
+        return ""
+    return _NON_ALNUM_RE.sub("", _PN_PREFIX_RE.sub("", value).upper())
+
+
+def split_part_numbers(value: str | None) -> list[str]:
+    """Split 'A / B' style alternates into normalized part numbers, primary first, duplicates dropped."""
+    if not value:
+        return []
+    value = _INNER_PN_RE.sub("PN", _PN_PREFIX_RE.sub("", value))
+    parts = (normalize_part_number(p) for p in _ALTERNATE_SPLIT_RE.split(value))
+    return list(dict.fromkeys(p for p in parts if p))
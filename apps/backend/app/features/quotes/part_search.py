@@ -0,0 +1,293 @@
+# backend/app/features/quotes/part_search.py
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Iterable
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from app.features.quotes.part_numbers import normalize_part_number, split_part_numbers
+from app.schemas.quote import QuoteSchema
+from app.schemas.rfq import RFQ
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Trigram alphabet: 0 = past the end, 1..36 = 0-9A-Z, 37 = start padding
+_K = 38
+_PAD = 37
+_LUT = np.zeros(256, dtype=np.int64)
+for _i, _c in enumerate("0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ", start=1):
+    _LUT[ord(_c)] = _i
+MAX_KEY_LENGTH = 40
+
+REBUILD_PENDING = 5_000   # keys buffered before add() folds them into the trigram arrays
+RERANK = 40               # keys with the most shared trigrams, re-scored by prefix edit distance
+PREFIX_CANDIDATES = 50    # keys taken from the sorted prefix range
+
+
+class PartCandidate(BaseModel):
+    part_number: str = Field(..., description="Normalized part number.")
+    display: str = Field(..., description="Part number as first seen.")
+    distance: int = Field(..., description="Edits between the query and the closest prefix of the part number.")
+    score: float = Field(..., description="1.0 = exact match; lower for typos and longer completions.")
+    refs: list[str] = Field(default_factory=list, description="Where the part number appears, e.g. 'quote:<doc_id>'.")
+
+
+def _encode(keys: list[str], width: int) -> np.ndarray:
+    """(n, width + 2) trigram alphabet codes with two start-padding columns."""
+    raw = b"".join(k.encode("ascii", "ignore")[:width].ljust(width, b"\0") for k in keys)
+    arr = np.full((len(keys), width + 2), _PAD, dtype=np.int64)
+    arr[:, 2:] = _LUT[np.frombuffer(raw, dtype=np.uint8).reshape(len(keys), width)]
+    return arr
+
+
+def _grams(arr: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(row, gram code) pairs for every trigram that ends on a real character."""
+    grams = arr[:, :-2] * _K * _K + arr[:, 1:-1] * _K + arr[:, 2:]
+    rows, cols = np.nonzero(arr[:, 2:])
+    return rows, grams[rows, cols]
+
+
+def _merge(keys: list[str], offsets: np.ndarray, postings: np.ndarray, new_keys: list[str]) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """
+    Sorted `new_keys` (none already indexed) merged into the sorted key list and trigram postings.
+    Old key ids shift by the number of new keys sorted before them, so their postings are remapped
+    rather than rebuilt; only the new keys are encoded.
+    """
+    ins = np.array([bisect_left(keys, k) for k in new_keys], dtype=np.int64)
+    if keys:
+        merged: list[str] = []
+        prev = 0
+        for key, pos in zip(new_keys, ins.tolist()):
+            merged.extend(keys[prev:pos])
+            merged.append(key)
+            prev = pos
+        merged.extend(keys[prev:])
+    else:
+        merged = list(new_keys)
+    n = len(merged)
+    old_ids = postings.astype(np.int64)
+    old_ids += np.searchsorted(ins, old_ids, side="right")
+    old_grams = np.repeat(np.arange(_K ** 3, dtype=np.int64), np.diff(offsets))
+    rows, grams = _grams(_encode(new_keys, min(MAX_KEY_LENGTH, max(len(k) for k in new_keys))))
+    # One posting per (gram, key); sorting the packed pair groups by gram, then key
+    packed = np.sort(np.concatenate([old_grams * n + old_ids, grams * n + ins[rows] + rows]))
+    packed = packed[np.r_[True, packed[1:] != packed[:-1]]]
+    gram_of = packed // n
+    return merged, np.searchsorted(gram_of, np.arange(_K ** 3 + 1)).astype(np.int64), (packed % n).astype(np.int32)
+
+
+def _key_grams(key: str) -> set[str]:
+    """Trigrams of a key with the same start padding and length cap as the trigram arrays."""
+    padded = "  " + key[:MAX_KEY_LENGTH]
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def prefix_edit_distance(query: str, candidate: str, limit: int | None = None) -> int:
+    """
+    Smallest optimal-string-alignment distance between `query` and any prefix of `candidate`,
+    so '8061-53' is 0 edits from '8061536001' and '806153601' is 1 edit from it.
+    With `limit`, stops early and returns limit + 1 once every alignment is already further off.
+    """
+    m = len(query)
+    candidate = candidate[: m + 3]  # longer prefixes can't be closer
+    prev2: list[int] | None = None
+    prev = list(range(len(candidate) + 1))
+    for i in range(1, m + 1):
+        cur = [i] + [0] * len(candidate)
+        qc = query[i - 1]
+        for j in range(1, len(candidate) + 1):
+            # Comparisons instead of min(): this loop is most of a search's time
+            best = prev[j - 1] if qc == candidate[j - 1] else prev[j - 1] + 1
+            if prev[j] + 1 < best:
+                best = prev[j] + 1
+            if cur[j - 1] + 1 < best:
+                best = cur[j - 1] + 1
+            if prev2 is not None and j > 1 and qc == candidate[j - 2] and query[i - 2] == candidate[j - 1] and prev2[j - 2] + 1 < best:
+                best = prev2[j - 2] + 1
+            cur[j] = best
+        if limit is not None and min(cur) > limit and (prev2 is None or min(prev) > limit):
+            return limit + 1
+        prev2, prev = prev, cur
+    return min(prev)
+
+
+class PartNumberIndex:
+    """
+    Typeahead and typo-tolerant part-number lookup.
+    - Keys are normalized (formatting dropped) and stored sorted, so prefix matches are a binary search.
+    - A trigram inverted index (CSR numpy arrays) finds keys sharing most trigrams with a mistyped query;
+      the best of those are re-ranked by prefix edit distance.
+    - add() buffers new keys and folds them in on the next rebuild, so extractions can stream in.
+      Rebuilds run on a background thread and swap the new arrays in, so neither add() nor search() waits on them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()          # guards the fields below; held only for swaps and lookups
+        self._build_lock = threading.Lock()    # one build at a time
+        self._rebuilding = False               # a background build is queued or running
+        self._keys: list[str] = []             # sorted; position = key id in the trigram arrays
+        self._offsets = np.zeros(_K ** 3 + 1, dtype=np.int64)
+        self._postings = np.zeros(0, dtype=np.int32)
+        self._pending: set[str] = set()
+        self._pending_grams: dict[str, set[str]] = {}  # trigram -> pending keys, until the next build
+        self._display: dict[str, str] = {}
+        self._refs: dict[str, list[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._display)
+
+    # ---------- Writes ----------
+    def _add(self, part_number: str | None, ref: str | None) -> list[str]:
+        keys = split_part_numbers(part_number)
+        for key in keys:
+            if key not in self._display:
+                self._display[key] = part_number if part_number and len(keys) == 1 else key
+                self._pending.add(key)
+                for gram in _key_grams(key):
+                    self._pending_grams.setdefault(gram, set()).add(key)
+            if ref is not None:
+                refs = self._refs.setdefault(key, [])
+                if ref not in refs:
+                    refs.append(ref)
+        return keys
+
+    def add(self, part_number: str | None, ref: str | None = None) -> list[str]:
+        """Index a raw part number (slash-separated alternates are split). Returns the normalized keys."""
+        with self._lock:
+            keys = self._add(part_number, ref)
+            rebuild = len(self._pending) >= REBUILD_PENDING and not self._rebuilding
+            if rebuild:
+                self._rebuilding = True
+        if rebuild:
+            threading.Thread(target=self._background_build, name="part-index-build", daemon=True).start()
+        return keys
+
+    def add_many(self, items: Iterable[tuple[str | None, str | None]]) -> None:
+        """Bulk load (e.g. a whole catalogue) with a single rebuild at the end."""
+        with self._lock:
+            for part_number, ref in items:
+                self._add(part_number, ref)
+        self.build()
+
+    def add_quotes(self, doc_id: str, extraction: QuoteSchema) -> None:
+        for quote in extraction.quotes:
+            self.add(quote.part.part_number, f"quote:{doc_id}")
+            self.add(quote.part.alt_part_number, f"quote:{doc_id}")
+
+    def add_rfq(self, rfq_id: str, rfq: RFQ) -> None:
+        self.add(rfq.part.part_number, f"rfq:{rfq_id}")
+        self.add(rfq.part.alt_part_number, f"rfq:{rfq_id}")
+
+    def build(self) -> None:
+        """
+        Fold pending keys into the sorted key list and trigram postings. The merged arrays are built
+        outside `_lock` and swapped in; keys added meanwhile stay pending until the next build.
+        """
+        with self._build_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                folded = list(self._pending)
+                keys, offsets, postings = self._keys, self._offsets, self._postings
+            folded.sort()
+            keys, offsets, postings = _merge(keys, offsets, postings, folded)
+            with self._lock:
+                self._keys, self._offsets, self._postings = keys, offsets, postings
+                self._pending.difference_update(folded)
+                for key in folded:
+                    for gram in _key_grams(key):
+                        pending = self._pending_grams.get(gram)
+                        if pending is not None:
+                            pending.discard(key)
+                            if not pending:
+                                del self._pending_grams[gram]
+        logger.info(f"🔎 Part-number index built: {len(keys)} keys, {postings.shape[0]} trigram postings")
+
+    def _background_build(self) -> None:
+        try:
+            self.build()
+        except Exception as e:
+            logger.error(f"❌ Part-number index build failed: {e}")
+        finally:
+            with self._lock:
+                self._rebuilding = False
+
+    # ---------- Reads ----------
+    @staticmethod
+    def _gram_candidates(query: str, offsets: np.ndarray, postings: np.ndarray, max_distance: int) -> list[int]:
+        """Key ids sharing the most trigrams with the query."""
+        arr = _encode([query], min(MAX_KEY_LENGTH, len(query)))
+        _, grams = _grams(arr)
+        grams = np.unique(grams)
+        starts, ends = offsets[grams], offsets[grams + 1]
+        if not np.any(ends > starts):
+            return []
+        hits = np.concatenate([postings[s:e] for s, e in zip(starts.tolist(), ends.tolist()) if e > s])
+        # Sorting only the hits stays proportional to the postings touched, not to the key count
+        ids, counts = np.unique(hits, return_counts=True)
+        # An edit breaks at most 4 trigrams (a transposition), so closer keys can't share fewer than this
+        keep = counts >= max(1, len(grams) - 4 * max_distance)
+        ids, counts = ids[keep], counts[keep]
+        if ids.shape[0] > RERANK:
+            ids = ids[np.argpartition(-counts, RERANK - 1)[:RERANK]]
+        return ids.tolist()
+
+    def search(self, query: str, k: int = 10, max_distance: int = 2) -> list[PartCandidate]:
+        """Ranked candidates for a partial or mistyped part number."""
+        q = normalize_part_number(query)
+        if not q or k <= 0:
+            return []
+        limit = min(max_distance, max(0, len(q) // 3))  # short queries only tolerate what their length allows
+        q_grams = _key_grams(q)
+        shared: Counter = Counter()
+        with self._lock:
+            keys, offsets, postings = self._keys, self._offsets, self._postings
+            for gram in q_grams:
+                shared.update(self._pending_grams.get(gram, ()))
+
+        candidates: set[str] = set()
+        start = bisect_left(keys, q)
+        for key in keys[start:start + PREFIX_CANDIDATES]:
+            if not key.startswith(q):
+                break
+            candidates.add(key)
+        if len(candidates) < k and postings.shape[0]:
+            candidates.update(keys[i] for i in self._gram_candidates(q, offsets, postings, limit))
+        # Keys not yet in the trigram arrays, by the same shared-trigram bound
+        min_shared = max(1, len(q_grams) - 4 * limit)
+        candidates.update(key for key, n in shared.items() if n >= min_shared)
+
+        scored: list[tuple[int, int, str]] = []
+        for key in candidates:
+            d = 0 if key.startswith(q) else prefix_edit_distance(q, key, limit)
+            if d <= limit:
+                scored.append((d, abs(len(key) - len(q)), key))
+        scored.sort()
+
+        out = []
+        for d, extra, key in scored[:k]:
+            score = (1 - d / max(len(q), 1)) / (1 + extra / max(len(q), 1))
+            out.append(PartCandidate(
+                part_number=key,
+                display=self._display.get(key, key),
+                distance=d,
+                score=round(score, 4),
+                refs=list(self._refs.get(key, [])),
+            ))
+        return out
+
+
+_indexes: dict[str, PartNumberIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_org_part_index(org_id: str) -> PartNumberIndex:
+    """Process-wide PartNumberIndex per org."""
+    with _indexes_lock:
+        index = _indexes.get(org_id)
+        if index is None:
+            index = _indexes[org_id] = PartNumberIndex()
+        return index
@@ -0,0 +1,21 @@
+"""
+Vendor entity resolution across extracted documents.
+"""
+
+from .resolution import (
+    VendorCluster,
+    VendorResolver,
+    email_domain,
+    get_org_vendor_resolver,
+    normalize_vendor_name,
+    phone_key,
+)
+
+__all__ = [
+    "VendorCluster",
+    "VendorResolver",
+    "email_domain",
+    "get_org_vendor_resolver",
+    "normalize_vendor_name",
+    "phone_key",
+]
@@ -0,0 +1,272 @@
+# backend/app/features/vendors/resolution.py
+import re
+import threading
+from collections import Counter
+from typing import Iterable
+
+from pydantic import BaseModel, Field
+
+from app.schemas.vendor import Vendor
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Dropped before comparing names: "Lufthansa Technik AG" == "LUFTHANSA TECHNIK"
+LEGAL_SUFFIXES = frozenset({
+    "ag", "bv", "co", "company", "corp", "corporation", "gmbh", "inc", "incorporated", "kg", "limited",
+    "llc", "ltd", "nv", "oy", "plc", "pte", "pty", "sa", "sas", "sarl", "spa", "srl", "the", "and",
+})
+# Shared mailbox providers say nothing about which company a contact works for
+FREE_EMAIL_DOMAINS = frozenset({
+    "gmail.com", "googlemail.com", "yahoo.com", "hotmail.com", "outlook.com", "live.com", "aol.com",
+    "icloud.com", "gmx.de", "gmx.net", "web.de", "mail.com", "protonmail.com", "yandex.ru",
+})
+
+MAX_BLOCK_SIZE = 50      # clusters per block; blocks spanning more (e.g. the token "aviation") stop producing candidates
+MATCH_THRESHOLD = 0.8
+REPS_PER_CLUSTER = 2     # distinct spellings a block keeps per cluster
+PHONE_DIGITS = 8         # trailing digits compared, so "+49 89 9797-0" and "089 9797 0" share a key
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_DOMAIN_RE = re.compile(r"@([a-z0-9.-]+\.[a-z]{2,})")
+
+
+class VendorCluster(BaseModel):
+    vendor_id: str = Field(..., description="Canonical vendor id; stable as clusters merge (oldest wins).")
+    name: str | None = Field(None, description="Most frequent spelling.")
+    names: list[str] = Field(default_factory=list)
+    email_domains: list[str] = Field(default_factory=list)
+    phones: list[str] = Field(default_factory=list)
+    mentions: int = 0
+
+
+class _Signature:
+    """Normalized comparison fields of one distinct vendor spelling."""
+
+    __slots__ = ("name", "tokens", "numbers", "grams", "domain", "phone")
+
+    def __init__(self, name: str, domain: str | None, phone: str | None):
+        self.name = name
+        self.tokens = frozenset(name.split())
+        self.numbers = frozenset(t for t in self.tokens if any(c.isdigit() for c in t))
+        padded = f"  {name} "
+        self.grams = frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+        self.domain = domain
+        self.phone = phone
+
+    @property
+    def key(self) -> tuple[str, str | None, str | None]:
+        return (self.name, self.domain, self.phone)
+
+
+def normalize_vendor_name(name: str | None) -> str:
+    """'Lufthansa Technik AG' -> 'lufthansa technik'."""
+    if not name:
+        return ""
+    words = _WORD_RE.findall(name.casefold().replace("&", " and "))
+    kept = [w for w in words if w not in LEGAL_SUFFIXES]
+    return " ".join(kept or words)
+
+
+def email_domain(email: str | None) -> str | None:
+    if not email:
+        return None
+    match = _DOMAIN_RE.search(email.lower())
+    if not match:
+        return None
+    domain = match.group(1).removeprefix("www.")
+    return None if domain in FREE_EMAIL_DOMAINS else domain
+
+
+def phone_key(phone: str | None) -> str | None:
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-PHONE_DIGITS:] if len(digits) >= 7 else None
+
+
+def _similarity(a: _Signature, b: _Signature) -> float:
+    """Name similarity (best of token Jaccard and trigram Dice) adjusted by contact evidence."""
+    if a.tokens and b.tokens:
+        jaccard = len(a.tokens & b.tokens) / len(a.tokens | b.tokens)
+        dice = 2 * len(a.grams & b.grams) / (len(a.grams) + len(b.grams))
+        score = max(jaccard, dice)
+        if a.numbers != b.numbers:  # "Hangar 3 Services" vs "Hangar 4 Services"
+            score -= 0.3
+    else:
+        score = 0.0
+    if a.domain and b.domain:
+        score += 0.35 if a.domain == b.domain else -0.25
+    if a.phone and b.phone:
+        score += 0.3 if a.phone == b.phone else -0.05
+    return score
+
+
+class VendorResolver:
+    """
+    Incremental entity resolution for vendor mentions.
+    - Identical normalized (name, email domain, phone) mentions share one signature and are never re-scored.
+    - Candidates come first from clusters already using the exact normalized name, then from blocks:
+      same email domain, same phone key, or a shared name token. A block keeps a few representative
+      spellings per cluster, so a supplier seen thousands of times fills one slot; blocks spanning
+      too many clusters are dropped, so work per mention stays bounded instead of O(n).
+    - Matches are merged with union-find; a cluster keeps the id of its oldest signature.
+    """
+
+    def __init__(self, threshold: float = MATCH_THRESHOLD):
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._signatures: list[_Signature] = []
+        self._by_key: dict[tuple, int] = {}
+        self._by_name: dict[str, dict[int, list[int]]] = {}  # normalized name -> {cluster root: signatures}
+        self._blocks: dict[str, dict[int, list[int]]] = {}   # block key -> {cluster root: representative signatures}
+        self._parent: list[int] = []
+        self._names: list[Counter] = []  # per signature: raw spellings seen
+        self._mentions: list[int] = []
+
+    def __len__(self) -> int:
+        return sum(self._mentions)
+
+    # ---------- Union-find ----------
+    def _find(self, i: int) -> int:
+        root = i
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[i] != root:
+            self._parent[i], i = root, self._parent[i]
+        return root
+
+    def _union(self, a: int, b: int) -> int:
+        a, b = self._find(a), self._find(b)
+        if a == b:
+            return a
+        if b < a:
+            a, b = b, a
+        self._parent[b] = a  # older signature stays the root
+        return a
+
+    @staticmethod
+    def vendor_id(root: int) -> str:
+        return f"vnd_{root:06d}"
+
+    # ---------- Resolution ----------
+    def _block_keys(self, sig: _Signature) -> list[str]:
+        keys = [f"t:{t}" for t in sig.tokens if len(t) > 1]
+        if len(sig.name) >= 4:
+            keys.append(f"n:{sig.name[:4]}")  # catches typos in every token of short names
+        if sig.domain:
+            keys.append(f"d:{sig.domain}")
+        if sig.phone:
+            keys.append(f"p:{sig.phone}")
+        return keys
+
+    def _resolve(self, vendor: Vendor | None = None, name: str | None = None, email: str | None = None, phone: str | None = None) -> str | None:
+        if vendor is not None:
+            name = name or vendor.vendor_name
+            email = email or vendor.vendor_contact_email
+            phone = phone or vendor.vendor_contact_phone
+        sig = _Signature(normalize_vendor_name(name), email_domain(email), phone_key(phone))
+        if not sig.name and not sig.domain and not sig.phone:
+            return None
+
+        i = self._by_key.get(sig.key)
+        if i is None:
+            i = len(self._signatures)
+            self._signatures.append(sig)
+            self._by_key[sig.key] = i
+            self._parent.append(i)
+            self._names.append(Counter())
+            self._mentions.append(0)
+
+            keys = self._block_keys(sig)
+            candidates: dict[int, None] = {}
+            for reps in self._by_name.get(sig.name, {}).values() if sig.name else ():
+                candidates.update(dict.fromkeys(reps))
+            for key in keys:
+                members = self._blocks.get(key)
+                if members is not None and len(members) <= MAX_BLOCK_SIZE:
+                    for reps in members.values():
+                        candidates.update(dict.fromkeys(reps))
+            for j in candidates:
+                if self._find(j) != self._find(i) and _similarity(sig, self._signatures[j]) >= self.threshold:
+                    self._union(i, j)
+            root = self._find(i)
+            if sig.name:
+                self._add_member(self._by_name.setdefault(sig.name, {}), root, i)
+            for key in keys:
+                self._add_member(self._blocks.setdefault(key, {}), root, i)
+
+        if name:
+            self._names[i][name.strip()] += 1
+        self._mentions[i] += 1
+        return self.vendor_id(self._find(i))
+
+    def _add_member(self, members: dict[int, list[int]], root: int, i: int) -> None:
+        """Keep up to REPS_PER_CLUSTER spellings per cluster; roots merged away since are folded in first."""
+        if root not in members and len(members) >= MAX_BLOCK_SIZE:
+            folded: dict[int, list[int]] = {}
+            for r, reps in members.items():
+                kept = folded.setdefault(self._find(r), [])
+                kept.extend(reps[: REPS_PER_CLUSTER - len(kept)])
+            members.clear()
+            members.update(folded)
+            if root not in members and len(members) > MAX_BLOCK_SIZE:
+                return  # already too broad to produce candidates
+        reps = members.setdefault(root, [])
+        name = self._signatures[i].name
+        if len(reps) < REPS_PER_CLUSTER and all(self._signatures[j].name != name for j in reps):
+            reps.append(i)
+
+    def resolve(self, vendor: Vendor | None = None, name: str | None = None, email: str | None = None, phone: str | None = None) -> str | None:
+        """Canonical vendor id for one mention (a Vendor, or loose name/email/phone fields); None if empty."""
+        with self._lock:
+            return self._resolve(vendor, name, email, phone)
+
+    def resolve_many(self, vendors: Iterable[Vendor]) -> list[str | None]:
+        with self._lock:
+            ids = [self._resolve(v) for v in vendors]
+            clusters = self._cluster_count()
+        logger.info(f"🏷️ Resolved {len(ids)} vendor mentions into {clusters} vendors")
+        return ids
+
+    def canonical(self, vendor_id: str) -> str:
+        """Current id for an id handed out earlier (clusters may have merged since)."""
+        with self._lock:
+            return self.vendor_id(self._find(int(vendor_id.removeprefix("vnd_"))))
+
+    # ---------- Clusters ----------
+    def _cluster_count(self) -> int:
+        return sum(1 for i in range(len(self._parent)) if self._find(i) == i)
+
+    def cluster_count(self) -> int:
+        with self._lock:
+            return self._cluster_count()
+
+    def clusters(self) -> list[VendorCluster]:
+        with self._lock:
+            members: dict[int, list[int]] = {}
+            for i in range(len(self._signatures)):
+                members.setdefault(self._find(i), []).append(i)
+            out = []
+            for root, sigs in members.items():
+                names = sum((self._names[i] for i in sigs), Counter())
+                out.append(VendorCluster(
+                    vendor_id=self.vendor_id(root),
+                    name=names.most_common(1)[0][0] if names else None,
+                    names=[n for n, _ in names.most_common()],
+                    email_domains=sorted({d for i in sigs if (d := self._signatures[i].domain)}),
+                    phones=sorted({p for i in sigs if (p := self._signatures[i].phone)}),
+                    mentions=sum(self._mentions[i] for i in sigs),
+                ))
+        return out
+
+
+_resolvers: dict[str, VendorResolver] = {}
+_resolvers_lock = threading.Lock()
+
+
+def get_org_vendor_resolver(org_id: str) -> VendorResolver:
+    """Process-wide VendorResolver per org."""
+    with _resolvers_lock:
+        resolver = _resolvers.get(org_id)
+        if resolver is None:
+            resolver = _resolvers[org_id] = VendorResolver()
+        return resolver
@@ -1,6 +1,17 @@
-from .update_extractors import update_extractor_agents
+# The LlamaCloud SDKs are slow to import and only the admin extractor-update route needs them,
+# so they load on first attribute access instead of with the package.
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+  from .update_extractors import update_extractor_agents
 
 __all__ = [
   "update_extractor_agents",
 ]
 
+
+def __getattr__(name: str):
+  if name == "update_extractor_agents":
+    from .update_extractors import update_extractor_agents
+    return update_extractor_agents
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
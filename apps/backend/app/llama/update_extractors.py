@@ -1,8 +1,7 @@
-import os
-from dotenv import load_dotenv
 from typing import Any
 from llama_cloud_services import LlamaExtract
 from llama_cloud import ChunkMode, ExtractConfig, ExtractMode, ExtractTarget
+from app.config import ai_config
 from app.utils import get_logger
 # Specialized Schemas
 from app.schemas.contract import Contract
@@ -16,8 +15,6 @@ from app.llama.extractor_system_prompts import (
     RFQ_EXTRACTOR_SYSTEM_PROMPT,
 )
 
-load_dotenv()
-
 logger = get_logger(__name__)
 
 LLAMA_CONTRACT_EXTRACTOR_AGENT_NAME = "fleet-ai-contract-extractor"
@@ -80,14 +77,11 @@ def update_extractor_agents() -> list[Any]:
 
     logger.info("✨ Entered update_extractor_agents function...")
 
-    llama_cloud_api_key = os.getenv("LLAMA_CLOUD_API_KEY")
-    llama_organization_id = os.getenv("LLAMA_ORGANIZATION_ID")
-    llama_extract_project_id = os.getenv("LLAMA_EXTRACT_PROJECT_ID")
-
     extractor = LlamaExtract(
-        api_key=llama_cloud_api_key,
-        organization_id=llama_organization_id,
-        project_id=llama_extract_project_id,
+        api_key=ai_config.llama.cloud_api_key,
+        base_url=ai_config.llama.base_url,
+        organization_id=ai_config.llama.organization_id,
+        project_id=ai_config.llama.extract_project_id,
     )
 
     updated_agents = []
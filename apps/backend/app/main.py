@@ -1,18 +1,16 @@
 # app/main.py
 
-import dotenv
 import os
 
-dotenv.load_dotenv()
-
+# app.config loads .env (the only place that does), so import it before anything reads the environment
+from app.config import ai_config, db_config, profiling_config
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.router import api_router
 from app.utils import get_logger
-import os
-from app.config import ai_config
 from contextlib import asynccontextmanager
 from app.services.clerk_service import _get_jwks
+from app.db.session import init_engine, dispose_engine
 
 # Initialize logger
 logger = get_logger(__name__)
@@ -22,10 +20,15 @@ async def lifespan(app: FastAPI):
     # --- startup ---
     await _get_jwks()
     logger.info("Clerk JWKS warm-up successful")
+    if db_config.configured:
+        await init_engine(db_config)
+    else:
+        logger.warning("DATABASE_URL not set, database features are disabled")
     yield
     # --- shutdown ---
     # nothing to close if you use per-call httpx clients
     # (if you add a shared http client, close it here)
+    await dispose_engine()
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application"""
@@ -54,6 +57,13 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Per-request profiling for admins; not installed at all unless enabled
+    if profiling_config.enabled:
+        from app.core.profiling import ProfilingMiddleware
+
+        app.add_middleware(ProfilingMiddleware, settings=profiling_config)
+        logger.info(f"🔬 Request profiling enabled (header {profiling_config.header}, sample rate {profiling_config.sample_rate})")
+
     # Validate configuration before routers are included (fails fast if misconfigured)
     ai_config.validate()
     app.state.ai_config = ai_config
@@ -77,20 +87,7 @@ app = create_app()
 
 
 if __name__ == "__main__":
-    import uvicorn
-    
-    # Get server configuration from environment variables
-    host = os.getenv("HOST", "0.0.0.0")
-    port = int(os.getenv("PORT", "8000"))
-    reload = os.getenv("RELOAD", "true").lower() == "true"
-    log_level = os.getenv("LOG_LEVEL", "info")
-    
-    logger.info(f"🚀 Starting Fleet AI Backend Server on {host}:{port}")
-    
-    uvicorn.run(
-        "main:app",
-        host=host,
-        port=port,
-        reload=reload,
-        log_level=log_level
-    )
+    # Launch modes (development reload vs. production workers) live in app.serve
+    from app.serve import main
+
+    main()
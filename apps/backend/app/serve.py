@@ -0,0 +1,86 @@
+# backend/app/serve.py
+"""
+Launch the API.
+
+    python -m app.serve                       # SERVE_MODE (development by default): one process, auto-reload
+    SERVE_MODE=production python -m app.serve # one worker per core, no reload
+    python -m app.serve --production --workers 8
+
+Production runs uvicorn's process supervisor: `kill -HUP <pid>` restarts workers one at a time
+(rolling, in-flight requests get GRACEFUL_TIMEOUT seconds), `kill -TTIN`/`-TTOU` adds/removes a
+worker, and crashed workers are replaced. Before the workers start, the supervisor clears expired
+shared-cache entries and fetches the Clerk JWKS once, so every worker starts warm.
+"""
+import argparse
+import asyncio
+
+import uvicorn
+
+from app.config import server_config
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+APP = "app.main:app"
+
+
+def _warm_shared_cache() -> None:
+    from app.services.shared_cache import get_shared_cache
+    from app.services.clerk_service import _get_jwks
+
+    get_shared_cache().purge()
+    try:
+        asyncio.run(_get_jwks())
+        logger.info("🔑 Clerk JWKS cached for all workers")
+    except Exception as e:  # workers retry on their own startup
+        logger.warning(f"⚠️ JWKS pre-warm failed, workers will fetch it: {e}")
+
+
+def run_production() -> None:
+    workers = server_config.effective_workers
+    if server_config.shared_cache_path is None and workers > 1:
+        logger.warning("⚠️ SHARED_CACHE_DIR is off: every worker warms its own caches")
+    _warm_shared_cache()
+    logger.info(f"🚀 Starting Fleet AI Backend on {server_config.host}:{server_config.port} with {workers} workers")
+    uvicorn.run(
+        APP,
+        host=server_config.host,
+        port=server_config.port,
+        workers=workers,
+        reload=False,
+        log_level=server_config.log_level,
+        timeout_graceful_shutdown=server_config.graceful_timeout,
+        timeout_keep_alive=server_config.keep_alive,
+        limit_max_requests=server_config.max_requests,
+        proxy_headers=True,
+    )
+
+
+def run_development() -> None:
+    logger.info(f"🚀 Starting Fleet AI Backend Server on {server_config.host}:{server_config.port}")
+    uvicorn.run(
+        APP,
+        host=server_config.host,
+        port=server_config.port,
+        reload=server_config.reload,
+        log_level=server_config.log_level,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--production", action="store_true", help="Same as SERVE_MODE=production.")
+    parser.add_argument("--workers", type=int, help="Overrides WEB_CONCURRENCY.")
+    args = parser.parse_args()
+    if args.production:
+        server_config.mode = "production"
+    if args.workers is not None:
+        server_config.workers = args.workers
+    if server_config.production:
+        run_production()
+    else:
+        run_development()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,11 @@ Provides business logic services for various application features.
 """
 
 from .clerk_service import verify_clerk_jwt
+from .shared_cache import SharedCache, get_shared_cache
 
 
 __all__ = [
-    "verify_clerk_jwt"
+    "verify_clerk_jwt",
+    "SharedCache",
+    "get_shared_cache",
     ]
\ No newline at end of file
@@ -1,10 +1,12 @@
 # backend/services/clerk_service.py
-import os, time, json, logging
+import asyncio, copy, hashlib, os, time, json, logging
 from typing import Optional, Dict, Any
 import httpx
 import jwt
 from jwt import InvalidTokenError
 
+from app.services.shared_cache import SharedCache, get_shared_cache
+
 logger = logging.getLogger(__name__)
 
 def _get_clerk_config():
@@ -20,23 +22,60 @@ def _get_clerk_config():
     
     return CLERK_ISSUER, CLERK_JWKS_URL, BACKEND_AUD
 
+JWKS_TTL = 600          # seconds a fetched key set is trusted
+TOKEN_CACHE_TTL = 300   # upper bound on how long a verified token is remembered (exp is the real bound)
+
 _jwks_cache: Dict[str, Any] = {"keys": [], "fetched_at": 0}
+_jwks_lock = asyncio.Lock()
+# Verified tokens stay in this worker's memory: a SQLite round trip per request on the event loop
+# could stall every request behind a busy writer, and a miss only costs one RSA check per worker
+_token_cache = SharedCache(None)
+
+async def _fetch_jwks(url: str) -> Dict[str, Any]:
+    async with httpx.AsyncClient(timeout=3.0) as client:
+        resp = await client.get(url)
+        resp.raise_for_status()
+        data = resp.json()
+    return {"keys": data.get("keys", []), "fetched_at": int(time.time())}
 
 async def _get_jwks() -> Dict[str, Any]:
+    """
+    JWKS from the shared cache; on a miss one worker fetches while the others wait for its result.
+    Shared cache calls run in the threadpool, since a busy SQLite writer can block them for seconds.
+    """
     _, CLERK_JWKS_URL, _ = _get_clerk_config()
     now = int(time.time())
-    if now - _jwks_cache["fetched_at"] > 600 or not _jwks_cache["keys"]:
-        async with httpx.AsyncClient(timeout=3.0) as client:
-            resp = await client.get(CLERK_JWKS_URL)
-            resp.raise_for_status()
-            data = resp.json()
-        _jwks_cache["keys"] = data.get("keys", [])
-        _jwks_cache["fetched_at"] = now
+    if _jwks_cache["keys"] and now - _jwks_cache["fetched_at"] <= JWKS_TTL:
+        return _jwks_cache
+    cache = get_shared_cache()
+    key = f"jwks:{CLERK_JWKS_URL}"
+    async with _jwks_lock:
+        for attempt in range(30):
+            cached = await asyncio.to_thread(cache.get, key)
+            if cached and cached["keys"]:
+                _jwks_cache.update(cached)
+                return _jwks_cache
+            if await asyncio.to_thread(cache.acquire, key, 10) or attempt == 29:
+                break
+            await asyncio.sleep(0.1)  # another worker is fetching
+        try:
+            jwks = await _fetch_jwks(CLERK_JWKS_URL)
+            await asyncio.to_thread(cache.set, key, jwks, JWKS_TTL)
+            _jwks_cache.update(jwks)
+        finally:
+            await asyncio.to_thread(cache.release, key)
     return _jwks_cache
 
+def _token_key(session_token: str) -> str:
+    return "jwt:" + hashlib.sha256(session_token.encode()).hexdigest()
+
 async def verify_clerk_jwt(session_token: str) -> Optional[Dict[str, Any]]:
     if not session_token:
         return None
+    token_key = _token_key(session_token)
+    verified = _token_cache.get(token_key)
+    if verified is not None:
+        return copy.deepcopy(verified)  # callers may mutate claims
     try:
         CLERK_ISSUER, _, BACKEND_AUD = _get_clerk_config()
         
@@ -66,7 +105,12 @@ async def verify_clerk_jwt(session_token: str) -> Optional[Dict[str, Any]]:
             leeway=60,
         )
 
-        return {"sub": claims.get("sub"), "sid": claims.get("sid"), "orgId": claims.get("orgId"), "claims": claims}
+        verified = {"sub": claims.get("sub"), "sid": claims.get("sid"), "orgId": claims.get("orgId"), "claims": claims}
+        # Remember the result until the token expires, so this worker's next requests skip the RSA check
+        ttl = min(TOKEN_CACHE_TTL, claims.get("exp", 0) - time.time())
+        if ttl > 0:
+            _token_cache.set(token_key, copy.deepcopy(verified), ttl=ttl)
+        return verified
 
     except InvalidTokenError as e:
         logger.warning(f"JWT invalid: {e}")
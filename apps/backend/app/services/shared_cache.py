@@ -0,0 +1,182 @@
+# backend/app/services/shared_cache.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from app.utils import get_logger
+
+logger = get_logger(__name__)
+
+PURGE_EVERY = 500        # writes between sweeps of expired rows
+LOCAL_MAX_ENTRIES = 10_000
+
+
+class SharedCache:
+    """
+    Read-mostly key/value tier shared by every worker process on the host.
+    - Backed by one SQLite file in WAL mode (on /dev/shm by default), so a value fetched or computed
+      by one worker is a local read for the others and survives worker restarts.
+    - Each process keeps the decoded values it has read in memory until they expire, so hot keys
+      (JWKS, a user's session token) cost a dict lookup after the first hit.
+    - acquire()/release() give a cross-process lease, so only one worker refreshes a missing key.
+    Values are JSON. With path=None the cache is process-local only.
+    """
+
+    def __init__(self, path: str | None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._local: dict[str, tuple[Any, float]] = {}  # key -> (value, expires_at)
+        self._conn: sqlite3.Connection | None = None
+        self._pid = 0
+        self._writes = 0
+
+    def _db(self) -> sqlite3.Connection | None:
+        if self.path is None:
+            return None
+        if self._conn is None or self._pid != os.getpid():  # never reuse a connection across fork
+            try:
+                conn = sqlite3.connect(self.path, timeout=2.0, isolation_level=None, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=OFF")  # cache contents are disposable
+                conn.execute("CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Shared cache at {self.path} unavailable, using process memory only: {e}")
+                self.path = None
+                return None
+            self._conn, self._pid = conn, os.getpid()
+            self._local.clear()
+        return self._conn
+
+    # ---------- Reads ----------
+    def get(self, key: str, default: Any = None) -> Any:
+        now = time.time()
+        with self._lock:
+            hit = self._local.get(key)
+            if hit is not None and hit[1] > now:
+                return hit[0]
+            db = self._db()
+            if db is None:
+                return default
+            try:
+                row = db.execute("SELECT value, expires_at FROM kv WHERE key = ? AND expires_at > ?", (key, now)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Shared cache read failed for {key}: {e}")
+                return default
+            if row is None:
+                return default
+            value = json.loads(row[0])
+            self._remember(key, value, row[1])
+            return value
+
+    def keys(self, prefix: str) -> list[str]:
+        """Live keys starting with `prefix`, sorted."""
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            if db is None:
+                return sorted(k for k, (_, exp) in self._local.items() if k.startswith(prefix) and exp > now)
+            try:
+                rows = db.execute(
+                    "SELECT key FROM kv WHERE key >= ? AND key < ? AND expires_at > ? ORDER BY key",
+                    (prefix, prefix + "\U0010ffff", now),
+                ).fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Shared cache scan failed for {prefix}: {e}")
+                return []
+            return [r[0] for r in rows]
+
+    # ---------- Writes ----------
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._remember(key, value, expires_at)
+            db = self._db()
+            if db is None:
+                return
+            try:
+                db.execute(
+                    "INSERT INTO kv (key, value, expires_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at",
+                    (key, json.dumps(value, separators=(",", ":")), expires_at),
+                )
+                self._writes += 1
+                if self._writes % PURGE_EVERY == 0:
+                    self._purge(db)
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Shared cache write failed for {key}: {e}")
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._local.pop(key, None)
+            db = self._db()
+            if db is not None:
+                try:
+                    db.execute("DELETE FROM kv WHERE key = ?", (key,))
+                except sqlite3.Error as e:
+                    logger.warning(f"⚠️ Shared cache delete failed for {key}: {e}")
+
+    def _remember(self, key: str, value: Any, expires_at: float) -> None:
+        if len(self._local) >= LOCAL_MAX_ENTRIES:
+            now = time.time()
+            self._local = {k: v for k, v in self._local.items() if v[1] > now}
+            if len(self._local) >= LOCAL_MAX_ENTRIES:
+                self._local.clear()
+        self._local[key] = (value, expires_at)
+
+    def _purge(self, db: sqlite3.Connection) -> None:
+        removed = db.execute("DELETE FROM kv WHERE expires_at <= ?", (time.time(),)).rowcount
+        if removed:
+            logger.debug(f"🧹 Purged {removed} expired shared cache entries")
+
+    def purge(self) -> None:
+        """Drop expired entries (the supervisor calls this once before starting workers)."""
+        with self._lock:
+            db = self._db()
+            if db is not None:
+                self._purge(db)
+
+    # ---------- Cross-process lease ----------
+    def acquire(self, name: str, ttl: float) -> bool:
+        """True if this process now holds lease `name` (held until release() or `ttl` seconds pass)."""
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            if db is None:
+                return True  # single process: the caller's own lock is enough
+            try:
+                cur = db.execute(
+                    "INSERT INTO kv (key, value, expires_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+                    "WHERE kv.expires_at <= ?",
+                    (f"lease:{name}", str(os.getpid()), now + ttl, now),
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Shared cache lease {name} failed: {e}")
+                return True
+            return cur.rowcount == 1
+
+    def release(self, name: str) -> None:
+        with self._lock:
+            db = self._db()
+            if db is not None:
+                try:
+                    db.execute("DELETE FROM kv WHERE key = ? AND value = ?", (f"lease:{name}", str(os.getpid())))
+                except sqlite3.Error as e:
+                    logger.warning(f"⚠️ Shared cache release {name} failed: {e}")
+
+
+_cache: SharedCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> SharedCache:
+    """Process-wide SharedCache at server_config.shared_cache_path."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            from app.config import server_config
+            _cache = SharedCache(server_config.shared_cache_path)
+        return _cache
@@ -3,6 +3,7 @@
 from .logger import get_logger
 from .io import save_temp_file, cleanup_temp_file, validate_file_type
 from .formatters import format_dict, flatten_dict
+from .iterables import batched
 
 __all__ = [
   "get_logger", 
@@ -10,5 +11,6 @@ __all__ = [
   "cleanup_temp_file", 
   "validate_file_type", 
   "format_dict",
-  "flatten_dict"
+  "flatten_dict",
+  "batched"
 ]
@@ -0,0 +1,18 @@
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """
+    Consecutive lists of up to `size` items; the last one may be shorter.
+    Same as itertools.batched (Python 3.12+), but yields lists.
+    """
+    batch: list[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
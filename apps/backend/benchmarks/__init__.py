@@ -0,0 +1,4 @@
+"""
+Offline benchmarks for FleetAI backend hot paths.
+Run from apps/backend, e.g. `python -m benchmarks.bench_vector_index`.
+"""
@@ -0,0 +1,120 @@
+# backend/benchmarks/bench_bulk_upsert.py
+"""
+Bulk chunk upserts against FakeConnection: checks the write behavior, then times record building.
+
+    python -m benchmarks.bench_bulk_upsert --chunks 20000 --dim 1536 --batch-size 500
+
+Checks (exit 1 on the first failure):
+- round-trips grow with chunks / batch_size (COPY: 3 per batch, executemany: 1 per batch)
+- a ChunkBatch and the equivalent InvoiceChunk list produce identical records
+- rows repeating a (doc_id, order) key are sent once, last row winning
+- `prune` deletes chunks past the end of the new version, inside the same transaction
+- a failing batch rolls the whole write back
+Then times chunk_records() over a ChunkBatch and over InvoiceChunk models.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+import numpy as np
+
+from app.ai.rag.chunk_batch import ChunkBatch
+from app.db.bulk import BulkWriteConfig, bulk_upsert
+from app.db.fakes import FakeConnection
+from app.db.operations.contract_chunks import chunk_records, upsert_contract_chunks
+from app.schemas.invoice import InvoiceChunk
+
+
+def make_chunks(n: int, dim: int, rng: np.random.Generator) -> list[InvoiceChunk]:
+    vectors = rng.standard_normal((n, dim), dtype=np.float32)
+    return [
+        InvoiceChunk(
+            order=i,
+            label=f"Section {i}",
+            content=f"Section {i}\nInto-plane fee {i % 97} USD per USG at airport AP{i % 300:04d}.",
+            embedding=vectors[i].tolist(),
+            meta={"page": i // 4 + 1, "page_end": i // 4 + 1, "span": [i * 80, i * 80 + 70], "start_index": i * 80, "tokens": 18},
+        )
+        for i in range(n)
+    ]
+
+
+def check(name: str, ok: bool, detail: str = "") -> None:
+    print(f"{'ok  ' if ok else 'FAIL'} {name}" + (f" ({detail})" if detail else ""))
+    if not ok:
+        sys.exit(1)
+
+
+async def run_checks(chunks: list[InvoiceChunk], batch_size: int) -> None:
+    n = len(chunks)
+    batches = -(-n // batch_size)
+    batch = ChunkBatch.from_chunks(chunks)
+
+    copy_conn = FakeConnection()
+    await upsert_contract_chunks(copy_conn, "c1", "d1", batch, config=BulkWriteConfig(batch_size=batch_size))
+    # set_type_codec (first use of the connection) + CREATE TEMP TABLE + (COPY, merge, TRUNCATE) per batch
+    expected = (1 if copy_conn.codecs else 0) + 1 + 3 * batches
+    check("copy round-trips per batch", copy_conn.round_trips == expected, f"{copy_conn.round_trips} for {n} rows, expected {expected}")
+    check("copy commits without rollback", (copy_conn.commits, copy_conn.rollbacks) == (2, 0), f"{copy_conn.commits} commits")  # outer + bulk_upsert's
+
+    many_conn = FakeConnection()
+    await upsert_contract_chunks(many_conn, "c1", "d1", chunks, config=BulkWriteConfig(batch_size=batch_size, method="executemany"))
+    check("executemany round-trips per batch", len(many_conn.queries("executemany")) == batches)
+    check(
+        "ChunkBatch and InvoiceChunk records match",
+        copy_conn.copied_records == many_conn.executemany_records,
+        f"{len(copy_conn.copied_records)} vs {len(many_conn.executemany_records)} rows",
+    )
+
+    dup_conn = FakeConnection()
+    rows = [("d1", 0, "a"), ("d1", 1, "b"), ("d1", 0, "c")]
+    sent = await bulk_upsert(dup_conn, "contract_chunks", ("doc_id", "order", "content"), rows, ("doc_id", "order"))
+    check("duplicate keys sent once, last wins", sent == 2 and sorted(dup_conn.copied_records) == [("d1", 0, "c"), ("d1", 1, "b")])
+
+    prune_conn = FakeConnection()
+    await upsert_contract_chunks(prune_conn, "c1", "d1", chunks[: n // 2], prune=True, config=BulkWriteConfig(batch_size=batch_size))
+    deletes = [c for c in prune_conn.calls if c.method == "execute" and (c.query or "").startswith("DELETE")]
+    check("prune deletes orders past the new end", len(deletes) == 1 and deletes[0].args == ("d1", n // 2))
+
+    failing = FakeConnection(fail_on="copy_records_to_table")
+    try:
+        await upsert_contract_chunks(failing, "c1", "d1", batch, config=BulkWriteConfig(batch_size=batch_size))
+        raised = False
+    except RuntimeError:
+        raised = True
+    check("failed batch rolls back", raised and failing.rollbacks == 2 and failing.commits == 0 and failing.depth == 0)
+
+
+def time_records(chunks: list[InvoiceChunk]) -> dict:
+    batch = ChunkBatch.from_chunks(chunks)
+    start = time.perf_counter()
+    for _ in chunk_records("d1", batch):
+        pass
+    from_batch = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in chunk_records("d1", chunks):
+        pass
+    from_models = time.perf_counter() - start
+    return {
+        "chunks": len(chunks),
+        "chunk_batch_rows_per_s": round(len(chunks) / from_batch),
+        "invoice_chunk_rows_per_s": round(len(chunks) / from_models),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=20_000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    chunks = make_chunks(args.chunks, args.dim, np.random.default_rng(args.seed))
+    asyncio.run(run_checks(chunks, args.batch_size))
+    print(time_records(chunks))
+
+
+if __name__ == "__main__":
+    main()
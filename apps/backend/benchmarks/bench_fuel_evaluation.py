@@ -0,0 +1,109 @@
+# backend/benchmarks/bench_fuel_evaluation.py
+"""
+Scoring time of the vectorized fuel tender evaluation.
+
+    python -m benchmarks.bench_fuel_evaluation --bids 100000 --airports 200 --rounds 3
+
+Columns are generated directly; `--models N` also times loading N FuelBid models with from_bids().
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.features.fuel.tender_evaluation import BidColumns, EvaluationConfig, evaluate_bids
+from app.schemas.fuel_bid import FuelBid
+from app.schemas.vendor import Vendor
+
+INDEXES = ["platts jet a-1 med", "platts jet a-1 nwe", "argus jet usgc", "platts jet 54 singapore"]
+CURRENCIES = ["USD", "EUR", "GBP"]
+FX = {"USD": 1.0, "EUR": 1.08, "GBP": 1.27}
+
+
+def make_columns(n: int, airports: int, rounds: int, vendors: int, rng: np.random.Generator) -> BidColumns:
+    is_index = rng.random(n) < 0.6
+    return BidColumns(
+        airport=rng.integers(0, airports, n, dtype=np.int32),
+        round=rng.integers(1, rounds + 1, n, dtype=np.int32),
+        vendor=rng.integers(0, vendors, n, dtype=np.int32),
+        is_index=is_index,
+        base_price=np.where(is_index, np.nan, rng.uniform(2.0, 3.5, n)),
+        index=np.where(is_index, rng.integers(0, len(INDEXES), n), -1).astype(np.int32),
+        differential=np.where(is_index, rng.uniform(-5, 25, n), np.nan),
+        diff_unit=np.full(n, 2, dtype=np.int8),  # cents per USG
+        fees=rng.uniform(0.0, 0.12, n),
+        uom=rng.choice(np.array([0, 1, 2, 3], dtype=np.int8), n, p=[0.6, 0.2, 0.1, 0.1]),
+        currency=rng.integers(0, len(CURRENCIES), n, dtype=np.int32),
+        density=np.where(rng.random(n) < 0.5, rng.uniform(775, 840, n), np.nan),
+        includes_taxes=rng.integers(-1, 2, n, dtype=np.int8),
+        includes_airport_fees=rng.integers(-1, 2, n, dtype=np.int8),
+        airports=[f"AP{i:04d}" for i in range(airports)],
+        vendors=[f"Vendor {i}" for i in range(vendors)],
+        indexes=list(INDEXES),
+        currencies=list(CURRENCIES),
+    )
+
+
+def make_models(n: int, rng: np.random.Generator) -> list[FuelBid]:
+    vendor = Vendor(vendor_name=None, vendor_address=None, vendor_contact_name=None, vendor_contact_email=None, vendor_contact_phone=None)
+    bids = []
+    for i in range(n):
+        index = bool(rng.random() < 0.6)
+        bids.append(FuelBid(
+            vendor=vendor,
+            vendor_name=f"Vendor {i % 50}",
+            round=int(rng.integers(1, 4)),
+            price_type="index_formula" if index else "fixed",
+            uom="USG",
+            currency="USD",
+            base_unit_price=None if index else round(float(rng.uniform(2, 3.5)), 4),
+            index_name=INDEXES[i % len(INDEXES)] if index else None,
+            differential=round(float(rng.uniform(-5, 25)), 2) if index else None,
+            differential_unit="cents_per_gallon" if index else None,
+            into_plane_fee=0.03,
+        ))
+    return bids
+
+
+def run(n: int, airports: int, rounds: int, vendors: int, repeats: int, models: int) -> dict:
+    rng = np.random.default_rng(0)
+    columns = make_columns(n, airports, rounds, vendors, rng)
+    config = EvaluationConfig(index_prices={k: float(rng.uniform(2.1, 2.6)) for k in INDEXES}, fx_to_usd=FX, tax_rate=0.05, airport_fee_usd_per_usg=0.02)
+
+    evaluate_bids(columns, config)  # warm up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = evaluate_bids(columns, config)
+        timings.append(time.perf_counter() - start)
+    ms = np.array(timings) * 1000
+
+    row = {
+        "bids": n, "airports": airports, "rounds": rounds, "priced": result.priced,
+        "evaluate_p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "evaluate_max_ms": round(float(ms.max()), 2),
+    }
+    if models:
+        bids = make_models(models, rng)
+        start = time.perf_counter()
+        BidColumns.from_bids(bids, [f"AP{i % airports:04d}" for i in range(models)])
+        row["from_bids_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        row["from_bids_count"] = models
+    print(row)
+    return row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bids", type=int, default=100_000)
+    parser.add_argument("--airports", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--vendors", type=int, default=40)
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--models", type=int, default=0, help="Also time loading this many FuelBid models.")
+    args = parser.parse_args()
+    run(args.bids, args.airports, args.rounds, args.vendors, args.repeats, args.models)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# backend/benchmarks/bench_part_search.py
+"""
+Typeahead latency and recall of the fuzzy PartNumberIndex.
+
+    python -m benchmarks.bench_part_search --parts 1000000 --queries 500 --min-recall 0.98 --max-p95-ms 5
+
+Queries are drawn from indexed part numbers and perturbed: reformatted, truncated (typeahead),
+one substitution, one deletion, one adjacent transposition. Recall@k counts queries whose
+source part number is among the top k candidates (for truncated queries too, so a short prefix
+shared by more than k part numbers can miss). Then streams new part numbers through add(), past
+REBUILD_PENDING, and reports the slowest add() (rebuilds run in the background, so it stays small)
+and whether the streamed keys are searchable before and after the rebuild lands.
+"""
+import argparse
+import random
+import string
+import time
+
+import numpy as np
+
+from app.features.quotes.part_numbers import normalize_part_number
+from app.features.quotes.part_search import REBUILD_PENDING, PartNumberIndex
+
+_DIGITS = string.digits
+_ALNUM = string.ascii_uppercase + string.digits
+
+
+def make_part_number(rng: random.Random) -> str:
+    style = rng.random()
+    if style < 0.5:  # 8061-536-001
+        return "-".join("".join(rng.choices(_DIGITS, k=n)) for n in (4, 3, 3))
+    if style < 0.8:  # MS20470AD4-4
+        return "".join(rng.choices(string.ascii_uppercase, k=2)) + "".join(rng.choices(_DIGITS, k=5)) + "".join(rng.choices(_ALNUM, k=3)) + "-" + rng.choice(_DIGITS)
+    return "".join(rng.choices(_ALNUM, k=rng.randint(6, 12)))  # free-form
+
+
+def perturb(pn: str, kind: str, rng: random.Random) -> str:
+    key = normalize_part_number(pn)
+    i = rng.randrange(1, len(key) - 1)
+    if kind == "format":
+        return " ".join(key[j:j + 3] for j in range(0, len(key), 3))
+    if kind == "prefix":
+        return pn[: max(4, len(pn) * 2 // 3)]
+    if kind == "substitute":
+        return key[:i] + rng.choice([c for c in _DIGITS if c != key[i]]) + key[i + 1:]
+    if kind == "delete":
+        return key[:i] + key[i + 1:]
+    if kind == "transpose":
+        return key[:i] + key[i + 1] + key[i] + key[i + 2:]
+    return pn
+
+
+KINDS = ["format", "prefix", "substitute", "delete", "transpose"]
+
+
+def run(parts: int, queries: int, k: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    pns = list({make_part_number(rng) for _ in range(parts)})
+    index = PartNumberIndex()
+    start = time.perf_counter()
+    index.add_many((pn, None) for pn in pns)
+    build_s = time.perf_counter() - start
+
+    row: dict = {"parts": len(index), "build_s": round(build_s, 2)}
+    for kind in KINDS:
+        timings, hits = [], 0
+        for pn in rng.sample(pns, queries):
+            q = perturb(pn, kind, rng)
+            t = time.perf_counter()
+            found = index.search(q, k=k)
+            timings.append(time.perf_counter() - t)
+            target = normalize_part_number(pn)
+            hits += any(c.part_number == target for c in found)
+        ms = np.array(timings) * 1000
+        row[kind] = {
+            "recall_at_k": round(hits / queries, 3),
+            "p50_ms": round(float(np.percentile(ms, 50)), 3),
+            "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        }
+
+    streamed = [pn for pn in (make_part_number(rng) for _ in range(2 * REBUILD_PENDING)) if normalize_part_number(pn) not in index._display]
+    timings = []
+    for pn in streamed:
+        t = time.perf_counter()
+        index.add(pn)
+        timings.append(time.perf_counter() - t)
+    probe = rng.sample(streamed, min(queries, len(streamed)))
+    found_early = sum(any(c.part_number == normalize_part_number(pn) for c in index.search(pn, k=k)) for pn in probe)
+    index.build()  # waits for a background build in flight, then folds whatever is still pending
+    found_late = sum(any(c.part_number == normalize_part_number(pn) for c in index.search(pn, k=k)) for pn in probe)
+    ms = np.array(timings) * 1000
+    row["stream"] = {
+        "adds": len(streamed),
+        "add_p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "add_max_ms": round(float(ms.max()), 3),
+        "recall_pending": round(found_early / len(probe), 3),
+        "recall_built": round(found_late / len(probe), 3),
+    }
+    print(row)
+    return row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--parts", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-recall", type=float, default=None, help="Exit non-zero if any perturbation's recall@k is below this.")
+    parser.add_argument("--max-p95-ms", type=float, default=None, help="Exit non-zero if any perturbation's p95 latency is above this.")
+    args = parser.parse_args()
+    row = run(args.parts, args.queries, args.k, args.seed)
+    if args.min_recall is not None:
+        failed = [kind for kind in KINDS if row[kind]["recall_at_k"] < args.min_recall]
+        if failed:
+            raise SystemExit(f"Recall below {args.min_recall} for: {', '.join(failed)}")
+    if args.max_p95_ms is not None:
+        slow = [kind for kind in KINDS if row[kind]["p95_ms"] > args.max_p95_ms]
+        if slow:
+            raise SystemExit(f"p95 above {args.max_p95_ms} ms for: {', '.join(slow)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# backend/benchmarks/bench_reconciliation.py
+"""
+Batch invoice-to-contract reconciliation throughput.
+
+    python -m benchmarks.bench_reconciliation --contracts 5000 --lines 1000000
+
+Each vendor gets a yearly contract plus a mid-year amendment (version 2); invoice lines are
+spread over the year and ~2% are billed above the contracted rate.
+"""
+import argparse
+import random
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+from app.features.contract.reconciliation import ContractTermIndex, ContractVersion, InvoiceLine, reconcile
+from app.schemas.contract import Contract, MoneyValue, PercentageValue, RateValue, Term
+from app.schemas.enums import ContractTypes
+from app.schemas.vendor import Vendor
+
+CHARGES = ["into_plane_fee", "handling_fee", "admin_fee", "monthly_fee", "throughput_fee"]
+YEAR_START = date(2025, 1, 1)
+
+
+def make_contract(vendor: str, start: date, end: date, rng: random.Random) -> Contract:
+    return Contract(
+        vendor=Vendor(vendor_name=vendor, vendor_address=None, vendor_contact_name=None, vendor_contact_email=None, vendor_contact_phone=None),
+        contract_type=ContractTypes.fuel,
+        effective_from=start,
+        effective_to=end,
+        terms=[
+            Term(key="into_plane_fee", value=RateValue(amount=round(rng.uniform(0.01, 0.05), 4), currency="USD")),
+            Term(key="handling_fee", value=RateValue(amount=round(rng.uniform(20, 80), 2), currency="USD")),
+            Term(key="admin_fee", value=PercentageValue(value=round(rng.uniform(0.5, 3), 2))),
+            Term(key="monthly_fee", value=MoneyValue(amount=round(rng.uniform(500, 5000), 2), currency="USD")),
+        ],
+    )
+
+
+def in_effect(contract: Contract, day: date) -> bool:
+    """Open-ended bounds (None) count as unbounded."""
+    return (contract.effective_from is None or contract.effective_from <= day) and (contract.effective_to is None or day <= contract.effective_to)
+
+
+def make_lines(versions: list[ContractVersion], n: int, overcharge: float, rng: random.Random) -> list[InvoiceLine]:
+    by_vendor: dict[str, list[ContractVersion]] = {}
+    for v in versions:
+        by_vendor.setdefault(v.contract.vendor.vendor_name or "", []).append(v)
+    vendors = list(by_vendor)
+    lines = []
+    for i in range(n):
+        vendor = rng.choice(vendors)
+        day = YEAR_START + timedelta(days=rng.randrange(365))
+        current = max((v for v in by_vendor[vendor] if in_effect(v.contract, day)), key=lambda v: v.version)
+        terms = {t.key: t.value for t in current.contract.terms}
+        key = rng.choice(CHARGES)
+        bump = 1.1 if rng.random() < overcharge else 1.0
+        line = {"invoice_id": f"INV-{i // 20}", "vendor_name": vendor, "service_date": day, "charge_key": key, "currency": "USD"}
+        value = terms.get(key)
+        if isinstance(value, RateValue):
+            qty = rng.randint(1, 5000)
+            lines.append(InvoiceLine(**line, quantity=qty, unit_price=value.amount * bump))
+        elif isinstance(value, PercentageValue):
+            base = rng.uniform(1_000, 50_000)
+            lines.append(InvoiceLine(**line, amount=base * value.value / 100 * bump, base_amount=base))
+        elif isinstance(value, MoneyValue):
+            lines.append(InvoiceLine(**line, amount=value.amount * bump))
+        else:
+            lines.append(InvoiceLine(**line, amount=rng.uniform(10, 100)))
+    return lines
+
+
+def run(contracts: int, n: int, overcharge: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    versions = []
+    for i in range(contracts // 2):
+        vendor = f"Vendor {i}"
+        versions.append(ContractVersion(contract_id=f"C{i}", version=1, contract=make_contract(vendor, YEAR_START, date(2025, 12, 31), rng)))
+        versions.append(ContractVersion(contract_id=f"C{i}", version=2, contract=make_contract(vendor, date(2025, 7, 1), date(2025, 12, 31), rng)))
+
+    start = time.perf_counter()
+    index = ContractTermIndex(versions)
+    build_s = time.perf_counter() - start
+
+    lines = make_lines(versions, n, overcharge, rng)
+    start = time.perf_counter()
+    kinds = Counter(flag.kind for flag in reconcile(index, lines))
+    reconcile_s = time.perf_counter() - start
+
+    row = {
+        "contracts": len(versions), "lines": n,
+        "index_build_s": round(build_s, 3),
+        "reconcile_s": round(reconcile_s, 3),
+        "lines_per_s": int(n / reconcile_s),
+        "flags": dict(kinds),
+    }
+    print(row)
+    return row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contracts", type=int, default=5_000)
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--overcharge", type=float, default=0.02, help="Share of lines billed 10%% above contract.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.contracts, args.lines, args.overcharge, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# backend/benchmarks/bench_vendor_resolution.py
+"""
+Throughput and pairwise quality of the incremental VendorResolver.
+
+    python -m benchmarks.bench_vendor_resolution --vendors 5000 --mentions 100000
+
+Each true vendor gets a name, email domain and phone; mentions re-spell the name (case, legal
+suffix, punctuation, one typo) and drop or reformat contact fields. Precision/recall are over
+pairs of mentions placed in the same cluster.
+"""
+import argparse
+import random
+import string
+import time
+from collections import Counter
+
+from app.features.vendors.resolution import VendorResolver
+from app.schemas.vendor import Vendor
+
+WORDS = ["aero", "jet", "sky", "global", "tech", "parts", "supply", "aviation", "services", "air", "fuel", "logistics", "support", "engine", "components"]
+SUFFIXES = ["", " GmbH", " Ltd", " Ltd.", " Inc.", " LLC", " AG", " S.A.", " Limited"]
+
+
+def _syllables(rng: random.Random) -> str:
+    return "".join(rng.choice("bcdfghklmnprstvz") + rng.choice("aeiou") for _ in range(rng.randint(2, 4)))
+
+
+def make_vendor(rng: random.Random) -> dict:
+    name = " ".join([_syllables(rng).capitalize()] + rng.sample(WORDS, rng.randint(0, 2)))
+    domain = name.split()[0].lower() + rng.choice([".com", ".de", ".aero", ".co.uk"])
+    phone = "".join(rng.choices(string.digits, k=9))
+    return {"name": name, "domain": domain, "phone": phone, "country": rng.choice(["1", "44", "49", "33", "972"])}
+
+
+def _typo(name: str, rng: random.Random) -> str:
+    i = rng.randrange(len(name))
+    if name[i] == " ":
+        return name
+    return name[:i] + rng.choice(string.ascii_lowercase) + name[i + 1:]
+
+
+def mention(v: dict, rng: random.Random) -> Vendor:
+    name = v["name"] + rng.choice(SUFFIXES)
+    r = rng.random()
+    if r < 0.3:
+        name = name.upper()
+    elif r < 0.4:
+        name = name.replace(" ", "-", 1)
+    if rng.random() < 0.15:
+        name = _typo(name, rng)
+    email = f"{rng.choice(['sales', 'info', 'john.doe', 'quotes'])}@{v['domain']}" if rng.random() < 0.6 else None
+    if email and rng.random() < 0.05:
+        email = f"someone{rng.randint(1, 99)}@gmail.com"
+    phone = None
+    if rng.random() < 0.5:
+        p = v["phone"]
+        phone = rng.choice([f"+{v['country']} {p[:3]} {p[3:6]}-{p[6:]}", f"0{p}", f"({p[:3]}) {p[3:6]} {p[6:]}"])
+    return Vendor(vendor_name=name, vendor_address=None, vendor_contact_name=None, vendor_contact_email=email, vendor_contact_phone=phone)
+
+
+def pairwise_quality(truth: list[int], predicted: list[str | None]) -> tuple[float, float]:
+    def pairs(counts: Counter) -> int:
+        return sum(c * (c - 1) // 2 for c in counts.values())
+    both = pairs(Counter(zip(truth, predicted)))
+    pred = pairs(Counter(predicted))
+    true = pairs(Counter(truth))
+    return (both / pred if pred else 1.0), (both / true if true else 1.0)
+
+
+def run(vendors: int, mentions: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    base = [make_vendor(rng) for _ in range(vendors)]
+    truth = [rng.randrange(vendors) for _ in range(mentions)]
+    items = [mention(base[t], rng) for t in truth]
+
+    resolver = VendorResolver()
+    start = time.perf_counter()
+    ids = resolver.resolve_many(items)
+    elapsed = time.perf_counter() - start
+    ids = [resolver.canonical(i) if i else None for i in ids]  # later merges re-point earlier ids
+    precision, recall = pairwise_quality(truth, ids)
+
+    row = {
+        "vendors": vendors, "mentions": mentions,
+        "resolve_s": round(elapsed, 2),
+        "clusters": resolver.cluster_count(),
+        "pair_precision": round(precision, 4),
+        "pair_recall": round(recall, 4),
+    }
+    print(row)
+    return row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vendors", type=int, default=5_000)
+    parser.add_argument("--mentions", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.vendors, args.mentions, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# backend/benchmarks/import_time.py
+"""
+Cold-start import cost of the API, per module, with a budget check.
+
+    python -m benchmarks.import_time --top 20
+    python -m benchmarks.import_time --budget-ms 0      # report only, no budget
+
+Exits 1 when `import app.main` takes longer than the budget (DEFAULT_BUDGET_MS, or IMPORT_BUDGET_MS
+from the environment); `pnpm run check` runs it as `check:backend`.
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters (best of --runs) and
+reports the slowest modules by cumulative and self time. Modules listed in --forbid (the
+LlamaCloud SDKs by default) must not be imported at startup at all.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_FORBID = ("llama_cloud_services", "llama_cloud")
+# ~890 ms measured once the LlamaCloud SDKs went lazy; the headroom absorbs slower CI machines
+DEFAULT_BUDGET_MS = 1500.0
+# ai_config.validate() runs at import; placeholders keep the check independent of real secrets
+PLACEHOLDER_ENV = {
+    "OPENAI_API_KEY": "import-time-check",
+    "LLAMA_CLOUD_API_KEY": "import-time-check",
+    "LLAMA_EXTRACT_PROJECT_ID": "import-time-check",
+}
+
+
+def measure(target: str) -> dict[str, tuple[int, int, int]]:
+    """module -> (self us, cumulative us, depth) for one fresh interpreter."""
+    env = {**PLACEHOLDER_ENV, **os.environ}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        tail = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")][-5:]
+        raise SystemExit(f"import {target} failed:\n" + "\n".join(tail))
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules.setdefault(name.strip(), (int(self_us), int(cumulative_us), depth))
+    return modules
+
+
+def run(target: str, runs: int, top: int, budget_ms: float | None, forbid: list[str], as_json: bool) -> int:
+    best = min((measure(target) for _ in range(runs)), key=lambda m: m[target][1])
+    total_ms = best[target][1] / 1000
+    by_cumulative = sorted(best.items(), key=lambda kv: -kv[1][1])[:top]
+    by_self = sorted(best.items(), key=lambda kv: -kv[1][0])[:top]
+    imported_forbidden = sorted(m for m in best if m.split(".")[0] in forbid)
+
+    report = {
+        "target": target,
+        "total_ms": round(total_ms, 1),
+        "modules": len(best),
+        "budget_ms": budget_ms,
+        "forbidden_imported": imported_forbidden,
+        "top_cumulative_ms": {name: round(c / 1000, 1) for name, (_, c, _) in by_cumulative},
+        "top_self_ms": {name: round(s / 1000, 1) for name, (s, _, _) in by_self},
+    }
+    if as_json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"import {target}: {total_ms:.1f} ms across {len(best)} modules (best of {runs})")
+        print(f"\n{'cumulative ms':>14} {'self ms':>8}  module")
+        for name, (s, c, depth) in by_cumulative:
+            print(f"{c / 1000:>14.1f} {s / 1000:>8.1f}  {'  ' * min(depth, 6)}{name}")
+        print(f"\n{'self ms':>14}  module")
+        for name, (s, _, _) in by_self:
+            print(f"{s / 1000:>14.1f}  {name}")
+
+    failed = False
+    if imported_forbidden:
+        print(f"\n❌ Imported at startup but should load lazily: {', '.join(imported_forbidden)}", file=sys.stderr)
+        failed = True
+    if budget_ms is not None and total_ms > budget_ms:
+        print(f"\n❌ import {target} took {total_ms:.1f} ms, budget is {budget_ms:.0f} ms", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default="app.main")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS)), help="0 disables the budget check.")
+    parser.add_argument("--forbid", default=",".join(DEFAULT_FORBID), help="Comma-separated top-level packages that must stay lazy.")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    forbid = [m for m in args.forbid.split(",") if m]
+    sys.exit(run(args.target, args.runs, args.top, args.budget_ms or None, forbid, args.json))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+"""
+Load-testing harness: local fake Clerk and LlamaCloud/OpenAI servers, a signing key that mints
+Clerk-shaped session tokens, and an open-loop async load generator.
+Run from apps/backend: `python -m benchmarks.loadtest --help`.
+"""
+
+from .fakes import FakeServer, FaultConfig, fake_clerk_app, fake_llm_app
+from .load import Route, run_load
+from .tokens import TokenMinter
+
+__all__ = [
+    "FakeServer",
+    "FaultConfig",
+    "fake_clerk_app",
+    "fake_llm_app",
+    "Route",
+    "run_load",
+    "TokenMinter",
+]
@@ -0,0 +1,127 @@
+# backend/benchmarks/loadtest/__main__.py
+"""
+End-to-end load test of the API against local stand-ins for Clerk and LlamaCloud/OpenAI.
+
+    python -m benchmarks.loadtest --rps 200 --duration 30
+    python -m benchmarks.loadtest --workers 4 --rps 1000 --route "GET /health=5" --route "GET /api/v1/admin/db/pool"
+    python -m benchmarks.loadtest --clerk-latency-ms 300 --llm-latency-ms 2000 --llm-error-rate 0.05 --json
+
+Starts a fake Clerk (serving the JWKS of a throwaway signing key) and a fake LlamaCloud/OpenAI
+server, launches `app.serve --production` pointed at them (CLERK_*, LLAMA_CLOUD_BASE_URL,
+OPENAI_BASE_URL), mints session tokens for --orgs x --users-per-org synthetic users and drives the
+routes at --rps. Every request carries a bearer token. Reports throughput, p50/p95/p99 latency
+and errors per route, plus what the fakes saw.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.loadtest.fakes import FakeServer, FaultConfig, fake_clerk_app, fake_llm_app
+from benchmarks.loadtest.load import Route, run_load
+from benchmarks.loadtest.tokens import TokenMinter
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent.parent
+DEFAULT_ROUTES = ["GET /health=3", "GET /api/v1/admin/db/pool=1"]
+
+
+def start_app(env: dict[str, str], port: int, workers: int) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "app.serve", "--production", "--workers", str(workers)],
+        cwd=BACKEND_DIR, env={**os.environ, **env},
+    )
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"app exited with code {proc.returncode} during startup")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    proc.terminate()
+    raise SystemExit("app did not become healthy within 120 s")
+
+
+def print_report(report: dict) -> None:
+    print(f"\n{report['total']['requests']} requests in {report['duration_s']} s "
+          f"({report['total']['rps']} rps achieved, {report['target_rps']} targeted)\n")
+    print(f"{'route':<45} {'reqs':>7} {'ok':>7} {'rps':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  errors")
+    for name, s in [*report["routes"].items(), ("TOTAL", report["total"])]:
+        errors = ", ".join(f"{k}: {v}" for k, v in s["errors"].items()) or "-"
+        print(f"{name:<45} {s['requests']:>7} {s['ok']:>7} {s['rps']:>7} {s['p50_ms']:>8} {s['p95_ms']:>8} {s['p99_ms']:>8}  {errors}")
+    for fake, seen in report["fakes"].items():
+        print(f"\n{fake}: " + (", ".join(f"{k}={v}" for k, v in seen.items()) or "no requests"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rps", type=float, default=100)
+    parser.add_argument("--duration", type=float, default=20, help="Seconds of load.")
+    parser.add_argument("--route", action="append", help='"METHOD /path=weight" (repeatable).')
+    parser.add_argument("--workers", type=int, default=1, help="App worker processes.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--orgs", type=int, default=20)
+    parser.add_argument("--users-per-org", type=int, default=5)
+    parser.add_argument("--max-inflight", type=int, default=256)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--clerk-latency-ms", type=float, default=50)
+    parser.add_argument("--clerk-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=800)
+    parser.add_argument("--llm-jitter-ms", type=float, default=400)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    routes = [Route.parse(spec) for spec in args.route or DEFAULT_ROUTES]
+    minter = TokenMinter()
+    tokens = minter.synthetic_tokens(args.orgs, args.users_per_org)
+    clerk_faults = FaultConfig(latency_ms=args.clerk_latency_ms, error_rate=args.clerk_error_rate, seed=args.seed)
+    llm_faults = FaultConfig(latency_ms=args.llm_latency_ms, jitter_ms=args.llm_jitter_ms, error_rate=args.llm_error_rate, seed=args.seed)
+
+    with FakeServer(fake_clerk_app(minter.jwks, clerk_faults)) as clerk, FakeServer(fake_llm_app(llm_faults)) as llm, \
+            tempfile.TemporaryDirectory() as cache_dir:
+        env = {
+            "HOST": "127.0.0.1",
+            "PORT": str(args.port),
+            "LOG_LEVEL": "warning",
+            "SHARED_CACHE_DIR": cache_dir,
+            "CLERK_ISSUER": minter.issuer,
+            "CLERK_JWKS_URL": f"{clerk.url}/.well-known/jwks.json",
+            "CLERK_BACKEND_AUD": minter.audience,
+            "PROFILE_ADMIN_ROLES": "org:admin",  # the synthetic users are org admins; lets them reach the admin routes
+            "LLAMA_CLOUD_BASE_URL": llm.url,
+            "LLAMA_CLOUD_API_KEY": "llx-loadtest",
+            "LLAMA_EXTRACT_PROJECT_ID": "proj_loadtest",
+            "OPENAI_BASE_URL": f"{llm.url}/v1",
+            "OPENAI_API_KEY": "sk-loadtest",
+        }
+        app = start_app(env, args.port, args.workers)
+        try:
+            report = asyncio.run(run_load(
+                f"http://127.0.0.1:{args.port}", routes, args.rps, args.duration, tokens,
+                max_inflight=args.max_inflight, timeout=args.timeout, seed=args.seed,
+            ))
+        finally:
+            app.terminate()
+            app.wait(timeout=60)
+        report["workers"] = args.workers
+        report["fakes"] = {"clerk": clerk.stats, "llm": llm.stats}
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
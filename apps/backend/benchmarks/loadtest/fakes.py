@@ -0,0 +1,172 @@
+# backend/benchmarks/loadtest/fakes.py
+import asyncio
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+
+class FaultConfig(BaseModel):
+    """Latency and failures injected into every response of a fake service."""
+    latency_ms: float = Field(default=0.0, ge=0, description="Added delay per request.")
+    jitter_ms: float = Field(default=0.0, ge=0, description="Uniform extra delay in [0, jitter_ms].")
+    error_rate: float = Field(default=0.0, ge=0, le=1, description="Share of requests answered with error_status.")
+    error_status: int = 503
+    seed: int | None = None
+
+
+def _with_faults(app: FastAPI, faults: FaultConfig) -> FastAPI:
+    rng = random.Random(faults.seed)
+    app.state.stats = Counter()
+
+    @app.middleware("http")
+    async def inject(request: Request, call_next):
+        app.state.stats["requests"] += 1
+        delay = faults.latency_ms + rng.uniform(0, faults.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+        if rng.random() < faults.error_rate:
+            app.state.stats["injected_errors"] += 1
+            return JSONResponse({"detail": "injected failure"}, status_code=faults.error_status)
+        response = await call_next(request)
+        if response.status_code == 404:
+            app.state.stats[f"unhandled {request.method} {request.url.path}"] += 1
+        return response
+
+    return app
+
+
+# ---------- Clerk ----------
+def fake_clerk_app(jwks: dict, faults: FaultConfig | None = None) -> FastAPI:
+    """Serves the JWKS that TokenMinter signs with, at Clerk's path."""
+    app = FastAPI()
+
+    @app.get("/.well-known/jwks.json")
+    async def get_jwks():
+        return jwks
+
+    return _with_faults(app, faults or FaultConfig())
+
+
+# ---------- LlamaCloud + OpenAI-compatible LLM ----------
+def fake_llm_app(faults: FaultConfig | None = None) -> FastAPI:
+    """
+    In-memory stand-in for the LlamaCloud extraction API (agents, files, jobs) and the OpenAI
+    chat/embeddings endpoints. Jobs succeed immediately with an empty result.
+    """
+    app = FastAPI()
+    agents: dict[str, dict] = {}
+    jobs: dict[str, dict] = {}
+
+    def stamp(obj: dict) -> dict:
+        obj["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        obj.setdefault("created_at", obj["updated_at"])
+        return obj
+
+    @app.get("/api/v1/projects")
+    async def list_projects(request: Request):
+        return [{"id": request.query_params.get("project_id") or "proj_loadtest", "name": "Default", "organization_id": "org_loadtest"}]
+
+    @app.get("/api/v1/extraction/extraction-agents/by-name/{name}")
+    async def get_agent_by_name(name: str):
+        agent = next((a for a in agents.values() if a["name"] == name), None)
+        return agent if agent else JSONResponse({"detail": "Extraction agent not found"}, status_code=404)
+
+    @app.post("/api/v1/extraction/extraction-agents")
+    async def create_agent(request: Request):
+        body = await request.json()
+        agent_id = str(uuid.uuid4())
+        agents[agent_id] = stamp({"id": agent_id, "project_id": request.query_params.get("project_id"), **body})
+        return agents[agent_id]
+
+    @app.get("/api/v1/extraction/extraction-agents/{agent_id}")
+    async def get_agent(agent_id: str):
+        return agents.get(agent_id) or JSONResponse({"detail": "Extraction agent not found"}, status_code=404)
+
+    @app.put("/api/v1/extraction/extraction-agents/{agent_id}")
+    async def update_agent(agent_id: str, request: Request):
+        if agent_id not in agents:
+            return JSONResponse({"detail": "Extraction agent not found"}, status_code=404)
+        agents[agent_id].update(await request.json())
+        return stamp(agents[agent_id])
+
+    @app.post("/api/v1/files")
+    async def upload_file():
+        return {"id": str(uuid.uuid4()), "name": "upload", "project_id": "proj_loadtest"}
+
+    @app.post("/api/v1/extraction/jobs")
+    async def create_job(request: Request):
+        body = await request.json()
+        job_id = str(uuid.uuid4())
+        jobs[job_id] = {"id": job_id, "extraction_agent_id": body.get("extraction_agent_id"), "status": "SUCCESS", "file_id": body.get("file_id")}
+        return jobs[job_id]
+
+    @app.get("/api/v1/extraction/jobs/{job_id}")
+    async def get_job(job_id: str):
+        return jobs.get(job_id) or JSONResponse({"detail": "Job not found"}, status_code=404)
+
+    @app.get("/api/v1/extraction/jobs/{job_id}/result")
+    async def get_job_result(job_id: str):
+        return {"run_id": job_id, "extraction_agent_id": jobs.get(job_id, {}).get("extraction_agent_id"), "data": {}, "extraction_metadata": {}}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}", "object": "chat.completion", "created": int(time.time()), "model": body.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 1, "total_tokens": 1},
+        }
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        inputs = body.get("input") or []
+        inputs = [inputs] if isinstance(inputs, str) else inputs
+        dim = body.get("dimensions") or 1536
+        rng = random.Random(len(inputs))
+        return {
+            "object": "list", "model": body.get("model"),
+            "data": [{"object": "embedding", "index": i, "embedding": [rng.uniform(-1, 1) for _ in range(dim)]} for i in range(len(inputs))],
+            "usage": {"prompt_tokens": 0, "total_tokens": 0},
+        }
+
+    return _with_faults(app, faults or FaultConfig())
+
+
+# ---------- Serving ----------
+class FakeServer:
+    """Runs an ASGI app on 127.0.0.1 (ephemeral port) in a background thread: `with FakeServer(app) as s: s.url`."""
+
+    def __init__(self, app: FastAPI, port: int = 0):
+        self.app = app
+        self._server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    def __enter__(self) -> "FakeServer":
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("fake server failed to start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+    @property
+    def url(self) -> str:
+        port = self._server.servers[0].sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return dict(self.app.state.stats)
@@ -0,0 +1,115 @@
+# backend/benchmarks/loadtest/load.py
+import asyncio
+import random
+from collections import Counter, defaultdict
+
+import httpx
+import numpy as np
+from pydantic import BaseModel, Field
+
+
+class Route(BaseModel):
+    method: str = "GET"
+    path: str
+    weight: float = Field(1.0, gt=0)
+    body: dict | None = None
+    auth: bool = True
+
+    @classmethod
+    def parse(cls, spec: str) -> "Route":
+        """'GET /health', 'POST /api/v1/admin/update_extractors=0.1' (weight after '=')."""
+        spec, _, weight = spec.partition("=")
+        method, _, path = spec.strip().partition(" ")
+        if not path:
+            method, path = "GET", method
+        return cls(method=method.upper(), path=path.strip(), weight=float(weight or 1))
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.path}"
+
+
+class _RouteStats:
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.ok = 0
+        self.errors: Counter = Counter()
+
+    def summary(self, elapsed: float) -> dict:
+        ms = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        return {
+            "requests": len(self.latencies),
+            "ok": self.ok,
+            "rps": round(len(self.latencies) / elapsed, 1),
+            "p50_ms": round(float(p50), 2),
+            "p95_ms": round(float(p95), 2),
+            "p99_ms": round(float(p99), 2),
+            "max_ms": round(float(ms.max()), 2),
+            "errors": dict(self.errors.most_common()),
+        }
+
+
+async def run_load(
+    base_url: str,
+    routes: list[Route],
+    rps: float,
+    duration: float,
+    tokens: list[str],
+    max_inflight: int = 256,
+    timeout: float = 10.0,
+    seed: int = 0,
+) -> dict:
+    """
+    Open-loop load: request i is due at start + i/rps whether or not earlier ones have finished,
+    and its latency is measured from that due time. Time spent waiting for a connection slot
+    (max_inflight) therefore counts, so a saturated server shows up as tail latency instead of
+    being hidden by a slower send rate.
+    """
+    rng = random.Random(seed)
+    weights = [r.weight for r in routes]
+    stats: dict[str, _RouteStats] = defaultdict(_RouteStats)
+    slots = asyncio.Semaphore(max_inflight)
+    loop = asyncio.get_running_loop()
+    limits = httpx.Limits(max_connections=max_inflight, max_keepalive_connections=max_inflight)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        async def send(route: Route, token: str, due: float) -> None:
+            headers = {"Authorization": f"Bearer {token}"} if route.auth else None
+            outcome = None
+            async with slots:
+                try:
+                    resp = await client.request(route.method, route.path, json=route.body, headers=headers)
+                    outcome = resp.status_code
+                except httpx.HTTPError as e:
+                    outcome = type(e).__name__
+            s = stats[route.name]
+            s.latencies.append(loop.time() - due)
+            if isinstance(outcome, int) and outcome < 400:
+                s.ok += 1
+            else:
+                s.errors[str(outcome)] += 1
+
+        start = loop.time()
+        pending = []
+        for i in range(int(rps * duration)):
+            due = start + i / rps
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            route = rng.choices(routes, weights)[0]
+            pending.append(asyncio.create_task(send(route, rng.choice(tokens), due)))
+        await asyncio.gather(*pending)
+        elapsed = loop.time() - start
+
+    total = _RouteStats()
+    for s in stats.values():
+        total.latencies += s.latencies
+        total.ok += s.ok
+        total.errors.update(s.errors)
+    return {
+        "target_rps": rps,
+        "duration_s": round(elapsed, 2),
+        "total": total.summary(elapsed),
+        "routes": {name: stats[name].summary(elapsed) for name in sorted(stats)},
+    }
@@ -0,0 +1,42 @@
+# backend/benchmarks/loadtest/tokens.py
+import itertools
+import json
+import time
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+DEFAULT_ISSUER = "https://clerk.loadtest.local"
+DEFAULT_AUDIENCE = "fleet-ai-loadtest"
+
+
+class TokenMinter:
+    """Throwaway RSA key that signs Clerk-shaped session tokens; `jwks` is what the fake Clerk serves."""
+
+    def __init__(self, issuer: str = DEFAULT_ISSUER, audience: str = DEFAULT_AUDIENCE, kid: str = "loadtest"):
+        self.issuer = issuer
+        self.audience = audience
+        self.kid = kid
+        self._key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    @property
+    def jwks(self) -> dict:
+        jwk = json.loads(RSAAlgorithm.to_jwk(self._key.public_key()))
+        jwk.update(kid=self.kid, alg="RS256", use="sig")
+        return {"keys": [jwk]}
+
+    def mint(self, user_id: str, org_id: str | None, ttl: int = 3600, **claims) -> str:
+        now = int(time.time())
+        payload = {
+            "sub": user_id, "sid": f"sess_{user_id}", "orgId": org_id,
+            "iss": self.issuer, "aud": self.audience, "iat": now, "nbf": now, "exp": now + ttl, **claims,
+        }
+        return jwt.encode(payload, self._key, algorithm="RS256", headers={"kid": self.kid})
+
+    def synthetic_tokens(self, orgs: int, users_per_org: int, ttl: int = 3600) -> list[str]:
+        """One token per (org, user): org_0001/user_0001_01, ... Each is an org admin (the run sets PROFILE_ADMIN_ROLES=org:admin), so admin routes pass auth."""
+        return [
+            self.mint(f"user_{o:04d}_{u:02d}", f"org_{o:04d}", ttl, org_role="org:admin")
+            for o, u in itertools.product(range(1, orgs + 1), range(1, users_per_org + 1))
+        ]
@@ -0,0 +1,383 @@
+# backend/benchmarks/micro.py
+"""
+Micro-benchmarks of the API's hot paths, fully offline: synthetic payloads, a locally generated
+RSA key/JWKS instead of Clerk, no OpenAI/LlamaCloud calls.
+
+    python -m benchmarks.micro list
+    python -m benchmarks.micro run --out bench-$(git rev-parse --short HEAD).json
+    python -m benchmarks.micro run --filter auth --filter schemas.contract
+    python -m benchmarks.micro compare bench-a1b2c3d.json bench-e4f5a6b.json --threshold 0.10
+
+Each case runs --repeat samples of a loop calibrated to take at least --min-time seconds and
+records per-call microseconds. `compare` flags a case as regressed when its median grew by more
+than --threshold AND the new best sample is slower than the old median (guards against noise);
+it exits 1 on any regression so it can gate CI.
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import ExitStack
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_THRESHOLD = 0.10
+
+Timed = Callable[[], object]
+# name -> setup(stack) returning the zero-argument callable to time; resources go on the ExitStack
+Setup = Callable[[ExitStack], Timed]
+CASES: dict[str, Setup] = {}
+
+
+def case(name: str, **params) -> Callable[[Callable[..., Timed]], Callable[..., Timed]]:
+    """Register setup(stack, **params) as a case; the params become part of its label."""
+    label = name + ("[" + ",".join(f"{k}={v}" for k, v in params.items()) + "]" if params else "")
+
+    def register(setup):
+        CASES[label] = lambda stack: setup(stack, **params)
+        return setup
+    return register
+
+
+def _run_sync(coro):
+    """Drive a coroutine that never actually suspends (cache hits) without an event loop's overhead."""
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    coro.close()
+    raise RuntimeError("coroutine suspended; it needs an event loop")
+
+
+# ---------- Auth ----------
+def _clerk_fixture() -> tuple[str, dict]:
+    """(signed session token, JWK) from a throwaway RSA key; Clerk env points nowhere."""
+    import jwt
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from jwt.algorithms import RSAAlgorithm
+
+    os.environ.update(CLERK_ISSUER="https://clerk.bench.local", CLERK_JWKS_URL="http://127.0.0.1:9/jwks", CLERK_BACKEND_AUD="fleet-ai-bench")
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(RSAAlgorithm.to_jwk(key.public_key()))
+    jwk.update(kid="bench", alg="RS256", use="sig")
+    now = int(time.time())
+    token = jwt.encode(
+        {"sub": "user_bench", "sid": "sess_bench", "orgId": "org_bench", "iss": os.environ["CLERK_ISSUER"],
+         "aud": os.environ["CLERK_BACKEND_AUD"], "iat": now, "nbf": now, "exp": now + 3600},
+        key, algorithm="RS256", headers={"kid": "bench"},
+    )
+    return token, jwk
+
+
+def _verify_case(stack: ExitStack, cache: str):
+    from app.services import clerk_service
+    from app.services.shared_cache import SharedCache
+
+    token, jwk = _clerk_fixture()
+    saved = dict(clerk_service._jwks_cache), clerk_service._token_cache
+    stack.callback(lambda: (clerk_service._jwks_cache.update(saved[0]), setattr(clerk_service, "_token_cache", saved[1])))
+    clerk_service._jwks_cache.update(keys=[jwk], fetched_at=int(time.time()) + 86_400)  # never stale during the run
+    memo = clerk_service._token_cache = SharedCache(None)
+
+    if cache == "none":  # every call pays the RSA verification
+        def call():
+            memo._local.clear()
+            return _run_sync(clerk_service.verify_clerk_jwt(token))
+        return call
+    # "process": hit in this worker's memo
+    return lambda: _run_sync(clerk_service.verify_clerk_jwt(token))
+
+
+for _tier in ("none", "process"):
+    case("auth.verify_clerk_jwt", cache=_tier)(_verify_case)
+
+
+# ---------- Schema validation ----------
+def _term(i: int) -> dict:
+    kind = i % 6
+    value = [
+        {"type": "money", "amount": 1000.0 + i, "currency": "USD"},
+        {"type": "percentage", "value": i % 100},
+        {"type": "duration", "days": 30 + i % 60},
+        {"type": "rate", "amount": 2.5 + i / 100, "currency": "EUR", "numerator_unit": "EUR", "denominator_unit": "USG"},
+        {"type": "date_range", "start": "2025-01-01", "end": "2026-12-31"},
+        {"type": "formula", "expression": "index + differential", "variables": [{"name": "differential", "value": 0.12}]},
+    ][kind]
+    return {"key": f"term_{i}", "value": value, "section": f"§{i % 40}", "source": {"page": i % 30 + 1, "span": [i * 10, i * 10 + 80], "snippet": "as agreed " * 5}}
+
+
+def _vendor(i: int = 0) -> dict:
+    return {"vendor_name": f"Vendor {i} Aviation GmbH", "vendor_address": "Flughafen 1, 85356 München", "vendor_contact_name": "J. Doe",
+            "vendor_contact_email": f"sales@vendor{i}.example", "vendor_contact_phone": "+49 89 9797-0"}
+
+
+def contract_payload(terms: int) -> dict:
+    return {"vendor": _vendor(), "buyer_name": "Fleet AI Airways", "title": "Into-plane fuelling agreement", "contract_type": "fuel",
+            "effective_from": "2025-01-01", "effective_to": "2027-12-31", "summary": "Supply of Jet A-1 at listed airports.",
+            "terms": [_term(i) for i in range(terms)], "tags": [{"key": f"tag{i % 20}", "value": f"value {i}"} for i in range(max(1, terms // 10))]}
+
+
+def fuel_bid_payload(terms: int) -> dict:
+    return {"vendor": _vendor(), "title": "Tender 2026 round 2", "round": 2, "bid_submitted_at": "2025-10-01", "price_type": "index_formula",
+            "uom": "USG", "currency": "USD", "index_name": "Platts Jet A-1 Med", "differential": "0.1234", "into_plane_fee": "0.05",
+            "includes_taxes": False, "terms": [_term(i) for i in range(terms)], "tags": [{"key": "airport", "value": "MUC"}]}
+
+
+def quote_payload(quotes: int) -> dict:
+    return {"vendor": _vendor(), "quotes": [{
+        "quote_number": f"Q-{i}", "rfq_number": "RFQ-2025-17", "part": {
+            "part_number": f"8061-536-{i % 1000:03d}", "alt_part_number": None, "serial_number": f"SN{i:06d}", "description": "Valve, shutoff",
+            "condition_code": "OH", "certifications": ["EASA Form 1", "FAA 8130-3"], "tag_type": "8130-3", "tagged_by": "Lufthansa Technik",
+            "tagged_date": "2025-06-01", "trace_to": "Part 121 operator",
+        },
+        "quantity": 1 + i % 4, "unit_price": 1200.0 + i, "currency": "USD", "payment_terms": "Net 30", "delivery_terms": "EXW MUC",
+        "lead_time": f"{i % 10} days", "warranty": "12 months", "quote_expiration_date": "2025-12-31",
+    } for i in range(quotes)]}
+
+
+def _schema_case(stack: ExitStack, model: str, n: int, source: str):
+    from app.schemas.contract import Contract
+    from app.schemas.fuel_bid import FuelBid
+    from app.schemas.quote import QuoteSchema
+
+    cls, payload = {
+        "contract": (Contract, contract_payload),
+        "fuel_bid": (FuelBid, fuel_bid_payload),
+        "quote": (QuoteSchema, quote_payload),
+    }[model]
+    data = payload(n)
+    if source == "json":
+        raw = json.dumps(data)
+        return lambda: cls.model_validate_json(raw)
+    return lambda: cls.model_validate(data)
+
+
+for _model in ("contract", "fuel_bid", "quote"):
+    for _n in (10, 100, 1000):
+        for _source in ("dict", "json"):
+            case(f"schemas.{_model}", n=_n, source=_source)(lambda stack, model=_model, **kw: _schema_case(stack, model, **kw))
+
+
+# ---------- Uploads ----------
+_SIZES = {"1KB": 1 << 10, "1MB": 1 << 20, "16MB": 16 << 20}
+
+
+def _upload(size: int):
+    from fastapi import UploadFile
+    from starlette.datastructures import Headers
+
+    data = np.random.default_rng(size).integers(0, 256, size, dtype=np.uint8).tobytes()
+    return UploadFile(io.BytesIO(data), size=size, filename="invoice-2025-10.pdf", headers=Headers({"content-type": "application/pdf"}))
+
+
+def _save_temp_file_case(stack: ExitStack, size: str):
+    from app.utils.io import save_temp_file
+
+    upload = _upload(_SIZES[size])
+
+    def call():
+        upload.file.seek(0)
+        os.remove(save_temp_file(upload))
+    return call
+
+
+def _validate_file_type_case(stack: ExitStack, size: str):
+    from app.utils.io import validate_file_type
+
+    upload = _upload(_SIZES[size])
+    return lambda: validate_file_type(upload, (".pdf", ".png", ".jpg"), ("application/pdf", "image/png", "image/jpeg"))
+
+
+for _size in _SIZES:
+    case("io.save_temp_file", size=_size)(_save_temp_file_case)
+    case("io.validate_file_type", size=_size)(_validate_file_type_case)
+
+
+# ---------- Formatters ----------
+def _record(keys: int) -> dict:
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    values = [lambda i: f"text {i}", lambda i: "", lambda i: base + timedelta(minutes=i), lambda i: uuid.UUID(int=i), lambda i: i * 1.5,
+              lambda i: {f"nested_{i}_{j}": j for j in range(3)}]
+    return {f"field_{i}": values[i % len(values)](i) for i in range(keys)}
+
+
+def _format_dict_case(stack: ExitStack, keys: int):
+    from app.utils import format_dict
+
+    record = _record(keys)
+    return lambda: format_dict(record)
+
+
+def _flatten_dict_case(stack: ExitStack, keys: int):
+    from app.utils import flatten_dict
+
+    record = _record(keys)
+    return lambda: flatten_dict(record)
+
+
+for _keys in (10, 100, 1000):
+    case("utils.format_dict", keys=_keys)(_format_dict_case)
+    case("utils.flatten_dict", keys=_keys)(_flatten_dict_case)
+
+
+# ---------- RAG ----------
+def _document(chars: int, page_chars: int = 3000) -> list[tuple[int, str]]:
+    sentence = "The supplier shall deliver Jet A-1 into plane at the agreed differential. "
+    paragraph = sentence * 6 + "\n\n"
+    text = (paragraph * (chars // len(paragraph) + 1))[:chars]
+    return [(i // page_chars + 1, text[i:i + page_chars]) for i in range(0, chars, page_chars)]
+
+
+def _chunking_case(stack: ExitStack, chars: int):
+    from app.ai.rag.chunker import ChunkingConfig, iter_chunks
+
+    pages, config = _document(chars), ChunkingConfig()
+    return lambda: sum(1 for _ in iter_chunks(pages, config))
+
+
+def _vector_search_case(stack: ExitStack, chunks: int, dim: int = 384):
+    from benchmarks.bench_vector_index import build_index
+
+    rng = np.random.default_rng(chunks)
+    index = build_index(stack.enter_context(tempfile.TemporaryDirectory()), chunks, dim, "float32", contracts=100, rng=rng)
+    queries = rng.standard_normal((64, dim), dtype=np.float32)
+    state = {"i": 0}
+
+    def call():
+        state["i"] = (state["i"] + 1) % len(queries)
+        return index.search(queries[state["i"]], k=8)
+    return call
+
+
+for _chars in (10_000, 100_000, 1_000_000):
+    case("rag.chunking", chars=_chars)(_chunking_case)
+for _chunks in (1_000, 10_000, 100_000):
+    case("rag.vector_search", chunks=_chunks)(_vector_search_case)
+
+
+# ---------- Runner ----------
+def measure(fn: Callable[[], object], repeat: int, min_time: float) -> dict:
+    fn()  # warm-up: imports, caches, page faults
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= max(2, min(10, int(min_time / max(elapsed, 1e-9))))
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops)
+    us = [s * 1e6 for s in samples]
+    return {
+        "median_us": round(statistics.median(us), 3),
+        "min_us": round(min(us), 3),
+        "stdev_us": round(statistics.stdev(us), 3) if len(us) > 1 else 0.0,
+        "loops": loops,
+        "samples_us": [round(u, 3) for u in us],
+    }
+
+
+def _meta() -> dict:
+    def git(*args: str) -> str | None:
+        try:
+            return subprocess.run(["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    import pydantic
+    return {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pydantic": pydantic.__version__,
+    }
+
+
+def run(filters: list[str], repeat: int, min_time: float, out: str | None) -> dict:
+    selected = [name for name in CASES if not filters or any(f in name for f in filters)]
+    if not selected:
+        raise SystemExit(f"No cases match {filters}; see `python -m benchmarks.micro list`")
+    logging.disable(logging.INFO)  # save_temp_file and friends log per call
+    report = {"meta": _meta(), "results": {}}
+    for name in selected:
+        with ExitStack() as stack:
+            result = measure(CASES[name](stack), repeat, min_time)
+        report["results"][name] = result
+        print(f"{name:<55} {result['median_us']:>14,.2f} us  (min {result['min_us']:,.2f}, x{result['loops']})", flush=True)
+    if out:
+        Path(out).write_text(json.dumps(report, indent=2))
+        print(f"\n💾 Saved {len(selected)} results to {out}")
+    return report
+
+
+def compare(old_path: str, new_path: str, threshold: float) -> int:
+    old, new = (json.loads(Path(p).read_text()) for p in (old_path, new_path))
+    print(f"{old['meta'].get('commit')} -> {new['meta'].get('commit')}  (threshold {threshold:.0%})\n")
+    print(f"{'case':<55} {'old us':>12} {'new us':>12} {'change':>8}")
+    regressions = []
+    for name in [*new["results"], *(n for n in old["results"] if n not in new["results"])]:
+        a, b = old["results"].get(name), new["results"].get(name)
+        if a is None or b is None:
+            print(f"{name:<55} {'-' if a is None else format(a['median_us'], ',.2f'):>12} {'-' if b is None else format(b['median_us'], ',.2f'):>12} {'n/a':>8}")
+            continue
+        change = b["median_us"] / a["median_us"] - 1
+        regressed = change > threshold and b["min_us"] > a["median_us"]
+        improved = change < -threshold and b["median_us"] < a["min_us"]
+        mark = "  ❌ regressed" if regressed else "  ✅ faster" if improved else ""
+        print(f"{name:<55} {a['median_us']:>12,.2f} {b['median_us']:>12,.2f} {change:>+8.1%}{mark}")
+        if regressed:
+            regressions.append(name)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regressions over {threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Print case names.")
+    run_parser = commands.add_parser("run", help="Run cases and optionally save JSON.")
+    run_parser.add_argument("--filter", action="append", default=[], help="Substring of case names to run (repeatable).")
+    run_parser.add_argument("--repeat", type=int, default=7)
+    run_parser.add_argument("--min-time", type=float, default=0.05, help="Seconds per sample.")
+    run_parser.add_argument("--out", help="Write results JSON here.")
+    compare_parser = commands.add_parser("compare", help="Compare two result files; exits 1 on regressions.")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed median slowdown, e.g. 0.10 = 10%%.")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        print("\n".join(CASES))
+    elif args.command == "run":
+        run(args.filter, args.repeat, args.min_time, args.out)
+    else:
+        sys.exit(compare(args.old, args.new, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,5 +2,5 @@
 
 # Activate the virtual environment
 .\.venv\Scripts\Activate.ps1
-# Run uvicorn with module resolution
-py -m uvicorn app.main:app --reload
\ No newline at end of file
+# Run the server (.\start.ps1 --production for the multi-worker mode, see app/serve.py)
+py -m app.serve @args
\ No newline at end of file
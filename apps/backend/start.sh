@@ -13,5 +13,5 @@ else
   exit 1
 fi
 
-# 2) Run uvicorn
-exec python -m uvicorn app.main:app --reload
+# 2) Run the server (./start.sh --production for the multi-worker mode, see app/serve.py)
+exec python -m app.serve "$@"